@@ -0,0 +1,67 @@
+"""Compare the Newton risk-budgeting solver with the SciPy ERC optimizer.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_risk_budget
+
+For each universe size the script reports the solve time of
+:func:`optimizer.erc` (SLSQP), a cold :func:`optimizer.risk_budget` solve, a
+warm-started solve on a perturbed covariance, and the largest deviation of
+each solution's risk contributions from equal shares.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.optimizer.erc import erc
+from src.optimizer.risk_budget import risk_budget
+
+
+def _random_cov(n_assets: int, rng: np.random.Generator) -> pd.DataFrame:
+    vols = rng.uniform(0.005, 0.03, n_assets)
+    returns = rng.normal(size=(max(4 * n_assets, 250), n_assets)) * vols
+    labels = [f"A{i}" for i in range(n_assets)]
+    return pd.DataFrame(np.cov(returns.T), index=labels, columns=labels)
+
+
+def _rc_error(cov: pd.DataFrame, weights: pd.Series) -> float:
+    rc = weights * (cov @ weights)
+    share = rc / rc.sum()
+    return float((share - 1.0 / len(share)).abs().max())
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(sizes=(10, 50, 100, 200)) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = []
+    for n_assets in sizes:
+        cov = _random_cov(n_assets, rng)
+        scipy_w, scipy_t = _timed(erc, cov)
+        cold_w, cold_t = _timed(risk_budget, cov)
+        _, warm_t = _timed(risk_budget, cov * 1.01, x0=cold_w)
+        rows.append(
+            {
+                "assets": n_assets,
+                "scipy_ms": 1e3 * scipy_t,
+                "newton_ms": 1e3 * cold_t,
+                "newton_warm_ms": 1e3 * warm_t,
+                "scipy_rc_error": _rc_error(cov, scipy_w),
+                "newton_rc_error": _rc_error(cov, cold_w),
+            }
+        )
+    table = pd.DataFrame(rows).set_index("assets")
+    print(table.to_string(float_format=lambda x: f"{x:.3g}"))
+    return table
+
+
+if __name__ == "__main__":  # pragma: no cover - benchmark entry point
+    main()
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 
 @dataclass
@@ -17,12 +17,17 @@ class EventDrivenBacktester:
     slippage_bp : float, optional
         Slippage in basis points applied to each trade.  Positive numbers
         increase buy prices and decrease sell prices.  Default is ``0``.
+    cost_model : Callable[[str, float], float], optional
+        Extra slippage in basis points for a contract and signed quantity,
+        e.g. :func:`execution.slippage.slippage_function` with the
+        calibrated parameters.  Added to ``slippage_bp``.
     """
 
     prices: pd.DataFrame
     multipliers: pd.Series
     slippage_bp: float = 0.0
     cash: float = 0.0
+    cost_model: Optional[Callable[[str, float], float]] = None
     position: pd.Series = field(init=False)
     trades: List[Dict[str, float]] = field(default_factory=list)
 
@@ -32,7 +37,10 @@ class EventDrivenBacktester:
 
     def trade(self, date: pd.Timestamp, contract: str, quantity: float) -> None:
         price = self.prices.loc[date, contract]
-        fill = price + price * self.slip * np.sign(quantity)
+        slip = self.slip
+        if self.cost_model is not None:
+            slip += self.cost_model(contract, quantity) / 10_000.0
+        fill = price + price * slip * np.sign(quantity)
         self.cash -= quantity * fill * self.multipliers.get(contract, 1.0)
         self.position[contract] += quantity
         self.trades.append(
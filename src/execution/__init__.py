@@ -1,11 +1,33 @@
 """Execution utilities for translating signals into trade instructions."""
 
-from .ap import process_ap_flows
+from .almgren_chriss import AlmgrenChriss, ExecutionPlan
+from .ap import APFlowResult, IntradayAPBook, process_ap_flows, process_ap_orders
+from .calibration import calibrate_slippage, implementation_shortfall, load_fills
+from .gateway import (
+    Fill,
+    LocalExchange,
+    Order,
+    OrderGateway,
+    OrderReport,
+    Transport,
+)
+from .netting import NettingResult, net_orders
 from .order_planner import plan_orders
-from .roll import roll_weights
-from .schedule import generate_cost_aware_schedule
+from .profiles import (
+    IntradayProfile,
+    ProfileCache,
+    intraday_profile,
+    vwap_schedule,
+)
+from .roll import RollPlan, plan_rolls, roll_weights
+from .schedule import (
+    batch_cost_aware_schedule,
+    cost_aware_weights,
+    generate_cost_aware_schedule,
+)
 from .sizing import weights_to_contracts
-from .slippage import estimate_slippage
+from .slippage import SlippageParams, estimate_slippage, slippage_function
+from .tca import TCA, tca_orders, tca_summary
 from .twap import generate_twap_schedule
 
 __all__ = [
@@ -14,6 +36,35 @@ __all__ = [
     "roll_weights",
     "estimate_slippage",
     "process_ap_flows",
+    "process_ap_orders",
+    "APFlowResult",
+    "IntradayAPBook",
     "generate_cost_aware_schedule",
+    "batch_cost_aware_schedule",
+    "cost_aware_weights",
     "plan_orders",
+    "AlmgrenChriss",
+    "ExecutionPlan",
+    "intraday_profile",
+    "IntradayProfile",
+    "ProfileCache",
+    "vwap_schedule",
+    "plan_rolls",
+    "RollPlan",
+    "Order",
+    "Fill",
+    "OrderReport",
+    "Transport",
+    "LocalExchange",
+    "OrderGateway",
+    "net_orders",
+    "NettingResult",
+    "SlippageParams",
+    "slippage_function",
+    "load_fills",
+    "implementation_shortfall",
+    "calibrate_slippage",
+    "tca_orders",
+    "tca_summary",
+    "TCA",
 ]
@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .schedule import _long_schedule
+
+Param = Union[float, pd.Series]
+
+
+@dataclass
+class ExecutionPlan:
+    """Output of :class:`AlmgrenChriss`.
+
+    ``trades`` is the assets x times matrix of slice quantities and
+    ``holdings`` the quantity still to trade at the start of each slice and
+    after the last one.  ``expected_cost`` and ``variance`` are per asset in
+    price units times quantity.
+    """
+
+    trades: pd.DataFrame
+    holdings: pd.DataFrame
+    expected_cost: pd.Series
+    variance: pd.Series
+
+    @property
+    def schedule(self) -> pd.DataFrame:
+        """Long schedule with ``asset``, ``time`` and ``quantity`` columns."""
+        trades = self.trades
+        active = self.holdings.iloc[:, 0].to_numpy() != 0
+        return _long_schedule(trades.to_numpy(), trades.index, trades.columns, active)
+
+
+@dataclass
+class AlmgrenChriss:
+    """Almgren-Chriss optimal liquidation trajectory for a list of trades.
+
+    With linear temporary impact ``eta``, permanent impact ``gamma``,
+    arithmetic price volatility ``sigma`` and risk aversion ``lambda``, the
+    quantity left to trade at time ``t`` is
+    ``X * sinh(kappa * (T - t)) / sinh(kappa * T)``, where ``kappa`` solves
+    ``cosh(kappa * tau) = 1 + tau**2 * lambda * sigma**2 / (2 * eta_tilde)``
+    and ``eta_tilde = eta - gamma * tau / 2``.  Zero risk aversion gives the
+    TWAP schedule; larger values trade faster at the start.
+
+    All coefficients may be scalars or Series per asset, and every asset is
+    solved at once.
+
+    Parameters
+    ----------
+    volatility : Union[float, pd.Series]
+        Price volatility per unit of ``horizon``, in price units.
+    temporary_impact : Union[float, pd.Series]
+        Price concession per unit of trading rate.
+    permanent_impact : Union[float, pd.Series], optional
+        Permanent price move per unit traded.  Default is ``0``.
+    risk_aversion : Union[float, pd.Series], optional
+        Weight on the variance of the execution cost.  Default is ``0``.
+    spread : Union[float, pd.Series], optional
+        Bid-ask spread in price units; half of it is paid per unit traded.
+    horizon : float, optional
+        Length of the execution window.  Default is ``1``.
+    slices : int, optional
+        Number of child orders.  Default is ``10``.
+    """
+
+    volatility: Param
+    temporary_impact: Param
+    permanent_impact: Param = 0.0
+    risk_aversion: Param = 0.0
+    spread: Param = 0.0
+    horizon: float = 1.0
+    slices: int = 10
+
+    def __post_init__(self) -> None:
+        if self.slices <= 0:
+            raise ValueError("slices must be positive")
+        if self.horizon <= 0:
+            raise ValueError("horizon must be positive")
+
+    @staticmethod
+    def _values(param: Param, assets: pd.Index) -> np.ndarray:
+        if isinstance(param, pd.Series):
+            return param.reindex(assets).fillna(0.0).to_numpy(dtype=float)
+        return np.full(len(assets), float(param))
+
+    def plan(
+        self, quantities: pd.Series, times: Optional[pd.Index] = None
+    ) -> ExecutionPlan:
+        """Optimal trajectory for every asset over the full horizon.
+
+        Parameters
+        ----------
+        quantities : pd.Series
+            Total quantity to trade per asset.  Positive for buy, negative
+            for sell.
+        times : pd.Index, optional
+            Label for each of the ``slices`` child orders.  Defaults to
+            ``0 .. slices - 1``.
+
+        Returns
+        -------
+        ExecutionPlan
+            Slice quantities with expected cost and variance.
+        """
+        return self._solve(quantities, self.slices, times)
+
+    def replan(
+        self,
+        plan: ExecutionPlan,
+        executed: pd.Series,
+        step: int,
+    ) -> ExecutionPlan:
+        """Re-optimise the rest of ``plan`` after ``step`` slices.
+
+        Parameters
+        ----------
+        plan : ExecutionPlan
+            Plan returned by :meth:`plan` or a previous :meth:`replan`.
+        executed : pd.Series
+            Quantity actually filled per asset so far.
+        step : int
+            Number of slices already elapsed.
+
+        Returns
+        -------
+        ExecutionPlan
+            Schedule of the unfilled quantity over the remaining slices.
+            When fills matched the plan it equals the tail of ``plan``.
+        """
+        n_slices = plan.trades.shape[1]
+        if not 0 <= step < n_slices:
+            raise ValueError("step must leave at least one slice")
+        total = plan.holdings.iloc[:, 0]
+        remaining = total - executed.reindex(total.index).fillna(0.0)
+        times = plan.trades.columns[step:]
+        return self._solve(remaining, n_slices - step, times)
+
+    def _solve(
+        self,
+        quantities: pd.Series,
+        n_slices: int,
+        times: Optional[pd.Index],
+    ) -> ExecutionPlan:
+        assets = quantities.index
+        times = pd.RangeIndex(n_slices) if times is None else pd.Index(times)
+        if len(times) != n_slices:
+            raise ValueError("times must have one entry per slice")
+        tau = self.horizon / self.slices
+        horizon = tau * n_slices
+
+        sigma = self._values(self.volatility, assets)
+        eta = self._values(self.temporary_impact, assets)
+        gamma = self._values(self.permanent_impact, assets)
+        lam = self._values(self.risk_aversion, assets)
+        half_spread = 0.5 * self._values(self.spread, assets)
+        eta_tilde = eta - 0.5 * gamma * tau
+        if np.any(eta_tilde <= 0):
+            raise ValueError("temporary_impact must exceed permanent_impact * tau / 2")
+
+        kappa = np.arccosh(1.0 + 0.5 * tau**2 * lam * sigma**2 / eta_tilde) / tau
+        elapsed = tau * np.arange(n_slices + 1)
+        k = kappa[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # sinh ratio written with exponentials so large kappa cannot overflow
+            ratio = (
+                np.exp(-k * elapsed)
+                * np.expm1(-2.0 * k * (horizon - elapsed))
+                / np.expm1(-2.0 * k * horizon)
+            )
+        linear = 1.0 - elapsed / horizon
+        ratio = np.where(k * horizon > 1e-8, ratio, linear)
+        ratio[:, -1] = 0.0
+
+        qty = np.nan_to_num(quantities.to_numpy(dtype=float))
+        holdings = qty[:, None] * ratio
+        trades = holdings[:, :-1] - holdings[:, 1:]
+        expected = (
+            0.5 * gamma * qty**2
+            + half_spread * np.abs(trades).sum(axis=1)
+            + eta_tilde / tau * (trades**2).sum(axis=1)
+        )
+        variance = sigma**2 * tau * (holdings[:, 1:] ** 2).sum(axis=1)
+
+        columns = times.append(pd.Index(["end"]))
+        return ExecutionPlan(
+            trades=pd.DataFrame(trades, index=assets, columns=times),
+            holdings=pd.DataFrame(holdings, index=assets, columns=columns),
+            expected_cost=pd.Series(expected, index=assets, name="expected_cost"),
+            variance=pd.Series(variance, index=assets, name="variance"),
+        )
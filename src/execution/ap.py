@@ -1,3 +1,7 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 
 
@@ -20,3 +24,233 @@ def process_ap_flows(creations: int, redemptions: int, basket: pd.Series) -> pd.
     """
     net = creations - redemptions
     return basket * net
+
+
+def _settle(
+    units: np.ndarray, basket: np.ndarray, cash: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Split ``units * basket`` into whole in-kind lots and cash-settled quantity.
+
+    ``units`` has shape ``(..., n_aps)`` and ``basket`` ``(..., n_assets)``;
+    results are ``(..., n_aps, n_assets)``.
+    """
+    flows = units[..., :, None] * basket[..., None, :]
+    in_kind = np.where(cash, 0.0, np.trunc(flows))
+    return {"flows": flows, "in_kind": in_kind, "market": flows - in_kind}
+
+
+@dataclass
+class APFlowResult:
+    """Output of :func:`process_ap_orders`.
+
+    ``flows`` are the dates x assets security flows of all orders, as
+    :func:`process_ap_flows` would give per date.  ``in_kind`` is the part
+    delivered in whole contracts and ``trades`` the part the fund trades in
+    the market against cash.  ``cash_in_lieu`` and ``fees`` are dates x APs
+    amounts paid by each AP to the fund.  Cash in lieu is negative for net
+    redemptions, while fees are always charged: the fixed fees plus
+    ``variable_fee`` on the absolute cash amount.
+    """
+
+    flows: pd.DataFrame
+    in_kind: pd.DataFrame
+    trades: pd.DataFrame
+    cash_in_lieu: pd.DataFrame
+    fees: pd.DataFrame
+
+
+def _fees(
+    created: np.ndarray,
+    redeemed: np.ndarray,
+    cash_in_lieu: np.ndarray,
+    creation_fee: float,
+    redemption_fee: float,
+    variable_fee: float,
+) -> np.ndarray:
+    redeeming = (redeemed > 0) | (created < 0)
+    return (
+        creation_fee * (created > 0)
+        + redemption_fee * redeeming
+        + variable_fee * np.abs(cash_in_lieu)
+    )
+
+
+def _cash_mask(cash_assets: Optional[Sequence[str]], assets: pd.Index) -> np.ndarray:
+    if cash_assets is None:
+        return np.ones(len(assets), dtype=bool)
+    return assets.isin(list(cash_assets))
+
+
+def process_ap_orders(
+    creations: pd.DataFrame,
+    basket: Union[pd.Series, pd.DataFrame],
+    values: Union[pd.Series, pd.DataFrame],
+    redemptions: Optional[pd.DataFrame] = None,
+    cash_assets: Optional[Sequence[str]] = None,
+    creation_fee: float = 0.0,
+    redemption_fee: float = 0.0,
+    variable_fee: float = 0.0,
+) -> APFlowResult:
+    """Settle every AP order over many dates in one pass.
+
+    Rows may also be stress scenarios instead of dates, e.g. a creation
+    spike at quarter end applied to today's basket.
+
+    Parameters
+    ----------
+    creations : pd.DataFrame
+        Creation units per date and AP.  Redemptions may be passed here as
+        negative units or separately in ``redemptions``.
+    basket : Union[pd.Series, pd.DataFrame]
+        Quantity of each asset per creation unit, constant or per date.
+    values : Union[pd.Series, pd.DataFrame]
+        Base-currency value of one unit of each asset, i.e.
+        ``price * multiplier * fx``, constant or per date.
+    redemptions : pd.DataFrame, optional
+        Redemption units per date and AP.
+    cash_assets : Sequence[str], optional
+        Assets always settled in cash.  Defaults to every asset, as futures
+        cannot be delivered in kind.  Other assets are delivered in whole
+        contracts and only the fractional remainder is cash.
+    creation_fee, redemption_fee : float, optional
+        Fixed fee per AP and date with creations or redemptions.
+    variable_fee : float, optional
+        Fee as a fraction of the absolute cash-in-lieu amount.
+
+    Returns
+    -------
+    APFlowResult
+        Flows, in-kind deliveries, market trades, cash and fees.
+    """
+    redemptions = (
+        pd.DataFrame(0.0, index=creations.index, columns=creations.columns)
+        if redemptions is None
+        else redemptions.reindex_like(creations).fillna(0.0)
+    )
+    created = creations.fillna(0.0).to_numpy(dtype=float)
+    redeemed = redemptions.to_numpy(dtype=float)
+    units = created - redeemed
+
+    dates = creations.index
+    if isinstance(basket, pd.Series):
+        basket = pd.DataFrame([basket] * len(dates), index=dates)
+    assets = basket.columns
+    per_unit = basket.reindex(dates).fillna(0.0).to_numpy(dtype=float)
+    if isinstance(values, pd.Series):
+        price = values.reindex(assets).to_numpy(dtype=float)
+        price = np.broadcast_to(price, per_unit.shape)
+    else:
+        price = values.reindex(index=dates, columns=assets).to_numpy(dtype=float)
+
+    cash = _cash_mask(cash_assets, assets)
+    settled = _settle(units, per_unit, cash)
+    cash_in_lieu = np.einsum("dpa,da->dp", settled["market"], np.nan_to_num(price))
+    fees = _fees(
+        created, redeemed, cash_in_lieu, creation_fee, redemption_fee, variable_fee
+    )
+
+    aps = creations.columns
+    totals = {
+        key: pd.DataFrame(value.sum(axis=1), index=dates, columns=assets)
+        for key, value in settled.items()
+    }
+    return APFlowResult(
+        flows=totals["flows"],
+        in_kind=totals["in_kind"],
+        trades=totals["market"],
+        cash_in_lieu=pd.DataFrame(cash_in_lieu, index=dates, columns=aps),
+        fees=pd.DataFrame(fees, index=dates, columns=aps),
+    )
+
+
+@dataclass
+class IntradayAPBook:
+    """Running AP flows for one day, updated as orders arrive.
+
+    Each order only re-settles the AP that sent it, and the totals equal
+    :func:`process_ap_orders` run on all orders received so far.
+
+    Parameters
+    ----------
+    basket : pd.Series
+        Quantity of each asset per creation unit.
+    values : pd.Series
+        Base-currency value of one unit of each asset.
+    cash_assets, creation_fee, redemption_fee, variable_fee
+        As in :func:`process_ap_orders`.
+    """
+
+    basket: pd.Series
+    values: pd.Series
+    cash_assets: Optional[Sequence[str]] = None
+    creation_fee: float = 0.0
+    redemption_fee: float = 0.0
+    variable_fee: float = 0.0
+
+    def __post_init__(self) -> None:
+        assets = self.basket.index
+        self._basket = self.basket.fillna(0.0).to_numpy(dtype=float)
+        self._price = self.values.reindex(assets).to_numpy(dtype=float)
+        self._price = np.nan_to_num(self._price)
+        self._cash = _cash_mask(self.cash_assets, assets)
+        self._orders: Dict[str, np.ndarray] = {}
+        self._settled: Dict[str, Dict[str, np.ndarray]] = {}
+        self._totals = {
+            key: np.zeros(len(assets)) for key in ("flows", "in_kind", "market")
+        }
+        self._cash_in_lieu: Dict[str, float] = {}
+        self._fees: Dict[str, float] = {}
+
+    def add(self, ap: str, creations: float = 0.0, redemptions: float = 0.0) -> None:
+        """Record an order from ``ap``; repeated orders accumulate."""
+        order = self._orders.get(ap, np.zeros(2)) + (creations, redemptions)
+        self._orders[ap] = order
+        units = np.array([order[0] - order[1]])
+        settled = {k: v[0] for k, v in _settle(units, self._basket, self._cash).items()}
+        previous = self._settled.get(ap)
+        for key, value in settled.items():
+            self._totals[key] += value if previous is None else value - previous[key]
+        self._settled[ap] = settled
+        cash = float(settled["market"] @ self._price)
+        self._cash_in_lieu[ap] = cash
+        self._fees[ap] = float(
+            _fees(
+                order[0],
+                order[1],
+                cash,
+                self.creation_fee,
+                self.redemption_fee,
+                self.variable_fee,
+            )
+        )
+
+    def add_many(self, orders: pd.DataFrame) -> None:
+        """Record a batch with ``ap``, ``creations`` and ``redemptions`` columns."""
+        grouped = orders.groupby("ap", sort=False)[["creations", "redemptions"]].sum()
+        for ap, created, redeemed in grouped.itertuples():
+            self.add(ap, created, redeemed)
+
+    @property
+    def flows(self) -> pd.Series:
+        """Net security flows of all orders so far."""
+        return pd.Series(self._totals["flows"], index=self.basket.index)
+
+    @property
+    def in_kind(self) -> pd.Series:
+        """Quantity delivered in whole contracts."""
+        return pd.Series(self._totals["in_kind"], index=self.basket.index)
+
+    @property
+    def trades(self) -> pd.Series:
+        """Quantity the fund must trade in the market."""
+        return pd.Series(self._totals["market"], index=self.basket.index)
+
+    @property
+    def cash_in_lieu(self) -> pd.Series:
+        """Cash owed by each AP."""
+        return pd.Series(self._cash_in_lieu, dtype=float)
+
+    @property
+    def fees(self) -> pd.Series:
+        """Fees owed by each AP."""
+        return pd.Series(self._fees, dtype=float)
@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .slippage import SlippageParams
+
+FILL_COLUMNS = [
+    "asset",
+    "asset_class",
+    "quantity",
+    "price",
+    "arrival_price",
+    "spread",
+    "volatility",
+    "volume",
+]
+
+
+def load_fills(
+    path: Union[str, Path], columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Read a fill log stored as Parquet, Feather or CSV.
+
+    Only ``columns`` are read from columnar files, which keeps loading
+    millions of fills cheap.  Parquet and Feather need ``pyarrow``.
+    """
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+    suffix = path.suffix.lower()
+    if suffix in {".parquet", ".pq"}:
+        return pd.read_parquet(path, columns=columns)
+    if suffix == ".feather":
+        return pd.read_feather(path, columns=columns)
+    if suffix == ".csv":
+        return pd.read_csv(path, usecols=columns)
+    raise ValueError(f"unsupported fill log format: {path.suffix}")
+
+
+def implementation_shortfall(fills: pd.DataFrame) -> pd.DataFrame:
+    """Shortfall of each order against its arrival price in basis points.
+
+    Parameters
+    ----------
+    fills : pd.DataFrame
+        Fill log with the :data:`FILL_COLUMNS`.  ``quantity`` is signed,
+        ``spread`` and ``volatility`` are in basis points and ``volume`` is
+        the market volume the order's participation is measured against.
+        With an ``order_id`` column the fills of each order are combined
+        first.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``asset``, ``asset_class``, ``quantity``, ``shortfall``,
+        ``participation``, ``spread`` and ``volatility`` per order.
+    """
+    if "order_id" in fills:
+        fills = fills.assign(notional=fills["price"] * fills["quantity"])
+        first = ["asset", "asset_class", "arrival_price", "spread", "volatility"]
+        grouped = fills.groupby("order_id", sort=False)
+        orders = grouped[first + ["volume"]].first()
+        orders["quantity"] = grouped["quantity"].sum()
+        orders["price"] = grouped["notional"].sum() / orders["quantity"]
+    else:
+        orders = fills
+
+    quantity = orders["quantity"].to_numpy(dtype=float)
+    arrival = orders["arrival_price"].to_numpy(dtype=float)
+    price = orders["price"].to_numpy(dtype=float)
+    volume = orders["volume"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shortfall = np.sign(quantity) * (price / arrival - 1.0) * 10_000.0
+        participation = np.where(volume > 0, np.abs(quantity) / volume, np.nan)
+    return pd.DataFrame(
+        {
+            "asset": orders["asset"].to_numpy(),
+            "asset_class": orders["asset_class"].to_numpy(),
+            "quantity": quantity,
+            "shortfall": shortfall,
+            "participation": participation,
+            "spread": orders["spread"].to_numpy(dtype=float),
+            "volatility": orders["volatility"].to_numpy(dtype=float),
+        },
+        index=orders.index,
+    )
+
+
+def calibrate_slippage(
+    fills: pd.DataFrame,
+    exponents: Optional[Sequence[float]] = None,
+    huber: float = 1.345,
+    iterations: int = 5,
+    min_orders: int = 30,
+    save: bool = False,
+    path: Optional[Union[str, Path]] = None,
+) -> SlippageParams:
+    """Fit alpha and the impact exponent per asset class.
+
+    The shortfall net of half the spread is regressed on
+    ``volatility * participation ** exponent`` without intercept.  For each
+    candidate exponent the slope of every class follows in closed form, so
+    one pass over the orders per exponent fits all classes at once.
+    Outliers are down-weighted with Huber weights, re-estimated
+    ``iterations`` times from the residuals' median absolute deviation.
+    Reweighting rounds search only exponents next to the current fit.
+
+    Parameters
+    ----------
+    fills : pd.DataFrame
+        Fill log, see :func:`implementation_shortfall`.
+    exponents : Sequence[float], optional
+        Candidate exponents.  Default is ``0.1`` to ``1.0`` in steps of
+        ``0.025``.
+    huber : float, optional
+        Huber threshold in robust standard deviations.  Default is
+        ``1.345``.
+    iterations : int, optional
+        Reweighting rounds.  Default is ``5``.
+    min_orders : int, optional
+        Classes with fewer usable orders keep the default parameters.
+    save : bool, optional
+        Write the result with :meth:`SlippageParams.save` so that
+        :func:`~execution.estimate_slippage` picks it up.
+    path : Union[str, Path], optional
+        Where to save; defaults to :func:`~execution.slippage.params_path`.
+
+    Returns
+    -------
+    SlippageParams
+        Fitted parameters.
+    """
+    grid = np.arange(0.1, 1.0 + 1e-9, 0.025) if exponents is None else exponents
+    grid = np.asarray(grid, dtype=float)
+    orders = implementation_shortfall(fills)
+    y = (orders["shortfall"] - orders["spread"].fillna(0.0) / 2.0).to_numpy()
+    vol = orders["volatility"].to_numpy(dtype=float)
+    part = orders["participation"].to_numpy(dtype=float)
+    usable = np.isfinite(y) & np.isfinite(vol) & (vol > 0) & np.isfinite(part)
+    usable &= part > 0
+    codes, classes = pd.factorize(orders["asset_class"][usable])
+    y, vol, log_part = y[usable], vol[usable], np.log(part[usable])
+    n_classes = len(classes)
+
+    weights = np.ones(len(y))
+    alpha = np.zeros(n_classes)
+    exponent = np.full(n_classes, np.nan)
+    candidates = grid
+    for _ in range(max(iterations, 1)):
+        best = np.full(n_classes, np.inf)
+        syy = np.bincount(codes, weights * y * y, n_classes)
+        for beta in candidates:
+            x = vol * np.exp(beta * log_part)
+            sxy = np.bincount(codes, weights * x * y, n_classes)
+            sxx = np.bincount(codes, weights * x * x, n_classes)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                slope = sxy / sxx
+                sse = np.where(slope > 0, syy - sxy * slope, np.inf)
+            better = sse < best
+            best[better] = sse[better]
+            alpha[better] = slope[better]
+            exponent[better] = beta
+
+        fitted = alpha[codes] * vol * np.exp(np.nan_to_num(exponent)[codes] * log_part)
+        residual = np.abs(y - fitted)
+        scale = 1.4826 * pd.Series(residual).groupby(codes).median().to_numpy()
+        limit = huber * scale[codes]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(residual > limit, limit / residual, 1.0)
+        # Reweighting moves the optimum only locally, so later rounds search
+        # the neighbourhood of the exponents found so far.
+        step = np.min(np.diff(grid), initial=np.inf) if len(grid) > 1 else 0.0
+        distance = np.abs(grid[:, None] - exponent[None, :])
+        candidates = grid[(distance <= 2.0 * step + 1e-12).any(axis=1)]
+
+    counts = np.bincount(codes, minlength=n_classes)
+    params = SlippageParams()
+    for i, name in enumerate(classes):
+        params.n_orders[str(name)] = int(counts[i])
+        if np.isfinite(exponent[i]) and counts[i] >= min_orders:
+            params.alpha[str(name)] = float(alpha[i])
+            params.exponent[str(name)] = float(exponent[i])
+    if save:
+        params.save(path)
+    return params
@@ -0,0 +1,294 @@
+import abc
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Order:
+    """Child order sent through :class:`OrderGateway`.
+
+    ``quantity`` is positive for buys and negative for sells.  Orders
+    without ``limit`` are market orders.  All orders are immediate-or-cancel:
+    whatever does not fill on arrival is cancelled.
+    """
+
+    asset: str
+    quantity: float
+    limit: Optional[float] = None
+    order_id: int = 0
+
+
+@dataclass
+class Fill:
+    """Execution of part of an order at one price level."""
+
+    order_id: int
+    asset: str
+    quantity: float
+    price: float
+
+
+@dataclass
+class OrderReport:
+    """Outcome of one order: status, fills and gateway timings.
+
+    ``status`` is ``"filled"``, ``"partial"`` or ``"cancelled"``.  ``sent``
+    and ``acked`` are ``time.perf_counter`` stamps taken when the order
+    left the throttle and when the venue answered.
+    """
+
+    order: Order
+    status: str
+    filled: float
+    avg_price: float
+    fills: List[Fill]
+    sent: float
+    acked: float
+
+    @property
+    def latency(self) -> float:
+        return self.acked - self.sent
+
+
+class Transport(abc.ABC):
+    """Connection to a venue.  Subclasses implement :meth:`send`."""
+
+    @abc.abstractmethod
+    async def send(self, order: Order) -> List[Fill]:
+        """Deliver ``order`` and return its fills once the venue acknowledges."""
+
+
+@dataclass
+class LocalExchange(Transport):
+    """In-process limit order book used as the default venue.
+
+    Every asset has ``levels`` price levels on each side spaced by ``tick``
+    around its mid, each with ``depth`` contracts.  Incoming orders walk the
+    opposite side up to their limit, so large orders fill partially and pay
+    up through the book.  Consumed depth recovers over time: every second,
+    each level regains the fraction ``resilience`` of what it lacks from
+    ``depth``, so a drained book refills between bursts of orders.
+
+    Parameters
+    ----------
+    mid : Union[float, Mapping[str, float]], optional
+        Mid price per asset.  Default is ``100``.
+    tick : float, optional
+        Price increment between levels.  Default is ``0.01``.
+    levels : int, optional
+        Levels per side.  Default is ``10``.
+    depth : float, optional
+        Contracts per level.  Default is ``100``.
+    resilience : float, optional
+        Share of missing depth restored per second.  ``1`` or more refills
+        the book before every order and ``0`` never does.  Default is
+        ``1``.
+    latency : float, optional
+        Seconds the venue takes to answer.  Default is ``0``.
+    clock : Callable[[], float], optional
+        Source of the current time in seconds.  Defaults to
+        ``time.perf_counter``.
+    """
+
+    mid: Union[float, Mapping[str, float]] = 100.0
+    tick: float = 0.01
+    levels: int = 10
+    depth: float = 100.0
+    resilience: float = 1.0
+    latency: float = 0.0
+    clock: Callable[[], float] = time.perf_counter
+    _books: Dict[str, Tuple[np.ndarray, ...]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _stamps: Dict[str, float] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.resilience < 0:
+            raise ValueError("resilience must be non-negative")
+
+    def _recover(self, asset: str) -> None:
+        """Refill the depth of ``asset`` for the time since its last order."""
+        now = self.clock()
+        elapsed = max(now - self._stamps.get(asset, now), 0.0)
+        self._stamps[asset] = now
+        if self.resilience >= 1:
+            share = 1.0
+        else:
+            share = 1.0 - (1.0 - self.resilience) ** elapsed
+        for sizes in self._books[asset][1::2]:
+            sizes += share * (self.depth - sizes)
+
+    def book(self, asset: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """``(bid_prices, bid_sizes, ask_prices, ask_sizes)``, best level first."""
+        if asset not in self._books:
+            mid = self.mid
+            if isinstance(mid, (Mapping, pd.Series)):
+                mid = mid.get(asset, 100.0)
+            offsets = self.tick * np.arange(1, self.levels + 1)
+            self._books[asset] = (
+                mid - offsets,
+                np.full(self.levels, float(self.depth)),
+                mid + offsets,
+                np.full(self.levels, float(self.depth)),
+            )
+        return self._books[asset]
+
+    def match(self, order: Order) -> List[Fill]:
+        """Execute ``order`` against the book synchronously."""
+        bid_px, bid_qty, ask_px, ask_qty = self.book(order.asset)
+        self._recover(order.asset)
+        buy = order.quantity > 0
+        prices, sizes = (ask_px, ask_qty) if buy else (bid_px, bid_qty)
+        wanted = abs(order.quantity)
+        available = sizes.copy()
+        if order.limit is not None:
+            reachable = prices <= order.limit if buy else prices >= order.limit
+            available[~reachable] = 0.0
+        before = np.cumsum(available) - available
+        taken = np.clip(wanted - before, 0.0, available)
+        sizes -= taken
+        sign = 1.0 if buy else -1.0
+        return [
+            Fill(order.order_id, order.asset, sign * float(q), float(p))
+            for p, q in zip(prices[taken > 0], taken[taken > 0])
+        ]
+
+    async def send(self, order: Order) -> List[Fill]:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self.match(order)
+
+
+@dataclass
+class OrderGateway:
+    """Asynchronous child-order gateway with throttling and statistics.
+
+    Orders pass a token-bucket throttle and a cap on orders in flight before
+    they reach the transport.  Every answer is recorded so that
+    :meth:`statistics` can report fill rates, latency and throughput.
+
+    Parameters
+    ----------
+    transport : Transport, optional
+        Venue connection.  Defaults to a :class:`LocalExchange`.
+    max_rate : float, optional
+        Largest number of orders sent per second.  Unlimited by default.
+    max_in_flight : int, optional
+        Largest number of orders awaiting an answer.  Default is ``1000``.
+    """
+
+    transport: Transport = field(default_factory=LocalExchange)
+    max_rate: Optional[float] = None
+    max_in_flight: int = 1000
+    reports: List[OrderReport] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        if self.max_rate is not None and self.max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        self._ids = itertools.count(1)
+        self._next_slot = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _throttle(self) -> None:
+        if self.max_rate is None:
+            return
+        now = time.perf_counter()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.max_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def submit(self, order: Order) -> OrderReport:
+        """Send one order and wait for its acknowledgement and fills."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        if not order.order_id:
+            order.order_id = next(self._ids)
+        async with self._semaphore:
+            await self._throttle()
+            sent = time.perf_counter()
+            fills = await self.transport.send(order)
+            acked = time.perf_counter()
+
+        filled = sum(f.quantity for f in fills)
+        notional = sum(f.quantity * f.price for f in fills)
+        if filled == 0:
+            status, avg_price = "cancelled", np.nan
+        else:
+            avg_price = notional / filled
+            complete = np.isclose(filled, order.quantity)
+            status = "filled" if complete else "partial"
+        report = OrderReport(order, status, filled, avg_price, fills, sent, acked)
+        self.reports.append(report)
+        return report
+
+    async def submit_schedule(
+        self, schedule: pd.DataFrame, limits: Optional[pd.Series] = None
+    ) -> List[OrderReport]:
+        """Send every row of a ``asset``/``quantity`` schedule concurrently.
+
+        Rows are submitted as fast as the throttle allows rather than at
+        their ``time``, which is what a load test needs.  ``limits`` holds
+        optional limit prices aligned with the schedule rows.
+        """
+        assets = schedule["asset"].to_numpy()
+        quantities = schedule["quantity"].to_numpy(dtype=float)
+        prices = [None] * len(schedule) if limits is None else limits.to_numpy()
+        orders = [
+            Order(a, float(q), None if p is None or np.isnan(p) else float(p))
+            for a, q, p in zip(assets, quantities, prices)
+            if q != 0
+        ]
+        return await asyncio.gather(*(self.submit(o) for o in orders))
+
+    def execute(
+        self, schedule: pd.DataFrame, limits: Optional[pd.Series] = None
+    ) -> List[OrderReport]:
+        """Blocking wrapper around :meth:`submit_schedule`."""
+        return asyncio.run(self.submit_schedule(schedule, limits))
+
+    def fills(self) -> pd.DataFrame:
+        """All fills received so far as a table."""
+        rows = [f for r in self.reports for f in r.fills]
+        return pd.DataFrame(
+            {
+                "order_id": [f.order_id for f in rows],
+                "asset": [f.asset for f in rows],
+                "quantity": [f.quantity for f in rows],
+                "price": [f.price for f in rows],
+            }
+        )
+
+    def statistics(self) -> pd.Series:
+        """Order counts, fill rate, latency percentiles and throughput."""
+        if not self.reports:
+            return pd.Series(dtype=float)
+        status = pd.Series([r.status for r in self.reports])
+        latency = np.array([r.latency for r in self.reports])
+        requested = sum(abs(r.order.quantity) for r in self.reports)
+        filled = sum(abs(r.filled) for r in self.reports)
+        elapsed = max(r.acked for r in self.reports) - min(r.sent for r in self.reports)
+        return pd.Series(
+            {
+                "orders": float(len(self.reports)),
+                "filled": float((status == "filled").sum()),
+                "partial": float((status == "partial").sum()),
+                "cancelled": float((status == "cancelled").sum()),
+                "fill_rate": filled / requested if requested else np.nan,
+                "latency_mean": float(latency.mean()),
+                "latency_p50": float(np.percentile(latency, 50)),
+                "latency_p99": float(np.percentile(latency, 99)),
+                "throughput": len(self.reports) / elapsed if elapsed > 0 else np.inf,
+            }
+        )
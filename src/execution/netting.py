@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class NettingResult:
+    """Output of :func:`net_orders`.
+
+    ``orders`` are the net whole-contract orders to send.  ``attribution``
+    splits each order across the sources that trade in its direction and
+    sums to ``orders``; ``crossed`` is the quantity of each source filled
+    internally against opposite sources.  ``summary`` has one row per
+    contract with ``gross`` source quantity, unrounded ``net``, rounded
+    ``order``, ``crossed`` quantity and ``rounding`` residual.
+    """
+
+    orders: pd.Series
+    attribution: pd.DataFrame
+    crossed: pd.DataFrame
+    summary: pd.DataFrame
+
+
+def net_orders(
+    sources: Mapping[str, Union[pd.Series, pd.DataFrame]],
+    round_lots: bool = True,
+) -> NettingResult:
+    """Combine trades from several sources into one net order per contract.
+
+    Parameters
+    ----------
+    sources : Mapping[str, Union[pd.Series, pd.DataFrame]]
+        Trades per contract for each source, e.g. ``"rebalance"``,
+        ``"roll"`` and ``"ap"``.  A DataFrame is summed over its rows, so
+        hundreds of AP baskets can be passed as one baskets x contracts
+        frame.  Quantities may be fractional.
+    round_lots : bool, optional
+        Round the net order to whole contracts.  Rounding happens only
+        after netting, so fractional source quantities are not rounded
+        one by one.  Default is ``True``.
+
+    Returns
+    -------
+    NettingResult
+        Net orders with their attribution to sources.
+    """
+    names = list(sources)
+    vectors = [
+        s.sum(axis=0) if isinstance(s, pd.DataFrame) else s for s in sources.values()
+    ]
+    contracts = pd.Index([])
+    for vector in vectors:
+        contracts = contracts.union(vector.index, sort=False)
+    flows = np.zeros((len(vectors), len(contracts)))
+    for i, vector in enumerate(vectors):
+        flows[i] = vector.reindex(contracts).fillna(0.0).to_numpy(dtype=float)
+
+    net = flows.sum(axis=0)
+    gross = np.abs(flows).sum(axis=0)
+    order = np.round(net) if round_lots else net
+    # Sources trading with the net order share it pro rata; the rest cross.
+    aligned = np.where(np.sign(flows) == np.sign(net), flows, 0.0)
+    same_way = aligned.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(same_way != 0, aligned / same_way, 0.0)
+    attribution = share * order
+    crossed = flows - share * net
+
+    summary = pd.DataFrame(
+        {
+            "gross": gross,
+            "net": net,
+            "order": order,
+            "crossed": np.abs(crossed).sum(axis=0),
+            "rounding": net - order,
+        },
+        index=contracts,
+    )
+    orders = pd.Series(order, index=contracts, name="order")
+    if round_lots:
+        orders = orders.astype(int)
+    return NettingResult(
+        orders=orders,
+        attribution=pd.DataFrame(attribution.T, index=contracts, columns=names),
+        crossed=pd.DataFrame(crossed.T, index=contracts, columns=names),
+        summary=summary,
+    )
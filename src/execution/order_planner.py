@@ -4,8 +4,9 @@ from typing import Dict, Tuple
 
 import pandas as pd
 
+from .profiles import IntradayProfile
 from .roll import roll_weights
-from .schedule import generate_cost_aware_schedule
+from .schedule import batch_cost_aware_schedule
 from .sizing import weights_to_contracts
 from .slippage import estimate_slippage
 
@@ -15,6 +16,7 @@ def plan_orders(
     current_positions: pd.Series,
     market_data: Dict[str, pd.Series],
     roll_window: int = 5,
+    output: str = "long",
 ) -> Tuple[pd.DataFrame, pd.Series]:
     """Create executable order schedules and estimate their costs.
 
@@ -27,15 +29,25 @@ def plan_orders(
     market_data : dict
         Dictionary containing market inputs. Required keys are ``prices``,
         ``multipliers``, ``fx_rates``, ``capital``, ``spread``, ``volatility``,
-        ``volume``, ``costs``, and ``days_to_expiry``.
+        ``volume``, ``costs``, and ``days_to_expiry``.  An optional
+        ``asset_class`` Series selects calibrated slippage parameters, see
+        :class:`~execution.slippage.SlippageParams`.  ``costs`` is either
+        one cost curve indexed by time, an assets x times DataFrame with a
+        curve per asset, or an :class:`~execution.profiles.IntradayProfile`
+        whose :meth:`cost_curves` are used.
     roll_window : int, optional
         Window in days over which to roll expiring contracts.
+    output : str, optional
+        ``"long"`` or ``"matrix"`` layout of the schedule, see
+        :func:`~execution.schedule.batch_cost_aware_schedule`.  Default is
+        ``"long"``.
 
     Returns
     -------
     tuple
         ``(schedule, costs)`` where ``schedule`` is a DataFrame with columns
-        ``asset``, ``time``, and ``quantity`` and ``costs`` is a Series of
+        ``asset``, ``time``, and ``quantity`` (or assets x times for
+        ``output="matrix"``) and ``costs`` is a Series of
         expected slippage cost per asset.
 
     Examples
@@ -66,23 +78,14 @@ def plan_orders(
 
     spreads = market_data["spread"].reindex(target_contracts.index)
     volatility = market_data["volatility"].reindex(target_contracts.index)
-    slippage = estimate_slippage(spreads, volatility, participation)
+    slippage = estimate_slippage(
+        spreads, volatility, participation, asset_class=market_data.get("asset_class")
+    )
     expected_cost = (slippage * total_trade.abs()).rename("cost")
 
-    schedules = []
     costs_curve = market_data["costs"]
-    for asset, qty in total_trade.items():
-        if qty == 0:
-            continue
-        sched = generate_cost_aware_schedule(float(qty), costs_curve)
-        sched["asset"] = asset
-        schedules.append(sched)
-
-    if schedules:
-        schedule_df = pd.concat(schedules, ignore_index=True)[
-            ["asset", "time", "quantity"]
-        ]
-    else:
-        schedule_df = pd.DataFrame(columns=["asset", "time", "quantity"])
+    if isinstance(costs_curve, IntradayProfile):
+        costs_curve = costs_curve.cost_curves()
+    schedule_df = batch_cost_aware_schedule(total_trade, costs_curve, output=output)
 
     return schedule_df, expected_cost
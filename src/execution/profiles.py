@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .schedule import _long_schedule
+
+
+@dataclass
+class IntradayProfile:
+    """Typical intraday liquidity of each asset.
+
+    ``volume`` holds the share of daily volume traded in each time-of-day
+    bin (rows sum to one), ``spread`` the typical spread per bin and
+    ``daily_volume`` the typical total volume per day.  Bins are indexed by
+    their offset from midnight.
+    """
+
+    volume: pd.DataFrame
+    spread: pd.DataFrame
+    daily_volume: pd.Series
+
+    def cost_curves(self) -> pd.DataFrame:
+        """Assets x bins cost curves for :func:`~execution.plan_orders`.
+
+        The cost of a bin is its spread divided by its volume share, so the
+        inverse-cost weights follow volume and avoid wide spreads.  Missing
+        or non-positive spreads are replaced by the asset's mean positive
+        spread, or by one when it has none, so those bins are weighted by
+        volume alone.  Bins without volume get no allocation.
+        """
+        spread = self.spread.reindex_like(self.volume).astype(float)
+        spread = spread.where(spread > 0)
+        spread = spread.T.fillna(spread.mean(axis=1)).T.fillna(1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            costs = spread / self.volume.where(self.volume > 0)
+        return costs.fillna(0.0)
+
+
+def _robust_mean(values: np.ndarray, statistic: str, trim: float) -> np.ndarray:
+    """Average over axis 1 ignoring ``NaN`` with a median or trimmed mean."""
+    if values.shape[1] == 0:
+        return np.full((values.shape[0],) + values.shape[2:], np.nan)
+    ordered = np.sort(values, axis=1)
+    count = (~np.isnan(values)).sum(axis=1, keepdims=True)
+    if statistic == "median":
+        lower = np.maximum(count - 1, 0) // 2
+        upper = count // 2
+        lo = np.take_along_axis(ordered, np.minimum(lower, values.shape[1] - 1), 1)
+        hi = np.take_along_axis(ordered, np.minimum(upper, values.shape[1] - 1), 1)
+        return np.where(count > 0, 0.5 * (lo + hi), np.nan)[:, 0]
+    cut = np.floor(trim * count)
+    rank = np.arange(values.shape[1]).reshape((1, -1) + (1,) * (values.ndim - 2))
+    keep = (rank >= cut) & (rank < count - cut)
+    total = np.where(keep, ordered, 0.0).sum(axis=1)
+    kept = keep.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(kept > 0, total / kept, np.nan)
+
+
+def intraday_profile(
+    bars: pd.DataFrame,
+    days: int = 20,
+    statistic: str = "median",
+    trim: float = 0.1,
+) -> IntradayProfile:
+    """Build volume and spread profiles from minute bars.
+
+    Each day's volume is converted to shares of that day's total before
+    averaging, so busy days do not dominate the shape.
+
+    Parameters
+    ----------
+    bars : pd.DataFrame
+        Long bar data with ``timestamp``, ``asset`` and ``volume`` columns
+        and optionally ``spread``, one row per asset and bar.
+    days : int, optional
+        Use the last ``days`` trading days of each asset.  Default is
+        ``20``.
+    statistic : str, optional
+        ``"median"`` or ``"trimmed"`` mean across days.  Default is
+        ``"median"``.
+    trim : float, optional
+        Fraction cut from each end for the trimmed mean.  Default is
+        ``0.1``.
+
+    Returns
+    -------
+    IntradayProfile
+        Profiles with one row per asset and one column per bin.
+    """
+    if statistic not in {"median", "trimmed"}:
+        raise ValueError("statistic must be 'median' or 'trimmed'")
+    if days <= 0:
+        raise ValueError("days must be positive")
+    if not 0 <= trim < 0.5:
+        raise ValueError("trim must be in [0, 0.5)")
+
+    stamps = pd.DatetimeIndex(bars["timestamp"])
+    session = stamps.normalize()
+    asset_code, assets = pd.factorize(bars["asset"], sort=True)
+    day_code, sessions = pd.factorize(session, sort=True)
+    bin_code, bins = pd.factorize(stamps - session, sort=True)
+
+    # Keep the last ``days`` sessions in which each asset traded.
+    traded = np.zeros((len(assets), len(sessions)), dtype=bool)
+    traded[asset_code, day_code] = True
+    recent = np.cumsum(traded[:, ::-1], axis=1)[:, ::-1] <= days
+    keep = traded & recent
+    columns = np.cumsum(keep, axis=1) - 1
+    width = max(int(keep.sum(axis=1).max(initial=0)), 1)
+    selected = keep[asset_code, day_code]
+    rows = asset_code[selected]
+    slots = columns[asset_code, day_code][selected]
+    cells = bin_code[selected]
+
+    volume = np.full((len(assets), width, len(bins)), np.nan)
+    active = np.zeros((len(assets), width), dtype=bool)
+    active[rows, slots] = True
+    volume[active] = 0.0
+    volume[rows, slots, cells] = bars["volume"].to_numpy(dtype=float)[selected]
+    totals = volume.sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = volume / totals[:, :, None]
+    shares[~np.isfinite(shares)] = np.nan
+    profile = np.nan_to_num(_robust_mean(shares, statistic, trim))
+    norm = profile.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profile = np.where(norm > 0, profile / norm, 1.0 / len(bins))
+    daily = np.nan_to_num(_robust_mean(totals[:, :, None], statistic, trim)[:, 0])
+
+    spread = np.full((len(assets), width, len(bins)), np.nan)
+    if "spread" in bars:
+        spread[rows, slots, cells] = bars["spread"].to_numpy(dtype=float)[selected]
+    spread = _robust_mean(spread, statistic, trim)
+    fallback = _robust_mean(spread[:, :, None], "median", 0.0)
+    spread = np.where(np.isnan(spread), fallback, spread)
+
+    assets = pd.Index(assets, name="asset")
+    bins = pd.TimedeltaIndex(bins, name="time")
+    return IntradayProfile(
+        volume=pd.DataFrame(profile, index=assets, columns=bins),
+        spread=pd.DataFrame(np.nan_to_num(spread), index=assets, columns=bins),
+        daily_volume=pd.Series(daily, index=assets, name="daily_volume"),
+    )
+
+
+@dataclass
+class ProfileCache:
+    """Profiles per weekday and roll period, rebuilt only when stale.
+
+    Volume patterns differ by weekday and around contract rolls, so the
+    profile for a date uses only earlier sessions with the same weekday and
+    the same roll status, falling back to all earlier sessions when none
+    match.  Results are reused until a new session enters the history.
+
+    Parameters
+    ----------
+    days : int, optional
+        Sessions per profile.  Default is ``20``.
+    statistic : str, optional
+        Averaging across sessions, see :func:`intraday_profile`.
+    trim : float, optional
+        Trimmed-mean fraction.  Default is ``0.1``.
+    roll_dates : Iterable, optional
+        Sessions that belong to a roll period.
+    """
+
+    days: int = 20
+    statistic: str = "median"
+    trim: float = 0.1
+    roll_dates: Optional[Iterable] = None
+    hits: int = field(default=0, init=False)
+    _profiles: Dict[Tuple, IntradayProfile] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def get(self, bars: pd.DataFrame, date: pd.Timestamp) -> IntradayProfile:
+        """Profile for trading on ``date`` from the bars before it."""
+        date = pd.Timestamp(date).normalize()
+        rolls = pd.DatetimeIndex(list(self.roll_dates or [])).normalize()
+        session = pd.DatetimeIndex(bars["timestamp"]).normalize()
+        history = session < date
+        in_roll = session.isin(rolls)
+        matching = (
+            history
+            & (session.weekday == date.weekday())
+            & (in_roll == (date in rolls))
+        )
+        mask = matching if matching.any() else history
+        last = session[mask].max() if mask.any() else None
+        key = (date.weekday(), date in rolls, bool(matching.any()), last)
+
+        if key in self._profiles:
+            self.hits += 1
+            return self._profiles[key]
+        profile = intraday_profile(bars[mask], self.days, self.statistic, self.trim)
+        self._profiles[key] = profile
+        return profile
+
+
+def vwap_schedule(
+    quantities: pd.Series,
+    profile: IntradayProfile,
+    max_participation: Optional[float] = None,
+    method: str = "vwap",
+    expected_volume: Optional[pd.Series] = None,
+    date: Optional[pd.Timestamp] = None,
+    output: str = "long",
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Volume-following schedules for every asset in one batch.
+
+    Parameters
+    ----------
+    quantities : pd.Series
+        Total quantity to trade per asset.
+    profile : IntradayProfile
+        Intraday profiles, e.g. from :class:`ProfileCache`.
+    max_participation : float, optional
+        Largest share of the expected volume of any bin.
+    method : str, optional
+        ``"vwap"`` spreads each order along the volume profile, scaled down
+        where it would exceed the cap.  ``"pov"`` trades at the cap from
+        the open until the order is done.  Default is ``"vwap"``.
+    expected_volume : pd.Series, optional
+        Expected volume for the day per asset.  Defaults to
+        ``profile.daily_volume``.
+    date : pd.Timestamp, optional
+        Session date; schedule times become timestamps instead of offsets.
+    output : str, optional
+        ``"long"`` or ``"matrix"`` as in
+        :func:`~execution.schedule.batch_cost_aware_schedule`.
+
+    Returns
+    -------
+    tuple
+        ``(schedule, unfilled)`` with the quantity per asset that the cap
+        leaves for another day.
+    """
+    if method not in {"vwap", "pov"}:
+        raise ValueError("method must be 'vwap' or 'pov'")
+    if method == "pov" and max_participation is None:
+        raise ValueError("pov requires max_participation")
+    if output not in {"long", "matrix"}:
+        raise ValueError("output must be 'long' or 'matrix'")
+
+    assets = quantities.index
+    shares = profile.volume.reindex(assets)
+    n_bins = shares.shape[1]
+    weights = shares.to_numpy(dtype=float)
+    missing = np.isnan(weights).all(axis=1, keepdims=True)
+    weights = np.nan_to_num(np.where(missing, 1.0 / n_bins, weights))
+
+    qty = np.nan_to_num(quantities.to_numpy(dtype=float))
+    size = np.abs(qty)
+    if max_participation is None:
+        trades = size[:, None] * weights
+    else:
+        volume = profile.daily_volume if expected_volume is None else expected_volume
+        volume = np.nan_to_num(volume.reindex(assets).to_numpy(dtype=float))
+        capacity = max_participation * volume[:, None] * weights
+        if method == "vwap":
+            trades = np.minimum(size, capacity.sum(axis=1))[:, None] * weights
+        else:
+            done = np.minimum(np.cumsum(capacity, axis=1), size[:, None])
+            trades = np.diff(done, axis=1, prepend=0.0)
+    trades = np.sign(qty)[:, None] * trades
+    unfilled = pd.Series(qty - trades.sum(axis=1), index=assets, name="unfilled")
+
+    times = shares.columns
+    if date is not None:
+        times = pd.Timestamp(date).normalize() + times
+    if output == "matrix":
+        return pd.DataFrame(trades, index=assets, columns=times), unfilled
+    return _long_schedule(trades, assets, times, qty != 0), unfilled
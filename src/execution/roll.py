@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
 
@@ -21,3 +25,179 @@ def roll_weights(days_to_expiry: pd.Series, window: int) -> pd.Series:
         return pd.Series(0.0, index=days_to_expiry.index)
     frac = (window - days_to_expiry.astype(float)) / float(window)
     return frac.clip(lower=0.0, upper=1.0)
+
+
+@dataclass
+class RollPlan:
+    """Output of :func:`plan_rolls`.
+
+    ``spreads`` is the assets x days matrix of calendar-spread orders, signed
+    like the position being rolled: ``+1`` sells one front contract and buys
+    one deferred contract of a long position.  ``front`` and ``back`` are the
+    outright trades left after netting the rebalance, ``unrolled`` the front
+    quantity the spread's liquidity cannot absorb before expiry, and
+    ``costs`` the expected cost of the spread orders and, when outright
+    inputs are given, of legging the same roll as two outright trades.
+    """
+
+    spreads: pd.DataFrame
+    front: pd.Series
+    back: pd.Series
+    unrolled: pd.Series
+    costs: pd.DataFrame
+
+
+def _impact_cost(
+    quantity: np.ndarray,
+    spread: np.ndarray,
+    volatility: np.ndarray,
+    volume: np.ndarray,
+    alpha: float,
+) -> np.ndarray:
+    """Cost of each order with the :func:`~execution.estimate_slippage` model."""
+    size = np.abs(quantity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        participation = np.where(volume > 0, size / volume, 0.0)
+    return size * (spread / 2.0 + alpha * volatility * np.sqrt(participation))
+
+
+def plan_rolls(
+    positions: pd.Series,
+    days_to_expiry: pd.Series,
+    window: int,
+    rebalance: Optional[pd.Series] = None,
+    spread_volume: Optional[pd.Series] = None,
+    max_participation: float = 0.1,
+    spread_cost: Optional[pd.Series] = None,
+    spread_volatility: Optional[pd.Series] = None,
+    outright_cost: Optional[pd.Series] = None,
+    outright_volatility: Optional[pd.Series] = None,
+    outright_volume: Optional[pd.Series] = None,
+    alpha: float = 0.1,
+    start: Optional[pd.Timestamp] = None,
+) -> RollPlan:
+    """Day-by-day calendar-spread roll schedule for the whole portfolio.
+
+    Each asset's front holding is rolled with calendar-spread orders along
+    the linear path of :func:`roll_weights`, so the share rolled by the end
+    of a day matches ``roll_weights`` for that day's days to expiry.  Where
+    the spread's daily volume cannot carry that path, rolling starts
+    earlier so it still completes on expiry.
+
+    A rebalance that cuts the position is executed outright in the front
+    contract and removes the same quantity from the roll.  Other rebalance
+    trades go to the deferred contract.  Either way the spread is never
+    traded against an opposite outright order in the same contract.
+
+    Parameters
+    ----------
+    positions : pd.Series
+        Contracts held in the expiring contract per asset.
+    days_to_expiry : pd.Series
+        Trading days until the front contract expires.
+    window : int
+        Roll window in days, as in :func:`roll_weights`.
+    rebalance : pd.Series, optional
+        Contracts to trade per asset for the rebalance.
+    spread_volume : pd.Series, optional
+        Daily volume of each calendar spread.  Without it the roll is not
+        capacity constrained; assets missing from it have no spread
+        liquidity.
+    max_participation : float, optional
+        Largest share of ``spread_volume`` traded per day.  Default is
+        ``0.1``.
+    spread_cost, spread_volatility : pd.Series, optional
+        Bid-ask spread and volatility of the calendar spread for the cost
+        estimate.
+    outright_cost, outright_volatility, outright_volume : pd.Series, optional
+        Bid-ask spread, volatility and daily volume of the outright
+        contracts.  When ``outright_cost`` is given the cost of legging the
+        same roll is reported for comparison.
+    alpha : float, optional
+        Impact coefficient of :func:`~execution.estimate_slippage`.
+    start : pd.Timestamp, optional
+        First roll day; columns become business days instead of offsets.
+
+    Returns
+    -------
+    RollPlan
+        Spread schedule, outright trades and cost estimates.
+    """
+    assets = positions.index
+    dte = days_to_expiry.reindex(assets).to_numpy(dtype=float)
+    held = np.nan_to_num(positions.to_numpy(dtype=float))
+
+    def values(series: Optional[pd.Series], default: float) -> np.ndarray:
+        if series is None:
+            return np.full(len(assets), default)
+        return series.reindex(assets).fillna(default).to_numpy(dtype=float)
+
+    # Net the rebalance against the front leg where it reduces the position.
+    trade = values(rebalance, 0.0)
+    reducing = np.sign(trade) == -np.sign(held)
+    front = np.sign(trade) * np.minimum(np.abs(trade), np.abs(held))
+    front = np.where(reducing, front, 0.0)
+    back = trade - front
+    to_roll = held + front
+
+    # The schedule runs to the last expiry among rolls that have started;
+    # later rolls that start within it are included.
+    finite = np.where(np.isnan(dte), np.inf, dte)
+    started = (finite <= max(window, 0)) & (to_roll != 0)
+    n_days = int(np.max(finite[started], initial=0.0)) + 1
+    day = np.arange(n_days)
+    expiring = finite < n_days
+
+    # Share of the remaining front rolled by the end of each day.
+    if window <= 0:
+        path = np.where(finite[:, None] <= 0, 1.0, np.zeros(n_days))
+    else:
+        done = np.clip((window - (finite[:, None] + 1)) / window, 0.0, 1.0)
+        target = np.clip((window - (finite[:, None] - day)) / window, 0.0, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            path = np.where(done < 1.0, (target - done) / (1.0 - done), 1.0)
+
+    size = np.abs(to_roll)[:, None]
+    cumulative = size * path
+    if spread_volume is not None:
+        capacity = max_participation * values(spread_volume, 0.0)[:, None]
+        remaining = np.where(expiring[:, None], finite[:, None] - day, 0.0)
+        latest = size - capacity * np.clip(remaining, 0.0, None)
+        latest = np.where(expiring[:, None], latest, 0.0)
+        cumulative = np.maximum(cumulative, latest)
+        cumulative = np.minimum(cumulative, capacity * (day + 1))
+        cumulative = np.clip(cumulative, 0.0, size)
+    daily = np.diff(cumulative, axis=1, prepend=0.0)
+    unrolled = np.where(expiring, size[:, 0] - cumulative[:, -1], 0.0)
+    spreads = np.sign(to_roll)[:, None] * daily
+
+    costs = {
+        "spread": _impact_cost(
+            daily,
+            values(spread_cost, 0.0)[:, None],
+            values(spread_volatility, 0.0)[:, None],
+            values(spread_volume, 0.0)[:, None],
+            alpha,
+        ).sum(axis=1)
+    }
+    if outright_cost is not None:
+        costs["legging"] = 2.0 * _impact_cost(
+            daily,
+            values(outright_cost, 0.0)[:, None],
+            values(outright_volatility, 0.0)[:, None],
+            values(outright_volume, 0.0)[:, None],
+            alpha,
+        ).sum(axis=1)
+
+    if start is None:
+        columns = pd.RangeIndex(n_days)
+    else:
+        columns = pd.bdate_range(start, periods=n_days)
+    sign = np.sign(to_roll)
+    return RollPlan(
+        spreads=pd.DataFrame(spreads, index=assets, columns=columns),
+        front=pd.Series(front, index=assets, name="front"),
+        back=pd.Series(back, index=assets, name="back"),
+        unrolled=pd.Series(sign * unrolled, index=assets, name="unrolled"),
+        costs=pd.DataFrame(costs, index=assets),
+    )
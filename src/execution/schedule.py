@@ -1,7 +1,36 @@
+from typing import Optional, Union
+
 import numpy as np
 import pandas as pd
 
 
+def cost_aware_weights(costs: Union[pd.Series, pd.DataFrame, np.ndarray]) -> np.ndarray:
+    """Normalized slice weights inversely proportional to cost.
+
+    Parameters
+    ----------
+    costs : Union[pd.Series, pd.DataFrame, np.ndarray]
+        Estimated cost per slice, either one curve or an assets x slices
+        matrix with one curve per row.  Zero or missing costs receive no
+        weight; a curve without any usable cost is split evenly.
+
+    Returns
+    -------
+    np.ndarray
+        Weights with the shape of ``costs``; each curve sums to one.
+    """
+    values = np.asarray(costs, dtype=float)
+    with np.errstate(divide="ignore"):
+        weights = 1.0 / values
+    weights[~np.isfinite(weights)] = 0.0
+    total = weights.sum(axis=-1, keepdims=True)
+    n_slices = values.shape[-1]
+    if n_slices == 0:
+        return weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total == 0, 1.0 / n_slices, weights / total)
+
+
 def generate_cost_aware_schedule(quantity: float, costs: pd.Series) -> pd.DataFrame:
     """Allocate quantity across times based on estimated trading costs.
 
@@ -21,12 +50,77 @@ def generate_cost_aware_schedule(quantity: float, costs: pd.Series) -> pd.DataFr
     if costs.empty:
         return pd.DataFrame(columns=["time", "quantity"])
 
-    weights = 1.0 / costs.replace(0, np.nan)
-    weights = weights.fillna(0)
-    if weights.sum() == 0:
-        weights = pd.Series(1.0 / len(costs), index=costs.index)
-    else:
-        weights = weights / weights.sum()
-    qty = quantity * weights
-    schedule = pd.DataFrame({"time": costs.index, "quantity": qty.values})
+    qty = quantity * cost_aware_weights(costs)
+    schedule = pd.DataFrame({"time": costs.index, "quantity": qty})
     return schedule
+
+
+def batch_cost_aware_schedule(
+    quantities: pd.Series,
+    costs: Union[pd.Series, pd.DataFrame, np.ndarray],
+    times: Optional[pd.Index] = None,
+    output: str = "long",
+) -> pd.DataFrame:
+    """Cost-aware schedules for many assets as one outer product.
+
+    Every asset is scheduled as in :func:`generate_cost_aware_schedule`, but
+    the assets x slices quantity matrix is computed in a single array
+    operation instead of one DataFrame per asset.
+
+    Parameters
+    ----------
+    quantities : pd.Series
+        Total quantity to trade per asset.
+    costs : Union[pd.Series, pd.DataFrame, np.ndarray]
+        One cost curve indexed by time shared by all assets, an assets x
+        times DataFrame, or an array of shape ``(len(quantities), slices)``
+        in the order of ``quantities``.
+    times : pd.Index, optional
+        Slice times for array ``costs``.  Defaults to ``0 .. slices - 1``.
+    output : str, optional
+        ``"long"`` returns the columns ``asset``, ``time`` and ``quantity``
+        with assets of zero quantity omitted; ``"matrix"`` returns the
+        assets x times quantities.  Default is ``"long"``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Schedule in the requested layout.
+    """
+    if output not in {"long", "matrix"}:
+        raise ValueError("output must be 'long' or 'matrix'")
+
+    if isinstance(costs, pd.Series):
+        times = costs.index
+        weights = cost_aware_weights(costs)[None, :]
+    elif isinstance(costs, pd.DataFrame):
+        times = costs.columns
+        weights = cost_aware_weights(costs.reindex(quantities.index))
+    else:
+        values = np.atleast_2d(np.asarray(costs, dtype=float))
+        if values.shape[0] != len(quantities):
+            raise ValueError("costs must have one row per asset")
+        times = pd.RangeIndex(values.shape[1]) if times is None else times
+        weights = cost_aware_weights(values)
+    if len(times) != weights.shape[1]:
+        raise ValueError("times must have one entry per slice")
+
+    qty = np.nan_to_num(quantities.to_numpy(dtype=float))
+    matrix = qty[:, None] * weights
+    if output == "matrix":
+        return pd.DataFrame(matrix, index=quantities.index, columns=times)
+
+    return _long_schedule(matrix, quantities.index, times, qty != 0)
+
+
+def _long_schedule(
+    matrix: np.ndarray, assets: pd.Index, times: pd.Index, active: np.ndarray
+) -> pd.DataFrame:
+    rows = np.flatnonzero(active)
+    return pd.DataFrame(
+        {
+            "asset": np.repeat(assets.to_numpy()[rows], len(times)),
+            "time": np.tile(np.asarray(times), len(rows)),
+            "quantity": matrix[rows].ravel(),
+        }
+    )
@@ -1,5 +1,46 @@
+import time
+import warnings
+from typing import Optional, Union
+
+import numpy as np
 import pandas as pd
-from typing import Union
+
+
+def _tracking_error_round(
+    target: np.ndarray,
+    value: np.ndarray,
+    cov: np.ndarray,
+    max_iter: Optional[int] = None,
+) -> np.ndarray:
+    """Integer contracts minimising ``e' cov e`` with ``e = value * n - target``.
+
+    Starts from nearest rounding and applies the best single-contract change
+    until none lowers the tracking error or ``max_iter`` changes were made
+    (default ``10 * n_assets + 10``), so the result is deterministic and
+    never worse than nearest rounding.
+    """
+    tradable = np.isfinite(value) & (value != 0)
+    v = np.where(tradable, value, 0.0)
+    contracts = np.where(tradable, target / np.where(tradable, v, 1.0), 0.0)
+    n = np.round(contracts)
+    error = v * n - np.where(tradable, target, 0.0)
+    gradient = cov @ error
+    curvature = v**2 * np.diag(cov)
+    step = np.array([-1.0, 1.0])[:, None]
+
+    if max_iter is None:
+        max_iter = 10 * len(n) + 10
+    for _ in range(max_iter):
+        # change in e' cov e from moving asset i by d contracts
+        gain = 2.0 * step * v * gradient + curvature
+        gain[:, ~tradable] = np.inf
+        best = np.unravel_index(np.argmin(gain), gain.shape)
+        if gain[best] >= 0:
+            break
+        d, i = step[best[0], 0], best[1]
+        n[i] += d
+        gradient += d * v[i] * cov[:, i]
+    return n
 
 
 def weights_to_contracts(
@@ -8,6 +49,9 @@ def weights_to_contracts(
     multipliers: pd.Series,
     fx_rates: pd.Series,
     capital: float,
+    covariance: Optional[pd.DataFrame] = None,
+    max_iter: Optional[int] = None,
+    time_budget: Optional[float] = None,
 ) -> pd.DataFrame:
     """Translate target portfolio weights into futures contract counts.
 
@@ -26,12 +70,25 @@ def weights_to_contracts(
         contract value is ``price * multiplier * fx``.
     capital : float
         Total portfolio value in base currency.
+    covariance : pd.DataFrame, optional
+        Asset return covariance.  When given, each date's contract counts
+        minimise the ex-ante tracking error of the held weights to
+        ``weights`` instead of rounding every asset on its own.  The result
+        is never worse than nearest rounding.
+    max_iter : int, optional
+        Largest number of single-contract changes per date in the
+        tracking-error search.  Defaults to ``10 * n_assets + 10``.
+    time_budget : float, optional
+        Seconds allowed for the tracking-error search over all dates.  Dates
+        not reached within the budget fall back to nearest rounding and a
+        ``RuntimeWarning`` is issued.  Each searched date is deterministic;
+        only how many dates are searched depends on timing.  Unlimited by
+        default.
 
     Returns
     -------
     pd.DataFrame
-        Number of contracts for each asset rounded to the nearest whole
-        number.
+        Number of contracts for each asset rounded to a whole number.
     """
 
     if isinstance(weights, pd.Series):
@@ -50,5 +107,25 @@ def weights_to_contracts(
     contract_value = prices.astype(float) * multipliers * fx_rates
 
     contracts = notional.div(contract_value)
-    contracts = contracts.round().fillna(0).astype(int)
-    return contracts
+    if covariance is None:
+        return contracts.round().fillna(0).astype(int)
+
+    # Tracking error in currency has the same minimiser as in weight terms.
+    cov = covariance.reindex(index=weights.columns, columns=weights.columns)
+    cov = cov.fillna(0.0).to_numpy(dtype=float)
+    target = notional.fillna(0.0).to_numpy()
+    value = contract_value.reindex_like(contracts).to_numpy(dtype=float)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    rounded = np.round(contracts.to_numpy(dtype=float))
+    rounded[~np.isfinite(rounded)] = 0.0
+    for t in range(len(target)):
+        if deadline is not None and time.perf_counter() > deadline:
+            warnings.warn(
+                f"time_budget exhausted; {len(target) - t} dates use nearest "
+                "rounding",
+                RuntimeWarning,
+            )
+            break
+        rounded[t] = _tracking_error_round(target[t], value[t], cov, max_iter)
+    result = pd.DataFrame(rounded, index=contracts.index, columns=contracts.columns)
+    return result.astype(int)
@@ -1,16 +1,129 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
 
+PARAMS_ENV = "ETF_SLIPPAGE_PARAMS"
+DEFAULT_PARAMS_PATH = "slippage_params.json"
+
+
+@dataclass
+class SlippageParams:
+    """Impact coefficient and exponent per asset class.
+
+    Classes missing from ``alpha`` or ``exponent`` use ``default_alpha`` and
+    ``default_exponent``, the square-root model of :func:`estimate_slippage`.
+    ``n_orders`` records how many orders each class was calibrated on.
+    """
+
+    alpha: Dict[str, float] = field(default_factory=dict)
+    exponent: Dict[str, float] = field(default_factory=dict)
+    n_orders: Dict[str, int] = field(default_factory=dict)
+    default_alpha: float = 0.1
+    default_exponent: float = 0.5
+
+    def for_assets(
+        self, index: pd.Index, asset_class: Optional[pd.Series] = None
+    ) -> Tuple[pd.Series, pd.Series]:
+        """Alpha and exponent for each asset in ``index``."""
+        if asset_class is None:
+            classes = pd.Series(np.nan, index=index, dtype=object)
+        else:
+            classes = asset_class.reindex(index)
+        alpha = classes.map(self.alpha).astype(float).fillna(self.default_alpha)
+        exponent = classes.map(self.exponent).astype(float)
+        return alpha, exponent.fillna(self.default_exponent)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the parameters as JSON to ``path`` or the default location."""
+        path = params_path(path)
+        path.write_text(json.dumps(asdict(self), indent=2, sort_keys=True))
+        _CACHE.clear()
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> "SlippageParams":
+        """Read saved parameters, or the defaults when no file exists."""
+        path = params_path(path)
+        if not path.exists():
+            return cls()
+        key = (str(path.resolve()), path.stat().st_mtime_ns)
+        if key not in _CACHE:
+            _CACHE.clear()
+            _CACHE[key] = cls(**json.loads(path.read_text()))
+        return _CACHE[key]
+
+
+_CACHE: Dict[Tuple[str, int], SlippageParams] = {}
+
+
+def params_path(path: Optional[Union[str, Path]] = None) -> Path:
+    """Location of the calibrated parameters.
+
+    Uses ``path`` when given, else the ``ETF_SLIPPAGE_PARAMS`` environment
+    variable, else ``slippage_params.json`` in the working directory.
+    """
+    if path is None:
+        path = os.environ.get(PARAMS_ENV, DEFAULT_PARAMS_PATH)
+    return Path(path)
+
 
 def estimate_slippage(
-    spread: pd.Series, volatility: pd.Series, participation: pd.Series, alpha: float = 0.1
+    spread: pd.Series,
+    volatility: pd.Series,
+    participation: pd.Series,
+    alpha: Optional[float] = None,
+    exponent: Optional[float] = None,
+    asset_class: Optional[pd.Series] = None,
+    params: Optional[SlippageParams] = None,
 ) -> pd.Series:
     """Estimate implementation shortfall in basis points.
 
-    cost = spread / 2 + alpha * volatility * sqrt(participation)
-    All inputs are aligned by index.
+    cost = spread / 2 + alpha * volatility * participation ** exponent
+    All inputs are aligned by index.  ``alpha`` and ``exponent`` default to
+    the calibrated values for each asset's class in ``params``, which are
+    loaded with :meth:`SlippageParams.load` when not given, and otherwise
+    to ``0.1`` and ``0.5``.
     """
     spread = spread.reindex_like(volatility).fillna(0.0)
     participation = participation.reindex_like(volatility).fillna(0.0)
-    cost = spread / 2.0 + alpha * volatility * np.sqrt(participation)
+    if alpha is None or exponent is None:
+        params = SlippageParams.load() if params is None else params
+        fitted_alpha, fitted_exponent = params.for_assets(volatility.index, asset_class)
+        alpha = fitted_alpha if alpha is None else alpha
+        exponent = fitted_exponent if exponent is None else exponent
+    cost = spread / 2.0 + alpha * volatility * participation**exponent
+    return cost
+
+
+def slippage_function(
+    spread: pd.Series,
+    volatility: pd.Series,
+    volume: pd.Series,
+    asset_class: Optional[pd.Series] = None,
+    params: Optional[SlippageParams] = None,
+) -> Callable[[str, float], float]:
+    """Per-trade cost in basis points for the event-driven backtester.
+
+    Parameters are loaded once, with :meth:`SlippageParams.load` when
+    ``params`` is not given.  The returned function maps a contract and a
+    signed quantity to the :func:`estimate_slippage` cost of that trade.
+    """
+    params = SlippageParams.load() if params is None else params
+    alpha, exponent = params.for_assets(volatility.index, asset_class)
+    half_spread = spread.reindex(volatility.index).fillna(0.0) / 2.0
+    volume = volume.reindex(volatility.index)
+
+    def cost(contract: str, quantity: float) -> float:
+        if contract not in volatility.index:
+            return 0.0
+        adv = volume[contract]
+        participation = abs(quantity) / adv if adv > 0 else 0.0
+        impact = alpha[contract] * participation ** exponent[contract]
+        return float(half_spread[contract] + impact * volatility[contract])
+
     return cost
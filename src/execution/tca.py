@@ -0,0 +1,244 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ORDER_COLUMNS = [
+    "date",
+    "asset",
+    "planned",
+    "filled",
+    "fill_rate",
+    "avg_price",
+    "notional",
+    "participation",
+    "arrival_bps",
+    "vwap_bps",
+    "close_bps",
+    "forecast_bps",
+    "forecast_error",
+]
+
+
+def tca_orders(
+    schedule: pd.DataFrame,
+    fills: pd.DataFrame,
+    benchmarks: pd.DataFrame,
+    forecast: Optional[pd.Series] = None,
+    date: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Execution quality of every parent order.
+
+    A parent order is all scheduled and filled quantity of one asset on one
+    day.  Schedules and fills are reduced per order with grouped sums over
+    integer keys rather than per-order DataFrame operations.  Slippage is in
+    basis points and positive when execution was worse than the benchmark.
+
+    Parameters
+    ----------
+    schedule : pd.DataFrame
+        Planned child orders with ``asset``, ``time`` and ``quantity``
+        columns, as returned by :func:`~execution.plan_orders`.
+    fills : pd.DataFrame
+        Executions with ``asset``, ``time``, ``quantity`` (signed) and
+        ``price`` columns.
+    benchmarks : pd.DataFrame
+        ``arrival``, ``vwap`` and ``close`` prices and market ``volume``
+        indexed by asset, or by ``(date, asset)`` for several days.
+    forecast : pd.Series, optional
+        Expected cost per asset from :func:`~execution.plan_orders`, i.e.
+        slippage times absolute quantity.  Converted to basis points per
+        unit of planned quantity.
+    date : pd.Timestamp, optional
+        Trading day of all rows.  By default each row's day is taken from
+        its ``time``.  Schedules from :func:`~execution.plan_orders` are
+        timed in intraday bins or offsets, so their day is ``date`` or,
+        when all fills fall on one day, that day.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per order with the :data:`ORDER_COLUMNS`.
+
+    Raises
+    ------
+    ValueError
+        If a frame's ``time`` holds bins or offsets and its day cannot be
+        determined.
+    """
+
+    def days(frame: pd.DataFrame, fallback=None) -> pd.Series:
+        if date is not None:
+            return pd.Series(pd.Timestamp(date), index=frame.index)
+        time = frame["time"]
+        if not (
+            pd.api.types.is_numeric_dtype(time)
+            or pd.api.types.is_timedelta64_dtype(time)
+        ):
+            return pd.to_datetime(time).dt.normalize()
+        if fallback is None:
+            raise ValueError(
+                "time holds intraday bins or offsets; pass date to set the "
+                "trading day"
+            )
+        return pd.Series(fallback, index=frame.index)
+
+    fill_days = days(fills)
+    fill_day = fill_days.iloc[0] if fill_days.nunique() == 1 else None
+    day_codes, day_values = pd.factorize(
+        pd.concat([days(schedule, fill_day), fill_days], ignore_index=True)
+    )
+    asset_codes, asset_values = pd.factorize(
+        pd.concat([schedule["asset"], fills["asset"]], ignore_index=True)
+    )
+    codes, pairs = pd.factorize(day_codes * len(asset_values) + asset_codes)
+    orders = pd.MultiIndex.from_arrays(
+        [
+            day_values.take(pairs // max(len(asset_values), 1)),
+            asset_values.take(pairs % max(len(asset_values), 1)),
+        ],
+        names=["date", "asset"],
+    )
+    n = len(orders)
+    plan_codes, fill_codes = codes[: len(schedule)], codes[len(schedule) :]
+
+    planned = np.bincount(plan_codes, schedule["quantity"].to_numpy(float), n)
+    quantity = fills["quantity"].to_numpy(dtype=float)
+    filled = np.bincount(fill_codes, quantity, n)
+    value = np.bincount(fill_codes, quantity * fills["price"].to_numpy(float), n)
+
+    if isinstance(benchmarks.index, pd.MultiIndex):
+        bench = benchmarks.reindex(orders)
+    else:
+        bench = benchmarks.reindex(orders.get_level_values("asset"))
+    side = np.sign(np.where(planned != 0, planned, filled))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_price = np.where(filled != 0, value / filled, np.nan)
+        result = {
+            "planned": planned,
+            "filled": filled,
+            "fill_rate": np.where(planned != 0, filled / planned, np.nan),
+            "avg_price": avg_price,
+            "notional": np.abs(value),
+            "participation": np.abs(filled) / bench["volume"].to_numpy(float),
+        }
+        for name in ("arrival", "vwap", "close"):
+            benchmark = bench[name].to_numpy(dtype=float)
+            result[f"{name}_bps"] = side * (avg_price / benchmark - 1.0) * 10_000.0
+        if forecast is None:
+            forecast_bps = np.full(n, np.nan)
+        else:
+            cost = forecast.reindex(orders.get_level_values("asset"))
+            forecast_bps = cost.to_numpy(dtype=float) / np.abs(planned)
+            forecast_bps[planned == 0] = np.nan
+    result["forecast_bps"] = forecast_bps
+    result["forecast_error"] = result["arrival_bps"] - forecast_bps
+
+    table = pd.DataFrame(result, index=orders).reset_index()
+    return table[ORDER_COLUMNS]
+
+
+def tca_summary(
+    orders: pd.DataFrame, by: Union[str, Sequence[str]] = "asset"
+) -> pd.DataFrame:
+    """Notional-weighted slippage and totals per group of orders.
+
+    Parameters
+    ----------
+    orders : pd.DataFrame
+        Output of :func:`tca_orders` or :attr:`TCA.orders`.
+    by : Union[str, Sequence[str]], optional
+        Grouping columns, e.g. ``"asset"``, ``"date"`` or both.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``orders``, ``planned`` and ``filled`` absolute quantity,
+        ``fill_rate``, ``notional``, mean ``participation`` and the
+        notional-weighted ``*_bps`` and ``forecast_error`` columns.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    weight = orders["notional"].fillna(0.0)
+    metrics = ["arrival_bps", "vwap_bps", "close_bps", "forecast_bps", "forecast_error"]
+    frame = pd.DataFrame(
+        {
+            "orders": 1.0,
+            "planned": orders["planned"].abs(),
+            "filled": orders["filled"].abs(),
+            "notional": weight,
+            "participation": orders["participation"],
+        }
+    )
+    for name in metrics:
+        values = orders[name]
+        frame[name] = (values * weight).where(values.notna(), 0.0)
+        frame[f"_{name}_weight"] = weight.where(values.notna(), 0.0)
+    grouped = frame.join(orders[by]).groupby(by)
+    totals = grouped.sum()
+    summary = totals[["orders", "planned", "filled", "notional"]].copy()
+    summary["orders"] = summary["orders"].astype(int)
+    summary["fill_rate"] = summary["filled"] / summary["planned"]
+    summary["participation"] = grouped["participation"].mean()
+    for name in metrics:
+        summary[name] = totals[name] / totals[f"_{name}_weight"]
+    return summary
+
+
+@dataclass
+class TCA:
+    """Order-level TCA history with daily appends.
+
+    Parameters
+    ----------
+    path : Union[str, Path], optional
+        CSV file holding the history.  Existing rows are loaded on creation
+        and every :meth:`append` rewrites only when a day is replaced;
+        otherwise new rows are appended to the end of the file.
+    """
+
+    path: Optional[Union[str, Path]] = None
+    orders: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=ORDER_COLUMNS)
+    )
+
+    def __post_init__(self) -> None:
+        if self.path is not None:
+            self.path = Path(self.path)
+            if self.path.exists():
+                self.orders = pd.read_csv(self.path, parse_dates=["date"])
+
+    def append(
+        self,
+        schedule: pd.DataFrame,
+        fills: pd.DataFrame,
+        benchmarks: pd.DataFrame,
+        forecast: Optional[pd.Series] = None,
+        date: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """Analyse one batch of orders, see :func:`tca_orders`.
+
+        Days already in the history are replaced, so a day can be re-run
+        after late fills arrive.
+
+        Returns
+        -------
+        pd.DataFrame
+            The new order rows.
+        """
+        new = tca_orders(schedule, fills, benchmarks, forecast, date)
+        replaced = self.orders["date"].isin(new["date"].unique())
+        kept = self.orders[~replaced]
+        self.orders = new if kept.empty else pd.concat([kept, new], ignore_index=True)
+        if self.path is not None:
+            if replaced.any() or not self.path.exists():
+                self.orders.to_csv(self.path, index=False)
+            else:
+                new.to_csv(self.path, mode="a", header=False, index=False)
+        return new
+
+    def summary(self, by: Union[str, Sequence[str]] = "asset") -> pd.DataFrame:
+        """Summary table of the whole history, see :func:`tca_summary`."""
+        return tca_summary(self.orders, by)
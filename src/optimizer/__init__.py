@@ -1,7 +1,19 @@
 """Optimization algorithms."""
 
 from .erc import erc
-from .turnover import band_weights, penalized_band_weights
-from .sleeves import combine_sleeves
+from .turnover import band_weight_history, band_weights, penalized_band_weights
+from .sleeves import combine_sleeve_history, combine_sleeves
+from .rebalance import CostAwareRebalancer
+from .risk_budget import risk_budget, risk_budget_path
 
-__all__ = ["erc", "band_weights", "penalized_band_weights", "combine_sleeves"]
+__all__ = [
+    "erc",
+    "band_weights",
+    "penalized_band_weights",
+    "band_weight_history",
+    "combine_sleeves",
+    "combine_sleeve_history",
+    "CostAwareRebalancer",
+    "risk_budget",
+    "risk_budget_path",
+]
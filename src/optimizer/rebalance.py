@@ -0,0 +1,275 @@
+import warnings
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _prox_trade_cost(
+    v: np.ndarray, linear: np.ndarray, impact: np.ndarray, rho: float
+) -> np.ndarray:
+    """Proximal operator of ``linear * |x| + impact * |x| ** 1.5``.
+
+    Solves ``argmin_x rho / 2 * (x - v) ** 2 + cost(x)`` element-wise in closed
+    form.  The optimality condition for ``x > 0`` is a quadratic in
+    ``sqrt(x)``.
+    """
+    shrunk = np.abs(v) - linear / rho
+    active = shrunk > 0
+    root = np.zeros_like(v)
+    disc = 2.25 * impact[active] ** 2 + 4.0 * rho**2 * shrunk[active]
+    root[active] = (-1.5 * impact[active] + np.sqrt(disc)) / (2.0 * rho)
+    return np.sign(v) * root**2
+
+
+def _project_box_gross(
+    v: np.ndarray, lower: np.ndarray, upper: np.ndarray, max_gross: Optional[float]
+) -> np.ndarray:
+    """Project ``v`` onto ``{lower <= y <= upper, sum(|y|) <= max_gross}``.
+
+    The projection is ``clip(soft_threshold(v, mu), lower, upper)`` for the
+    smallest threshold ``mu >= 0`` satisfying the gross constraint.  When the
+    box contains zero the gross exposure is piecewise linear in ``mu`` and the
+    threshold is found exactly from its sorted breakpoints; otherwise it is
+    found by bisection.
+    """
+    y = np.clip(v, lower, upper)
+    if max_gross is None or np.abs(y).sum() <= max_gross:
+        return y
+
+    abs_v = np.abs(v)
+    sign = np.sign(v)
+    if np.all(lower <= 0) and np.all(upper >= 0):
+        # gross(mu) = sum((abs_v - mu)+) - sum((abs_v - cap - mu)+)
+        cap = np.where(v >= 0, upper, -lower)
+        knee = abs_v - cap
+        a_sorted = np.sort(abs_v)
+        k_sorted = np.sort(knee)
+        a_tail = np.concatenate([np.cumsum(a_sorted[::-1])[::-1], [0.0]])
+        k_tail = np.concatenate([np.cumsum(k_sorted[::-1])[::-1], [0.0]])
+
+        def gross(mu: np.ndarray) -> np.ndarray:
+            ia = np.searchsorted(a_sorted, mu, side="right")
+            ik = np.searchsorted(k_sorted, mu, side="right")
+            n_a = len(a_sorted) - ia
+            n_k = len(k_sorted) - ik
+            return (a_tail[ia] - n_a * mu) - (k_tail[ik] - n_k * mu)
+
+        points = np.unique(np.concatenate([abs_v, knee[knee > 0], [0.0]]))
+        values = gross(points)
+        # ``values`` is non-increasing; locate the segment crossing max_gross
+        j = int(np.searchsorted(-values, -max_gross, side="left"))
+        j = min(max(j, 1), len(points) - 1)
+        x0, x1 = points[j - 1], points[j]
+        g0, g1 = values[j - 1], values[j]
+        mu = x1 if g0 == g1 else x0 + (g0 - max_gross) * (x1 - x0) / (g0 - g1)
+        return np.clip(sign * np.maximum(abs_v - mu, 0.0), lower, upper)
+
+    lo, hi = 0.0, float(abs_v.max())
+    for _ in range(60):
+        mu = 0.5 * (lo + hi)
+        y = np.clip(sign * np.maximum(abs_v - mu, 0.0), lower, upper)
+        if np.abs(y).sum() > max_gross:
+            lo = mu
+        else:
+            hi = mu
+    return np.clip(sign * np.maximum(abs_v - hi, 0.0), lower, upper)
+
+
+@dataclass
+class CostAwareRebalancer:
+    """Rebalance towards target weights while paying for trading costs.
+
+    Each call solves
+
+    ``min_w  risk_aversion * (w - target)' cov (w - target) + cost(w - current)``
+
+    subject to ``lower <= w <= upper`` and ``sum(|w|) <= max_gross``.  The
+    cost of trading ``x`` (as a fraction of capital) follows
+    :func:`~execution.slippage.estimate_slippage`::
+
+        cost = |x| * (spread / 2 + alpha * volatility * sqrt(participation))
+
+    with ``participation = |x| * capital / volume``.  The problem is solved
+    with ADMM; the cost term has a closed-form proximal step and the
+    constraints a cheap projection.  Iterates, dual variables and the
+    factorisation of ``cov`` are kept between calls so consecutive days
+    warm-start from the previous solution.  The first call warm-starts from
+    the current weights, with the cost multiplier taken from stationarity
+    there, so a portfolio already inside its no-trade region converges at
+    once.  After each call ``iterations`` and ``converged`` describe the
+    solve; a ``RuntimeWarning`` is issued when ``max_iter`` is reached
+    before the tolerance.
+
+    Parameters
+    ----------
+    risk_aversion : float, optional
+        Weight on the tracking-error variance.  Default is ``1.0``.
+    max_gross : float, optional
+        Gross leverage cap ``sum(|w|)``.  ``None`` disables the cap.
+    bounds : tuple, optional
+        ``(lower, upper)`` bounds per asset.  Each may be a scalar or a Series
+        indexed by asset.  Default is unbounded.
+    alpha : float, optional
+        Impact coefficient of the square-root cost term.  Default is ``0.1``.
+    rho : float, optional
+        Initial ADMM penalty relative to the average variance in ``cov``.
+    tol : float, optional
+        Convergence tolerance on the primal and dual residuals, per asset.
+    max_iter : int, optional
+        Maximum number of ADMM iterations per call.  Default is ``2000``.
+    """
+
+    risk_aversion: float = 1.0
+    max_gross: Optional[float] = None
+    bounds: Tuple[Union[float, pd.Series], Union[float, pd.Series]] = (
+        -np.inf,
+        np.inf,
+    )
+    alpha: float = 0.1
+    rho: float = 1.0
+    tol: float = 1e-8
+    max_iter: int = 2000
+    iterations: int = field(default=0, init=False)
+    converged: bool = field(default=False, init=False)
+    _state: Optional[dict] = field(default=None, init=False, repr=False)
+
+    def _factorize(self, cov: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        state = self._state
+        if state is not None and np.array_equal(state["cov"], cov):
+            return state["eigvals"], state["eigvecs"]
+        eigvals, eigvecs = np.linalg.eigh(cov)
+        return np.clip(eigvals, 0.0, None), eigvecs
+
+    def _bound(self, value: Union[float, pd.Series], index: pd.Index) -> np.ndarray:
+        if isinstance(value, pd.Series):
+            return value.reindex(index).astype(float).to_numpy()
+        return np.full(len(index), float(value))
+
+    def rebalance(
+        self,
+        target: pd.Series,
+        current: pd.Series,
+        cov: pd.DataFrame,
+        spread: pd.Series,
+        volatility: pd.Series,
+        volume: pd.Series,
+        capital: float,
+    ) -> Tuple[pd.Series, pd.Series]:
+        """Compute cost-aware trades towards ``target``.
+
+        Parameters
+        ----------
+        target : pd.Series
+            Desired portfolio weights.
+        current : pd.Series
+            Current portfolio weights.  Missing assets are treated as flat.
+        cov : pd.DataFrame
+            Covariance matrix of asset returns.
+        spread : pd.Series
+            Bid/ask spread as a fraction of price.
+        volatility : pd.Series
+            Return volatility over the trading horizon.
+        volume : pd.Series
+            Traded notional per day in base currency.  Assets with no volume
+            only pay the spread.
+        capital : float
+            Portfolio value in base currency.
+
+        Returns
+        -------
+        tuple
+            ``(trades, costs)`` where ``trades`` are weight changes and
+            ``costs`` is the expected cost per asset as a fraction of capital.
+        """
+        index = target.index
+        t = target.astype(float).to_numpy()
+        w0 = current.reindex(index).fillna(0.0).astype(float).to_numpy()
+        sigma = cov.reindex(index=index, columns=index).fillna(0.0).to_numpy()
+        half_spread = spread.reindex(index).fillna(0.0).to_numpy() / 2.0
+        vol = volatility.reindex(index).fillna(0.0).to_numpy()
+        adv = volume.reindex(index).astype(float).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            impact = self.alpha * vol * np.sqrt(float(capital) / adv)
+        impact = np.where(np.isfinite(impact), impact, 0.0)
+        lower = self._bound(self.bounds[0], index)
+        upper = self._bound(self.bounds[1], index)
+
+        quad = self.risk_aversion * sigma
+        eigvals, eigvecs = self._factorize(quad)
+        scale = max(float(np.mean(np.diagonal(quad))), 1e-12)
+
+        rho = self.rho * scale
+        state = self._state
+        if state is not None and state["index"].equals(index):
+            # Keep the constraint multipliers but restart the penalty and
+            # rebuild the cost multiplier from stationarity at the old solution.
+            y = _project_box_gross(state["w"], lower, upper, self.max_gross)
+            u2 = state["u2"] * state["rho"] / rho
+            u1 = -2.0 * (quad @ (y - t)) / rho - u2
+        else:
+            y = _project_box_gross(w0, lower, upper, self.max_gross)
+            u2 = np.zeros_like(t)
+            u1 = -2.0 * (quad @ (y - t)) / rho
+        x = y - w0
+        qt = quad @ t
+        eps = self.tol * np.sqrt(2.0 * len(t))
+
+        converged = False
+        for it in range(1, self.max_iter + 1):
+            # w-update: (2Q + 2 rho I) w = 2Qt + rho (w0 + x - u1 + y - u2)
+            rhs = 2.0 * qt + rho * (w0 + x - u1 + y - u2)
+            w = eigvecs @ ((eigvecs.T @ rhs) / (2.0 * eigvals + 2.0 * rho))
+
+            x_old, y_old = x, y
+            x = _prox_trade_cost(w - w0 + u1, half_spread, impact, rho)
+            y = _project_box_gross(w + u2, lower, upper, self.max_gross)
+
+            r1 = w - w0 - x
+            r2 = w - y
+            u1 = u1 + r1
+            u2 = u2 + r2
+
+            primal = np.sqrt(r1 @ r1 + r2 @ r2)
+            dual = rho * np.sqrt(
+                (x - x_old) @ (x - x_old) + (y - y_old) @ (y - y_old)
+            )
+            if primal < eps and dual < rho * eps:
+                converged = True
+                break
+
+            if it % 10 == 0:
+                if primal > 10.0 * dual:
+                    rho *= 2.0
+                    u1, u2 = u1 / 2.0, u2 / 2.0
+                elif dual > 10.0 * primal:
+                    rho /= 2.0
+                    u1, u2 = u1 * 2.0, u2 * 2.0
+
+        self.iterations = it
+        self.converged = converged
+        if not converged:
+            warnings.warn(
+                f"CostAwareRebalancer did not converge in {self.max_iter} "
+                f"iterations (primal residual {primal:.2e})",
+                RuntimeWarning,
+            )
+        self._state = {
+            "index": index,
+            "cov": quad,
+            "eigvals": eigvals,
+            "eigvecs": eigvecs,
+            "w": y,
+            "u1": u1,
+            "u2": u2,
+            "rho": rho,
+        }
+
+        trades = y - w0
+        size = np.abs(trades)
+        costs = size * (half_spread + impact * np.sqrt(size))
+        return (
+            pd.Series(trades, index=index),
+            pd.Series(costs, index=index, name="cost"),
+        )
@@ -0,0 +1,366 @@
+import warnings
+from typing import Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _solve_budget(
+    cov: np.ndarray,
+    budgets: np.ndarray,
+    y0: Optional[np.ndarray] = None,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """Newton solver for ``min 0.5 y'Cy - sum(b * log(y))`` over ``y > 0``.
+
+    At the optimum ``y_i * (C y)_i = b_i`` so the risk contributions are
+    exactly the budgets.  The objective is strictly convex, so damped Newton
+    converges quadratically from any positive start.
+    """
+    if y0 is None or not np.all(y0 > 0):
+        y0 = budgets / np.sqrt(np.diagonal(cov))
+    var = float(y0 @ cov @ y0)
+    y = y0 * np.sqrt(budgets.sum() / var) if var > 0 else y0
+
+    def objective(v: np.ndarray) -> float:
+        return float(0.5 * v @ cov @ v - budgets @ np.log(v))
+
+    f = objective(y)
+    for _ in range(max_iter):
+        cy = cov @ y
+        grad = cy - budgets / y
+        hess = cov + np.diag(budgets / y**2)
+        step = -np.linalg.solve(hess, grad)
+        decrement = float(-grad @ step)
+        if decrement / 2.0 <= tol:
+            break
+
+        t = 1.0
+        neg = step < 0
+        if neg.any():
+            t = min(1.0, 0.99 * float(np.min(-y[neg] / step[neg])))
+        while True:
+            candidate = y + t * step
+            f_new = objective(candidate)
+            if f_new <= f - 0.25 * t * decrement or t < 1e-12:
+                break
+            t *= 0.5
+        y, f = candidate, f_new
+    return y
+
+
+def _solve_budget_batch(
+    cov: np.ndarray,
+    budgets: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """Solve many small long-only risk-budgeting problems at once.
+
+    ``cov`` has shape ``(T, k, k)`` and ``budgets`` shape ``(k,)`` or
+    ``(T, k)``.  Runs damped Newton on all problems simultaneously; budgets
+    are rescaled so that the smallest positive one is one, which makes the
+    objective self-concordant and the damped step globally convergent.
+    Entries with a zero budget are decoupled from the problem and receive
+    zero weight, as in :func:`risk_budget`.
+
+    Returns
+    -------
+    np.ndarray
+        Solutions of shape ``(T, k)`` normalised to sum to one.
+    """
+    n_problems, k, _ = cov.shape
+    b = np.broadcast_to(np.asarray(budgets, dtype=float), (n_problems, k))
+    if np.any(b < 0):
+        raise ValueError("risk budgets must be non-negative")
+    active = b > 0
+    if not active.any(axis=1).all():
+        raise ValueError("risk budgets must not all be zero")
+    eye = np.eye(k)
+    if not active.all():
+        pair = active[:, :, None] & active[:, None, :]
+        cov = np.where(pair, cov, 0.0) + eye * (~active)[:, :, None]
+    smallest = np.where(active, b, np.inf).min(axis=1, keepdims=True)
+    b = np.where(active, b / smallest, 1.0)
+    diag = np.sqrt(np.einsum("tii->ti", cov))
+    y = b / diag
+    var = np.einsum("ti,tij,tj->t", y, cov, y)
+    y *= np.sqrt(b.sum(axis=1) / var)[:, None]
+
+    for _ in range(max_iter):
+        grad = np.einsum("tij,tj->ti", cov, y) - b / y
+        hess = cov + eye * (b / y**2)[:, :, None]
+        step = -np.linalg.solve(hess, grad[..., None])[..., 0]
+        decrement = np.sqrt(np.maximum(-(grad * step).sum(axis=1), 0.0))
+        if decrement.max() <= tol:
+            break
+        t = np.where(decrement > 0.25, 1.0 / (1.0 + decrement), 1.0)
+        y = y + t[:, None] * step
+    y = np.where(active, y, 0.0)
+    return y / y.sum(axis=1, keepdims=True)
+
+
+def _asset_budgets(
+    index: pd.Index,
+    budgets: Optional[pd.Series],
+    groups: Optional[pd.Series],
+    group_budgets: Optional[Mapping],
+) -> np.ndarray:
+    if budgets is None:
+        b = pd.Series(1.0, index=index)
+    else:
+        b = budgets.reindex(index).fillna(0.0).astype(float)
+    if (b < 0).any():
+        raise ValueError("risk budgets must be non-negative")
+
+    if group_budgets is not None:
+        if groups is None:
+            raise ValueError("groups are required with group_budgets")
+        labels = groups.reindex(index)
+        group_b = pd.Series(group_budgets, dtype=float)
+        within = b / b.groupby(labels).transform("sum")
+        b = within * labels.map(group_b)
+        b = b.fillna(0.0)
+
+    total = b.sum()
+    if total <= 0:
+        raise ValueError("risk budgets must not all be zero")
+    return (b / total).to_numpy()
+
+
+def _rescale_free(
+    w: np.ndarray,
+    fixed: np.ndarray,
+    cov: np.ndarray,
+    target_vol: Optional[float],
+    max_leverage: Optional[float],
+) -> np.ndarray:
+    """Scale the positions not in ``fixed`` so that ``w`` meets ``target_vol``.
+
+    Used when groups had to be cut to their limit: the other groups take up
+    the freed risk, subject to ``max_leverage``.  Without ``target_vol``, or
+    when the target cannot be reached, ``w`` is returned unchanged apart
+    from the leverage cap.
+    """
+    if target_vol is None or fixed.all():
+        return w
+    locked = np.where(fixed, w, 0.0)
+    free = w - locked
+    a = float(free @ cov @ free)
+    b = float(locked @ cov @ free)
+    c = float(locked @ cov @ locked) - target_vol**2
+    disc = b * b - a * c
+    if a <= 0 or disc < 0:
+        warnings.warn("target_vol cannot be met within group_limits", RuntimeWarning)
+        return w
+    factor = (-b + np.sqrt(disc)) / a
+    if max_leverage is not None:
+        room = max_leverage - np.abs(locked).sum()
+        factor = min(factor, max(room, 0.0) / max(np.abs(free).sum(), 1e-300))
+    return locked + factor * free
+
+
+def risk_budget(
+    cov: Union[pd.DataFrame, np.ndarray],
+    budgets: Optional[pd.Series] = None,
+    direction: Optional[pd.Series] = None,
+    groups: Optional[pd.Series] = None,
+    group_budgets: Optional[Mapping] = None,
+    group_limits: Optional[Mapping] = None,
+    target_vol: Optional[float] = None,
+    max_leverage: Optional[float] = None,
+    x0: Optional[pd.Series] = None,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> pd.Series:
+    """Risk-budgeting portfolio with signed positions and group constraints.
+
+    Generalises :func:`erc` to unequal per-asset or per-group risk budgets
+    and to long/short portfolios.  Each asset's sign is fixed by
+    ``direction`` (e.g. the sign of a trend signal) and the sizes are chosen
+    so that each asset's contribution ``w_i * (cov @ w)_i`` to portfolio
+    variance is proportional to its budget.
+
+    Parameters
+    ----------
+    cov : Union[pd.DataFrame, np.ndarray]
+        Covariance matrix of asset returns.
+    budgets : pd.Series, optional
+        Risk budget per asset.  Defaults to equal budgets.  Assets with a
+        zero budget receive zero weight.
+    direction : pd.Series, optional
+        Desired sign of each position.  Only the sign is used; assets with a
+        zero direction receive zero weight.  Defaults to long-only.
+    groups : pd.Series, optional
+        Group label (e.g. asset class or sleeve) for each asset.
+    group_budgets : Mapping, optional
+        Risk budget per group.  Within a group, the group budget is split in
+        proportion to ``budgets``.
+    group_limits : Mapping, optional
+        Maximum gross exposure per group in final weight units.  Groups above
+        their limit have their risk budget cut until they sit at the limit,
+        and the freed risk budget goes to the other groups.  If cutting the
+        budget cannot bring a group down to its limit (e.g. a hedged pair
+        keeps its gross exposure as its risk vanishes), that group alone is
+        scaled down to the limit, the other groups are scaled to keep
+        ``target_vol`` and a ``RuntimeWarning`` is issued.
+    target_vol : float, optional
+        Scale the weights so that portfolio volatility matches
+        ``target_vol``.
+    max_leverage : float, optional
+        Cap on gross exposure ``sum(|w|)`` applied after vol targeting.
+    x0 : pd.Series, optional
+        Previous solution used to warm-start the solver.
+    tol : float, optional
+        Tolerance on the Newton decrement.
+    max_iter : int, optional
+        Maximum number of Newton iterations per solve.
+
+    Returns
+    -------
+    pd.Series
+        Portfolio weights.  Without ``target_vol`` or ``max_leverage`` the
+        gross exposure is one.
+    """
+    if isinstance(cov, pd.DataFrame):
+        cov_matrix = cov.to_numpy(dtype=float)
+        labels = cov.columns
+    else:
+        cov_matrix = np.asarray(cov, dtype=float)
+        labels = pd.Index(range(cov_matrix.shape[0]))
+
+    if cov_matrix.ndim != 2 or cov_matrix.shape[0] != cov_matrix.shape[1]:
+        raise ValueError("Covariance matrix must be square")
+    if group_limits is not None and groups is None:
+        raise ValueError("groups are required with group_limits")
+
+    b = _asset_budgets(labels, budgets, groups, group_budgets)
+    if direction is None:
+        sign = np.ones(len(labels))
+    else:
+        sign = np.sign(direction.reindex(labels).fillna(0.0).to_numpy(dtype=float))
+
+    active = (b > 0) & (sign != 0)
+    if not active.any():
+        return pd.Series(0.0, index=labels)
+    s = sign[active]
+    cov_active = cov_matrix[np.ix_(active, active)] * np.outer(s, s)
+    b_active = b[active]
+
+    y0 = None
+    if x0 is not None:
+        y0 = np.abs(x0.reindex(labels).fillna(0.0).to_numpy(dtype=float))[active]
+
+    if group_limits is not None:
+        group_of = pd.Series(groups.reindex(labels).to_numpy()[active])
+        limits = pd.Series(group_limits, dtype=float)
+        limits = limits[limits.index.isin(group_of)]
+    else:
+        group_of, limits = None, None
+
+    # Each limited group's budget is multiplied by exp(log_cut).  The cut is
+    # found by a secant search on log gross against log budget, so the freed
+    # risk goes to the other groups and the volatility target still holds.
+    base = b_active
+    solve_tol = tol
+    if limits is not None:
+        # tiny cut budgets need a tight decrement to move the solution
+        solve_tol = min(tol, 1e-24)
+        log_cut = pd.Series(0.0, index=limits.index)
+        slope = pd.Series(0.5, index=limits.index)
+    previous = None
+    for _ in range(50):
+        if limits is not None:
+            cut = group_of.map(log_cut).fillna(0.0).to_numpy()
+            b_active = base * np.exp(cut)
+        share = b_active / b_active.sum()
+        y = _solve_budget(cov_active, share, y0, solve_tol, max_iter)
+        w_active = s * y / y.sum()
+
+        scale = 1.0
+        if target_vol is not None:
+            vol = float(np.sqrt(y @ cov_active @ y)) / y.sum()
+            if vol > 0:
+                scale = target_vol / vol
+        if max_leverage is not None:
+            scale = min(scale, max_leverage)
+        w_active = w_active * scale
+
+        if limits is None:
+            break
+        gross = pd.Series(np.abs(w_active)).groupby(group_of).sum()[limits.index]
+        excess = np.log(gross / limits)
+        binding = (excess > 1e-6) | ((log_cut < 0) & (excess < -1e-6))
+        if not binding.any():
+            break
+        if previous is not None:
+            d_cut, d_gross = log_cut - previous[0], np.log(gross) - previous[1]
+            stuck = (d_gross.abs() < 1e-10) & (d_cut.abs() > 1e-3)
+            if stuck[binding].all():
+                # the breaching groups no longer shrink as their budget falls
+                break
+            moved = d_cut.abs() > 1e-12
+            slope[moved] = (d_gross[moved] / d_cut[moved]).clip(0.05, 2.0)
+        previous = (log_cut.copy(), np.log(gross))
+        step = (-excess / slope).where(binding, 0.0)
+        log_cut = (log_cut + step).clip(upper=0.0)
+        y0 = y
+
+    if limits is not None:
+        gross = pd.Series(np.abs(w_active)).groupby(group_of).sum()[limits.index]
+        ratio = (limits / gross).where(gross > 0, np.inf)
+        if (ratio < 1 - 1e-5).any():
+            warnings.warn(
+                "risk budgets cannot be met within group_limits; breaching "
+                "groups are scaled down to their limit",
+                RuntimeWarning,
+            )
+        if (ratio < 1).any():
+            shrink = group_of.map(ratio.clip(upper=1.0)).fillna(1.0).to_numpy()
+            w_active = _rescale_free(
+                w_active * shrink,
+                shrink < 1,
+                cov_active * np.outer(s, s),
+                target_vol,
+                max_leverage,
+            )
+
+    weights = np.zeros(len(labels))
+    weights[active] = w_active
+    return pd.Series(weights, index=labels)
+
+
+def risk_budget_path(
+    covariances: Mapping,
+    **kwargs,
+) -> pd.DataFrame:
+    """Solve :func:`risk_budget` for a sequence of covariance matrices.
+
+    Each date is warm-started from the previous date's solution, which is
+    what makes historical batch runs cheap.
+
+    Parameters
+    ----------
+    covariances : Mapping
+        Mapping ``date -> covariance DataFrame`` in chronological order.
+    **kwargs
+        Passed to :func:`risk_budget`.  ``direction`` and ``budgets`` may be
+        DataFrames indexed by date to vary them through time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Weights indexed by date.
+    """
+    rows = {}
+    prev = kwargs.pop("x0", None)
+    for date, cov in covariances.items():
+        args = dict(kwargs)
+        for key in ("direction", "budgets"):
+            value = args.get(key)
+            if isinstance(value, pd.DataFrame):
+                args[key] = value.loc[date]
+        prev = risk_budget(cov, x0=prev, **args)
+        rows[date] = prev
+    return pd.DataFrame.from_dict(rows, orient="index")
@@ -1,8 +1,15 @@
-from typing import Optional
+from typing import Mapping, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+try:
+    from scipy.signal import lfilter
+except Exception:  # pragma: no cover - optional dependency
+    lfilter = None
+
 from .erc import erc
+from .risk_budget import _solve_budget_batch
 
 
 def combine_sleeves(
@@ -44,3 +51,155 @@ def combine_sleeves(
 
     combined = mix["trend"] * trend + mix["carry"] * carry
     return combined
+
+
+def _ewm_filter(x: np.ndarray, decay: float) -> np.ndarray:
+    """Apply ``s_t = decay * s_{t-1} + (1 - decay) * x_t`` along axis 0."""
+    if lfilter is not None:
+        return lfilter([1.0 - decay], [1.0, -decay], x, axis=0)
+    out = np.empty_like(x)
+    acc = np.zeros(x.shape[1:])
+    for i in range(x.shape[0]):
+        acc = decay * acc + (1.0 - decay) * x[i]
+        out[i] = acc
+    return out
+
+
+def rolling_sleeve_covariance(
+    returns: pd.DataFrame,
+    window: Optional[int] = None,
+    halflife: Optional[float] = None,
+) -> np.ndarray:
+    """Covariance of sleeve returns for every date in one pass.
+
+    Each date's estimate is an update of the previous one: a rolling window
+    adds the newest and drops the oldest outer product via prefix sums, an
+    exponentially weighted estimate decays the previous moments.
+
+    Parameters
+    ----------
+    returns : pd.DataFrame
+        Sleeve returns indexed by date.  Missing values count as zero.
+    window : int, optional
+        Length of a rolling window.  Matches ``returns.rolling(window).cov()``.
+    halflife : float, optional
+        Half-life in periods of an exponentially weighted estimate.  Used
+        when ``window`` is not given.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(dates, sleeves, sleeves)``.  Dates without enough
+        history are ``NaN``.
+    """
+    if (window is None) == (halflife is None):
+        raise ValueError("specify exactly one of window or halflife")
+
+    r = returns.to_numpy(dtype=float, copy=True)
+    r[np.isnan(r)] = 0.0
+    n_dates, k = r.shape
+    outer = r[:, :, None] * r[:, None, :]
+
+    if window is not None:
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        first = np.concatenate([np.zeros((1, k)), np.cumsum(r, axis=0)])
+        second = np.concatenate([np.zeros((1, k, k)), np.cumsum(outer, axis=0)])
+        end = np.arange(1, n_dates + 1)
+        start = np.maximum(end - window, 0)
+        count = (end - start).astype(float)
+        s1 = first[end] - first[start]
+        s2 = second[end] - second[start]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (s2 - s1[:, :, None] * s1[:, None, :] / count[:, None, None]) / (
+                count[:, None, None] - 1.0
+            )
+        cov[count < window] = np.nan
+        return cov
+
+    decay = 0.5 ** (1.0 / float(halflife))
+    norm = 1.0 - decay ** np.arange(1, n_dates + 1)
+    mean = _ewm_filter(r, decay) / norm[:, None]
+    second = _ewm_filter(outer.reshape(n_dates, k * k), decay).reshape(n_dates, k, k)
+    cov = second / norm[:, None, None] - mean[:, :, None] * mean[:, None, :]
+    cov[: max(int(np.ceil(halflife)), 2) - 1] = np.nan
+    return cov
+
+
+def combine_sleeve_history(
+    sleeves: Mapping[str, pd.DataFrame],
+    sleeve_returns: pd.DataFrame,
+    method: str = "risk_parity",
+    budgets: Optional[Mapping[str, float]] = None,
+    window: Optional[int] = 63,
+    halflife: Optional[float] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Combine any number of sleeves with a time-varying mix.
+
+    Parameters
+    ----------
+    sleeves : Mapping[str, pd.DataFrame]
+        Asset weight panels (dates x assets) keyed by sleeve name.
+    sleeve_returns : pd.DataFrame
+        Return history of each sleeve with one column per key of ``sleeves``.
+        Its index defines the output dates.
+    method : str, default ``'risk_parity'``
+        ``'equal'`` gives every sleeve the same capital, ``'risk_parity'``
+        equal risk contribution and ``'budget'`` risk contributions
+        proportional to ``budgets``.
+    budgets : Mapping[str, float], optional
+        Risk budget per sleeve.  Required for ``method='budget'``.
+    window : int, optional
+        Rolling covariance window.  Default is ``63``.
+    halflife : float, optional
+        Half-life of an exponentially weighted covariance.  Takes precedence
+        over ``window`` when given.
+
+    Returns
+    -------
+    tuple
+        ``(combined, mix)`` where ``combined`` is the dates x assets weight
+        panel and ``mix`` the sleeve weights per date, which sum to one.
+        Dates without enough return history use an equal mix.  Each date's
+        mix uses returns up to and including that date.
+    """
+    names = list(sleeves)
+    missing = set(names) - set(sleeve_returns.columns)
+    if missing:
+        raise ValueError(f"returns missing for sleeves: {sorted(missing)}")
+
+    index = sleeve_returns.index
+    n_dates, k = len(index), len(names)
+    mix = np.full((n_dates, k), 1.0 / k)
+
+    if method in ("risk_parity", "budget"):
+        if method == "budget":
+            if budgets is None:
+                raise ValueError("budgets required for method='budget'")
+            b = np.array([float(budgets[name]) for name in names])
+        else:
+            b = np.ones(k)
+        if halflife is not None:
+            window = None
+        cov = rolling_sleeve_covariance(
+            sleeve_returns[names], window=window, halflife=halflife
+        )
+        diag = np.einsum("tii->ti", cov)
+        valid = np.isfinite(cov).all(axis=(1, 2)) & (diag > 0).all(axis=1)
+        if valid.any():
+            mix[valid] = _solve_budget_batch(cov[valid], b)
+    elif method != "equal":
+        raise ValueError(f"unknown method: {method}")
+
+    assets = pd.Index([])
+    for panel in sleeves.values():
+        assets = assets.union(panel.columns, sort=False)
+    combined = np.zeros((n_dates, len(assets)))
+    for j, name in enumerate(names):
+        panel = sleeves[name].reindex(index=index, columns=assets).fillna(0.0)
+        combined += mix[:, j : j + 1] * panel.to_numpy(dtype=float)
+
+    return (
+        pd.DataFrame(combined, index=index, columns=assets),
+        pd.DataFrame(mix, index=index, columns=names),
+    )
@@ -1,3 +1,6 @@
+from typing import Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
 
@@ -55,3 +58,60 @@ def penalized_band_weights(
     diff = banded - current
     adjusted = current + diff * (1 - float(penalty))
     return adjusted
+
+
+def band_weight_history(
+    targets: pd.DataFrame,
+    initial: Optional[pd.Series] = None,
+    band: float = 0.0,
+    penalty: float = 0.0,
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Apply penalized turnover banding along a full history of targets.
+
+    Equivalent to calling :func:`penalized_band_weights` on every date and
+    feeding each result back in as the next day's ``current`` weights, but
+    run as a single loop over NumPy arrays.
+
+    Parameters
+    ----------
+    targets : pd.DataFrame
+        Desired portfolio weights indexed by date with assets in columns.
+        Missing values are treated as zero.
+    initial : pd.Series, optional
+        Weights held before the first date.  Defaults to a flat portfolio.
+    band : float, optional
+        No-trade band. Differences smaller than ``band`` are ignored.
+    penalty : float, optional
+        Fraction [0, 1] of each trade to penalize.
+
+    Returns
+    -------
+    tuple
+        ``(weights, turnover)`` where ``weights`` has the shape of
+        ``targets`` and ``turnover`` is the sum of absolute weight changes
+        per date.
+    """
+    target = targets.to_numpy(dtype=float, copy=True)
+    target[np.isnan(target)] = 0.0
+    if initial is None:
+        prev = np.zeros(target.shape[1])
+    else:
+        prev = initial.reindex(targets.columns).fillna(0.0).to_numpy(dtype=float)
+
+    keep = 1.0 - float(penalty)
+    out = np.empty_like(target)
+    trades = np.empty_like(target)
+    size = np.empty(target.shape[1])
+    trade = np.empty(target.shape[1], dtype=bool)
+    for i in range(target.shape[0]):
+        diff = trades[i]
+        np.subtract(target[i], prev, out=diff)
+        np.abs(diff, out=size)
+        np.greater(size, band, out=trade)
+        np.multiply(diff, trade, out=diff)
+        diff *= keep
+        prev = np.add(prev, diff, out=out[i])
+    turnover = np.abs(trades).sum(axis=1)
+
+    weights = pd.DataFrame(out, index=targets.index, columns=targets.columns)
+    return weights, pd.Series(turnover, index=targets.index, name="turnover")
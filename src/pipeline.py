@@ -3,18 +3,20 @@
 from __future__ import annotations
 
 import argparse
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from .data import fetch_ohlcv
 from .data.continuous_futures import construct_continuous_futures
-from .execution import plan_orders, weights_to_contracts
+from .execution import IntradayProfile, plan_orders, weights_to_contracts
 from .optimizer.erc import erc
+from .optimizer.rebalance import CostAwareRebalancer
 from .optimizer.turnover import penalized_band_weights
 from .reporting.rule_18f4 import generate_18f4_report
-from .risk.margin import forecast_margin
-from .risk.var import calculate_var
+from .risk.engine import RiskEngine
+from .risk.var import relative_var
 from .signals.carry import equity_carry
 from .signals.regime import predict_regime_probability, train_logistic_regime_model
 from .signals.trend import volatility_scaled_momentum
@@ -32,11 +34,14 @@ def run_daily_cycle(
     capital: float,
     margin_rates: pd.Series,
     returns: pd.DataFrame,
-    cost_estimates: pd.Series,
+    cost_estimates: Union[pd.Series, IntradayProfile],
     var_limit: float,
     band: float = 0.01,
     penalty: float = 0.5,
     target_vol: float = 0.1,
+    rebalancer: Optional[CostAwareRebalancer] = None,
+    reference_returns: Optional[pd.Series] = None,
+    engine: Optional[RiskEngine] = None,
 ) -> Dict[str, Any]:
     """Run a complete daily cycle for the trading system.
 
@@ -74,7 +79,8 @@ def run_daily_cycle(
     returns:
         Historical return series for the assets.
     cost_estimates:
-        Estimated execution costs indexed by time of day.
+        Estimated execution costs indexed by time of day, or an
+        :class:`~execution.IntradayProfile` whose cost curves are used.
     var_limit:
         VaR limit used in the compliance report.
     band:
@@ -83,6 +89,17 @@ def run_daily_cycle(
         Fraction of trades to penalize when applying turnover control.
     target_vol:
         Target portfolio volatility for the ERC optimizer.
+    rebalancer:
+        Optional cost-aware rebalancer.  When given it replaces the
+        ``band``/``penalty`` post-processing of the ERC weights.
+    reference_returns:
+        Optional returns of the designated reference portfolio.  When given
+        the compliance report applies the relative VaR test instead of
+        ``var_limit``.
+    engine:
+        Risk engine supplying the covariance, asset volatility and risk
+        checks, including the per-asset VaR contributions.  Defaults to a
+        :class:`~risk.engine.RiskEngine` with its default settings.
 
     Returns
     -------
@@ -108,17 +125,32 @@ def run_daily_cycle(
     raw_target *= 1.0 - float(regime_prob)
 
     # 3. Optimization with turnover control
-    cov = returns.cov()
+    engine = RiskEngine() if engine is None else engine
+    engine.prepare(returns)
+    cov = engine.covariance
     erc_weights = erc(cov, target_vol=target_vol)
-    target_weights = penalized_band_weights(erc_weights, current_weights, band, penalty)
+    if rebalancer is None:
+        target_weights = penalized_band_weights(
+            erc_weights, current_weights, band, penalty
+        )
+    else:
+        last_volume = contract_data.groupby("asset")["volume"].last()
+        notional_volume = last_volume * prices.iloc[-1] * multipliers * fx_rates
+        trades, _ = rebalancer.rebalance(
+            erc_weights,
+            current_weights,
+            cov,
+            spread=pd.Series(0.0, index=erc_weights.index),
+            volatility=engine.asset_volatility,
+            volume=notional_volume,
+            capital=capital,
+        )
+        target_weights = current_weights.reindex(erc_weights.index).fillna(0.0) + trades
     target_weights = target_weights.reindex(raw_target.index).fillna(0.0) * raw_target
 
     # 4. Risk checks
-    portfolio_returns = returns @ target_weights
-    var_value = calculate_var(portfolio_returns)
-    margin = forecast_margin(target_weights * capital, margin_rates)
-    cumulative = (1 + portfolio_returns).cumprod()
-    drawdown = (cumulative.cummax() - cumulative).max()
+    risk = engine.run(returns, target_weights, capital, margin_rates)
+    var_value = risk.var
 
     # 5. Execution
     latest_prices = prices.iloc[-1]
@@ -134,7 +166,7 @@ def run_daily_cycle(
         "fx_rates": fx_rates,
         "capital": capital,
         "spread": pd.Series(0.0, index=latest_prices.index),
-        "volatility": returns.std(),
+        "volatility": engine.asset_volatility,
         "volume": contract_data.groupby("asset")["volume"].last(),
         "costs": cost_estimates,
         "days_to_expiry": (
@@ -148,11 +180,22 @@ def run_daily_cycle(
     orders = target_contracts - current_positions
 
     # 6. Reporting
-    report = generate_18f4_report(
-        pd.Series(var_value, index=[prices.index[-1]]),
-        pd.Series(target_weights.abs().sum(), index=[prices.index[-1]]),
-        var_limit,
-    )
+    report_date = [prices.index[-1]]
+    exposure = pd.Series(target_weights.abs().sum(), index=report_date)
+    if reference_returns is None:
+        report = generate_18f4_report(
+            pd.Series(var_value, index=report_date), exposure, var_limit
+        )
+    else:
+        fund_returns = risk.portfolio_returns
+        relative = relative_var(
+            fund_returns,
+            reference_returns,
+            window=max(len(fund_returns), 1),
+            min_periods=1,
+        )
+        latest = relative.iloc[[-1]].set_axis(report_date)
+        report = generate_18f4_report(latest, exposure)
 
     return {
         "prices": prices,
@@ -164,8 +207,12 @@ def run_daily_cycle(
         "weights": target_weights,
         "risk": {
             "var": var_value,
-            "margin": margin,
-            "drawdown": float(drawdown),
+            "var_contributions": risk.var_contributions,
+            "es": risk.es,
+            "margin": risk.margin,
+            "drawdown": risk.drawdown,
+            "gross_leverage": risk.gross_leverage,
+            "timings": risk.timings,
         },
         "orders": orders,
         "schedule": schedule,
@@ -174,6 +221,21 @@ def run_daily_cycle(
     }
 
 
+def _session_profile(asset: str, daily_volume: float) -> IntradayProfile:
+    """U-shaped hourly volume profile for when no intraday bars are loaded.
+
+    Spreads are left unknown so the schedule follows the volume shape.
+    """
+    bins = pd.timedelta_range("9h30min", periods=7, freq="60min", name="time")
+    shape = np.array([0.20, 0.12, 0.10, 0.08, 0.10, 0.14, 0.26])
+    volume = pd.DataFrame([shape], index=[asset], columns=bins)
+    return IntradayProfile(
+        volume=volume,
+        spread=pd.DataFrame(np.nan, index=volume.index, columns=bins),
+        daily_volume=pd.Series({asset: daily_volume}),
+    )
+
+
 def main() -> None:
     """Command-line interface for running the daily pipeline."""
     parser = argparse.ArgumentParser(description="Run daily trading cycle")
@@ -206,9 +268,7 @@ def main() -> None:
         fx_rates = pd.Series({"A": 1.0})
         margin_rates = pd.Series({"A": 0.1})
         returns = pd.DataFrame({"A": [0.0, 0.01, -0.005]}, index=dates)
-        cost_estimates = pd.Series(
-            [1.0, 2.0, 3.0], index=pd.date_range(today, periods=3, freq="H")
-        )
+        cost_estimates = _session_profile("A", 1000.0)
     else:
         end = args.end or pd.Timestamp.today().normalize()
         start = args.start or end - pd.Timedelta(days=365)
@@ -236,8 +296,8 @@ def main() -> None:
         fx_rates = pd.Series({args.ticker: 1.0})
         margin_rates = pd.Series({args.ticker: 0.1})
         returns = returns.to_frame(name=args.ticker)
-        cost_estimates = pd.Series(
-            [1.0, 2.0, 3.0], index=pd.date_range(dates[-1], periods=3, freq="H")
+        cost_estimates = _session_profile(
+            args.ticker, float(ohlcv["volume"].fillna(0).tail(20).mean())
         )
 
     run_daily_cycle(
@@ -1,25 +1,53 @@
+from typing import Optional, Union
+
 import pandas as pd
 
 
-def generate_18f4_report(var: pd.Series, exposure: pd.Series, limit: float) -> pd.DataFrame:
+def generate_18f4_report(
+    var: Union[pd.Series, pd.DataFrame],
+    exposure: pd.Series,
+    limit: Optional[float] = None,
+    relative_limit: float = 2.0,
+) -> pd.DataFrame:
     """Create a simple 18f-4 compliance report.
 
     Parameters
     ----------
-    var : pd.Series
-        Portfolio VaR figures indexed by date.
+    var : Union[pd.Series, pd.DataFrame]
+        Portfolio VaR figures indexed by date for the absolute VaR test, or
+        the output of :func:`~risk.var.relative_var` (columns ``fund_var``,
+        ``reference_var`` and ``ratio``) for the relative VaR test.
     exposure : pd.Series
         Derivatives exposure as a fraction of NAV.
-    limit : float
-        VaR limit threshold.
+    limit : float, optional
+        Absolute VaR limit threshold.  Required for the absolute test.
+    relative_limit : float, optional
+        Maximum ratio of fund VaR to reference portfolio VaR in the relative
+        test.  Default is ``2.0``.
 
     Returns
     -------
     pd.DataFrame
-        Report with VaR, exposure, limit, and breach flag.
+        Report with VaR, exposure, limit, and breach flag.  The relative
+        test adds ``reference_VaR`` and ``ratio`` and its ``limit`` column
+        holds ``relative_limit``.
     """
-    df = pd.DataFrame({"VaR": var, "Exposure": exposure})
-    df["limit"] = limit
-    breach = (df["VaR"] > limit) | (df["Exposure"] > 1.0)
+    if isinstance(var, pd.DataFrame):
+        df = pd.DataFrame(
+            {
+                "VaR": var["fund_var"],
+                "reference_VaR": var["reference_var"],
+                "ratio": var["ratio"],
+                "Exposure": exposure,
+            }
+        )
+        df["limit"] = relative_limit
+        breach = (df["ratio"] > relative_limit) | (df["Exposure"] > 1.0)
+    else:
+        if limit is None:
+            raise ValueError("limit is required for the absolute VaR test")
+        df = pd.DataFrame({"VaR": var, "Exposure": exposure})
+        df["limit"] = limit
+        breach = (df["VaR"] > limit) | (df["Exposure"] > 1.0)
     df["breach"] = pd.Series([bool(x) for x in breach], index=df.index, dtype=object)
     return df
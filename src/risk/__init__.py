@@ -1,19 +1,54 @@
 """Risk management utilities."""
 
-from .covariance import hrp_weights, ledoit_wolf, sample_covariance
-from .drawdown import scale_by_drawdown
-from .margin import forecast_margin
-from .stress import shock_pnl
-from .var import calculate_var
-from .vol_target import scale_to_target_vol
+from .covariance import LinkageCache, hrp_weights, ledoit_wolf, sample_covariance
+from .decomposition import RiskDecomposition, var_decomposition
+from .drawdown import DrawdownAnalytics, drawdown_analytics, scale_by_drawdown
+from .engine import RiskEngine, RiskReport
+from .liquidity import (
+    LIQUIDITY_BUCKETS,
+    LiquidityReport,
+    adv_panel,
+    classify_liquidity,
+    volume_panel,
+)
+from .margin import forecast_margin, span_margin
+from .simulation import SimulationResult, simulate_var
+from .stress import ScenarioLibrary, historical_shocks, shock_pnl
+from .var import RelativeVaR, calculate_var, relative_var, rolling_var
+from .vol_target import VolTargeter, scale_to_target_vol
+from .volatility import ewma_variance, fit_garch, garch_variance
 
 __all__ = [
     "calculate_var",
+    "rolling_var",
+    "relative_var",
+    "RelativeVaR",
+    "simulate_var",
+    "SimulationResult",
+    "var_decomposition",
+    "RiskDecomposition",
+    "volume_panel",
+    "adv_panel",
+    "classify_liquidity",
+    "LiquidityReport",
+    "LIQUIDITY_BUCKETS",
     "forecast_margin",
+    "span_margin",
     "shock_pnl",
+    "historical_shocks",
+    "ScenarioLibrary",
     "sample_covariance",
     "ledoit_wolf",
     "hrp_weights",
+    "LinkageCache",
     "scale_to_target_vol",
+    "VolTargeter",
     "scale_by_drawdown",
+    "drawdown_analytics",
+    "DrawdownAnalytics",
+    "RiskEngine",
+    "RiskReport",
+    "ewma_variance",
+    "garch_variance",
+    "fit_garch",
 ]
@@ -1,3 +1,7 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -7,9 +11,10 @@ except Exception:  # pragma: no cover - optional dependency
     _LedoitWolf = None
 
 try:
-    from scipy.cluster.hierarchy import linkage
+    from scipy.cluster.hierarchy import leaves_list, linkage
     from scipy.spatial.distance import squareform
 except Exception:  # pragma: no cover - required for HRP
+    leaves_list = None
     linkage = None
     squareform = None
 
@@ -41,61 +46,141 @@ def ledoit_wolf(returns: pd.DataFrame) -> pd.DataFrame:
     return cov
 
 
-def _get_ivp(cov: pd.DataFrame) -> pd.Series:
-    """Compute the inverse-variance portfolio for a covariance matrix."""
-    iv = 1.0 / np.diag(cov)
-    ivp = iv / iv.sum()
-    return pd.Series(ivp, index=cov.index)
+def _get_cluster_var(cov: np.ndarray, start: int, stop: int) -> float:
+    """Inverse-variance portfolio variance of the block ``cov[start:stop]``.
+
+    ``cov`` must already be in quasi-diagonal order so that every cluster is
+    a contiguous block; the slice is then a view and nothing is copied.
+    """
+    block = cov[start:stop, start:stop]
+    iv = 1.0 / np.diagonal(block)
+    iv /= iv.sum()
+    return float(iv @ block @ iv)
+
 
+def _quasi_diag(link: np.ndarray) -> np.ndarray:
+    """Leaf order of the dendrogram encoded by ``link``.
 
-def _get_cluster_var(cov: pd.DataFrame) -> float:
-    w = _get_ivp(cov)
-    return float(w.values @ cov.values @ w.values)
+    Clusters are expanded depth-first with the left child first so that
+    similar assets end up adjacent to each other.
+    """
+    return leaves_list(link).astype(np.intp)
 
 
-def _quasi_diag(link) -> list[int]:
-    link = link.astype(int)
-    sort_ix = [link[-1, 0], link[-1, 1]]
-    n_items = link[-1, 3]
-    while max(sort_ix) >= n_items:
-        sort_ix = [
-            j if j < n_items else link[j - n_items, 0]
-            for i in sort_ix
-            for j in ([link[i - n_items, 0], link[i - n_items, 1]] if i >= n_items else [i])
-        ]
-    return sort_ix
+def _recursive_bisection(cov: np.ndarray) -> np.ndarray:
+    """Allocate weights by top-down bisection of a quasi-diagonal ``cov``.
 
+    Clusters are tracked as ``(start, stop)`` positions into ``cov`` and are
+    processed breadth-first, halving each cluster until single assets remain.
 
-def _recursive_bisection(cov: pd.DataFrame, sorted_ix: list[int]) -> pd.Series:
-    w = pd.Series(1.0, index=cov.index[sorted_ix])
-    clusters = [list(w.index)]
+    Returns
+    -------
+    np.ndarray
+        Weights in the same (sorted) order as ``cov``.
+    """
+    n = cov.shape[0]
+    w = np.ones(n)
+    clusters = deque([(0, n)])
     while clusters:
-        cluster = clusters.pop(0)
-        if len(cluster) <= 1:
+        start, stop = clusters.popleft()
+        if stop - start <= 1:
             continue
-        split = len(cluster) // 2
-        left = cluster[:split]
-        right = cluster[split:]
-        cov_left = cov.loc[left, left]
-        cov_right = cov.loc[right, right]
-        var_left = _get_cluster_var(cov_left)
-        var_right = _get_cluster_var(cov_right)
+        mid = start + (stop - start) // 2
+        var_left = _get_cluster_var(cov, start, mid)
+        var_right = _get_cluster_var(cov, mid, stop)
         alpha = 0.0
         if (var_left + var_right) > 0:
             alpha = 1 - var_left / (var_left + var_right)
-        w[left] *= alpha
-        w[right] *= 1 - alpha
-        clusters += [left, right]
+        w[start:mid] *= alpha
+        w[mid:stop] *= 1 - alpha
+        clusters.append((start, mid))
+        clusters.append((mid, stop))
     return w
 
 
-def hrp_weights(returns: pd.DataFrame) -> pd.Series:
+def _cov_corr(returns: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Sample covariance and correlation matrices as NumPy arrays.
+
+    Uses a single matrix product when ``returns`` has no missing values and
+    falls back to pandas' pairwise-complete estimators otherwise.  Undefined
+    correlations (e.g. constant series) are set to zero.
+    """
+    values = returns.to_numpy(dtype=float)
+    if np.isnan(values).any():
+        cov = returns.cov().to_numpy()
+        corr = returns.corr().fillna(0.0).to_numpy()
+        return cov, corr
+
+    demeaned = values - values.mean(axis=0)
+    cov = demeaned.T @ demeaned / (values.shape[0] - 1)
+    std = np.sqrt(np.diagonal(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr = np.nan_to_num(corr, nan=0.0, posinf=0.0, neginf=0.0)
+    return cov, corr
+
+
+def _linkage_from_corr(corr: np.ndarray, method: str) -> np.ndarray:
+    dist = np.sqrt(np.clip(0.5 * (1 - corr), 0.0, None))
+    condensed = squareform(dist, checks=False)
+    return linkage(condensed, method=method)
+
+
+@dataclass
+class LinkageCache:
+    """Reuse an HRP linkage while the correlation structure is stable.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        Largest absolute change in any pairwise correlation for which the
+        cached linkage is reused.  Default is ``0.05``.
+    """
+
+    tolerance: float = 0.05
+    corr: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    link: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    labels: Optional[pd.Index] = field(default=None, init=False, repr=False)
+    method: Optional[str] = field(default=None, init=False)
+    hits: int = field(default=0, init=False)
+
+    def get(self, corr: np.ndarray, labels: pd.Index, method: str) -> np.ndarray:
+        """Return a linkage for ``corr``, recomputing it only when needed."""
+        if (
+            self.link is not None
+            and self.method == method
+            and self.labels is not None
+            and self.labels.equals(labels)
+            and np.max(np.abs(corr - self.corr), initial=0.0) <= self.tolerance
+        ):
+            self.hits += 1
+            return self.link
+
+        self.link = _linkage_from_corr(corr, method)
+        self.corr = corr
+        self.labels = labels
+        self.method = method
+        return self.link
+
+
+def hrp_weights(
+    returns: pd.DataFrame,
+    method: str = "single",
+    cache: Optional[LinkageCache] = None,
+) -> pd.Series:
     """Hierarchical Risk Parity portfolio weights.
 
     Parameters
     ----------
     returns : pd.DataFrame
         Asset return history with assets in columns.
+    method : str, optional
+        Linkage method passed to :func:`scipy.cluster.hierarchy.linkage`
+        (``'single'``, ``'complete'``, ``'average'``, ``'ward'``, ...).
+        Default is ``'single'``.
+    cache : LinkageCache, optional
+        When provided, the clustering from a previous call is reused as long
+        as correlations have moved less than ``cache.tolerance``.
 
     Returns
     -------
@@ -105,14 +190,16 @@ def hrp_weights(returns: pd.DataFrame) -> pd.Series:
     if linkage is None or squareform is None:
         raise ImportError("scipy is required for HRP weights")
 
-    corr = returns.corr().fillna(0.0)
-    dist = np.sqrt(0.5 * (1 - corr))
-    condensed = squareform(dist.values, checks=False)
-    link = linkage(condensed, method="single")
+    labels = returns.columns
+    cov, corr = _cov_corr(returns)
+    if cache is not None:
+        link = cache.get(corr, labels, method)
+    else:
+        link = _linkage_from_corr(corr, method)
     sort_ix = _quasi_diag(link)
-    sorted_labels = corr.index[sort_ix]
-    cov = returns.cov().loc[sorted_labels, sorted_labels]
-    w = _recursive_bisection(cov, list(range(len(cov))))
-    w = w.reindex(returns.columns).fillna(0)
-    w = w / w.sum()
-    return w
+    sorted_cov = cov[np.ix_(sort_ix, sort_ix)]
+    w_sorted = _recursive_bisection(sorted_cov)
+    w = np.empty_like(w_sorted)
+    w[sort_ix] = w_sorted
+    w = np.nan_to_num(w, nan=0.0)
+    return pd.Series(w / w.sum(), index=labels)
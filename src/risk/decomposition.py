@@ -0,0 +1,243 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .var import _historical_var_es, _quantile_position
+
+try:
+    from scipy.stats import norm
+except Exception:  # pragma: no cover - optional dependency
+    norm = None
+
+
+@dataclass
+class RiskDecomposition:
+    """Output of :func:`var_decomposition`.
+
+    ``assets`` has one row per asset with the columns ``position``,
+    ``marginal_var``, ``component_var``, ``incremental_var``,
+    ``marginal_es``, ``component_es`` and ``incremental_es``.  ``groups``
+    holds the component and incremental columns aggregated per group, or is
+    ``None`` when no groups were given.
+    """
+
+    var: float
+    es: float
+    assets: pd.DataFrame
+    groups: Optional[pd.DataFrame] = None
+
+
+def _rank_kernel(n: int, position: float, bandwidth: int) -> np.ndarray:
+    """Triangular weights over sorted ranks centred on ``position``."""
+    ranks = np.arange(n)
+    return np.clip(1.0 - np.abs(ranks - position) / (bandwidth + 1), 0.0, None)
+
+
+def _kernel_marginal_var(
+    r: np.ndarray,
+    w: np.ndarray,
+    order: np.ndarray,
+    confidence: float,
+    var: float,
+    scale: float,
+    bandwidth: Optional[int] = None,
+) -> np.ndarray:
+    """Historical marginal VaR whose components ``w * marginal`` add to ``var``.
+
+    ``r`` holds the asset returns per scenario and ``order`` the scenarios
+    sorted by portfolio P&L.  Asset returns are averaged with a triangular
+    kernel over the ranks around the VaR quantile.
+    """
+    n_obs = len(order)
+    position = (n_obs - 1) * (1.0 - confidence)
+    if bandwidth is None:
+        bandwidth = max(1, int(np.sqrt(int(position) + 1)))
+    kernel = _rank_kernel(n_obs, position, bandwidth)
+    near = kernel > 0
+    weights = kernel[near] / kernel[near].sum()
+    marginal = -(weights @ r[order[near]]) * scale
+    total = float(w @ marginal)
+    if total != 0:
+        marginal = marginal * (var / total)
+    return marginal
+
+
+def _tail_stats(pnl: np.ndarray, lo: int, frac: float):
+    """VaR quantile and tail mean per column, using partial sorts only."""
+    n = pnl.shape[0]
+    hi = min(lo + 1, n - 1)
+    part = np.partition(pnl, [lo, hi], axis=0)
+    quantile = part[lo] + frac * (part[hi] - part[lo])
+    return quantile, part[: lo + 1].mean(axis=0)
+
+
+def var_decomposition(
+    returns: pd.DataFrame,
+    positions: pd.Series,
+    groups: Optional[pd.Series] = None,
+    method: str = "historical",
+    confidence: float = 0.99,
+    horizon: int = 20,
+    bandwidth: Optional[int] = None,
+    cov: Optional[pd.DataFrame] = None,
+) -> RiskDecomposition:
+    """Marginal, component and incremental VaR/ES per asset and group.
+
+    ``marginal`` is the sensitivity of the risk measure to one more unit of
+    an asset's position, ``component`` is position times marginal (the
+    components add up to the total) and ``incremental`` is the reduction in
+    the risk measure from removing the position entirely.  All figures use
+    the square-root-of-time scaling of :func:`~risk.var.calculate_var`, so
+    the total historical VaR equals ``calculate_var`` on the portfolio
+    return series.
+
+    In ``"historical"`` mode the portfolio P&L is sorted once.  Marginal ES
+    is the average asset return over the tail scenarios.  Marginal VaR is
+    a triangular-kernel average of asset returns over the scenarios ranked
+    around the quantile, with components rescaled to add up to the VaR.
+    Incremental figures come from partial sorts of the P&L with each
+    position removed.  ``"parametric"`` mode uses the normal closed forms
+    with the covariance matrix.
+
+    Parameters
+    ----------
+    returns : pd.DataFrame
+        Daily asset returns, one column per asset.  Rows with missing
+        returns for a held asset are ignored in historical mode.
+    positions : pd.Series
+        Position per asset, in weights or base currency.
+    groups : pd.Series, optional
+        Group label (e.g. sleeve) per asset for the aggregated table.
+    method : str, optional
+        ``"historical"`` or ``"parametric"``.
+    confidence : float, optional
+        Confidence level.  Default is ``0.99``.
+    horizon : int, optional
+        Horizon in days.  Default is ``20``.
+    bandwidth : int, optional
+        Half-width in ranks of the historical VaR kernel.  Defaults to the
+        square root of the number of tail scenarios.
+    cov : pd.DataFrame, optional
+        Covariance used in parametric mode.  Defaults to ``returns.cov()``.
+
+    Returns
+    -------
+    RiskDecomposition
+        Totals with per-asset and per-group tables.
+    """
+    if method not in {"historical", "parametric"}:
+        raise ValueError("method must be 'historical' or 'parametric'")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    assets = returns.columns
+    w = positions.reindex(assets).fillna(0.0).to_numpy(dtype=float)
+    scale = np.sqrt(horizon)
+    p = 1.0 - confidence
+
+    if groups is not None:
+        labels = groups.reindex(assets)
+        codes, names = pd.factorize(labels)
+        member = np.zeros((len(assets), len(names)))
+        known = codes >= 0
+        member[np.flatnonzero(known), codes[known]] = 1.0
+    else:
+        member, names = None, None
+
+    if method == "parametric":
+        if norm is None:
+            raise ImportError("scipy is required for parametric decomposition")
+        sigma = (returns.cov() if cov is None else cov).reindex(
+            index=assets, columns=assets
+        ).fillna(0.0).to_numpy(dtype=float)
+        z = float(norm.ppf(confidence))
+        es_factor = float(norm.pdf(z)) / p
+        sw = sigma @ w
+        variance = float(w @ sw)
+        vol = np.sqrt(max(variance, 0.0))
+        beta = sw / vol if vol > 0 else np.zeros_like(sw)
+        reduced = variance - 2 * w * sw + w**2 * np.diagonal(sigma)
+        reduced = np.sqrt(np.clip(reduced, 0.0, None))
+
+        var = z * vol * scale
+        es = es_factor * vol * scale
+        marginal_var = z * beta * scale
+        marginal_es = es_factor * beta * scale
+        component_var = w * marginal_var
+        component_es = w * marginal_es
+        incremental_var = var - z * reduced * scale
+        incremental_es = es - es_factor * reduced * scale
+        if member is not None:
+            wg = member * w[:, None]
+            swg = sigma @ wg
+            group_reduced = (
+                variance
+                - 2 * (wg * sw[:, None]).sum(axis=0)
+                + (wg * swg).sum(axis=0)
+            )
+            group_reduced = np.sqrt(np.clip(group_reduced, 0.0, None))
+            group_incremental_var = var - z * group_reduced * scale
+            group_incremental_es = es - es_factor * group_reduced * scale
+    else:
+        r = returns.to_numpy(dtype=float)
+        held = w != 0
+        r = r[~np.isnan(r[:, held]).any(axis=1)]
+        r = np.nan_to_num(r)
+        n_obs = len(r)
+        if n_obs == 0:
+            raise ValueError("no complete observations for the held assets")
+
+        asset_pnl = r * w
+        pnl = asset_pnl.sum(axis=1)
+        order = np.argsort(pnl, kind="stable")
+        var, es = _historical_var_es(pnl[order], confidence, horizon)
+        lo, _, frac = _quantile_position(n_obs, confidence)
+        tail = order[: lo + 1]
+
+        marginal_var = _kernel_marginal_var(
+            r, w, order, confidence, var, scale, bandwidth
+        )
+        marginal_es = -r[tail].mean(axis=0) * scale
+        component_var = w * marginal_var
+        component_es = w * marginal_es
+
+        without = pnl[:, None] - asset_pnl
+        q, m = _tail_stats(without, lo, frac)
+        incremental_var = var + q * scale
+        incremental_es = es + m * scale
+        if member is not None:
+            without = pnl[:, None] - asset_pnl @ member
+            q, m = _tail_stats(without, lo, frac)
+            group_incremental_var = var + q * scale
+            group_incremental_es = es + m * scale
+
+    table = pd.DataFrame(
+        {
+            "position": w,
+            "marginal_var": marginal_var,
+            "component_var": component_var,
+            "incremental_var": incremental_var,
+            "marginal_es": marginal_es,
+            "component_es": component_es,
+            "incremental_es": incremental_es,
+        },
+        index=assets,
+    )
+
+    group_table = None
+    if member is not None:
+        group_table = pd.DataFrame(
+            {
+                "component_var": component_var @ member,
+                "incremental_var": group_incremental_var,
+                "component_es": component_es @ member,
+                "incremental_es": group_incremental_es,
+            },
+            index=pd.Index(names, name=groups.name),
+        )
+
+    return RiskDecomposition(
+        var=float(var), es=float(es), assets=table, groups=group_table
+    )
@@ -1,3 +1,6 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Union
+
 import numpy as np
 import pandas as pd
 
@@ -28,3 +31,138 @@ def scale_by_drawdown(equity_curve: pd.Series, max_drawdown: float) -> float:
     current = drawdown.iloc[-1]
     scale = 1 - current / max_drawdown
     return float(np.clip(scale, 0.0, 1.0))
+
+
+@dataclass
+class DrawdownAnalytics:
+    """Output of :func:`drawdown_analytics`.
+
+    Every field has the shape of the input equity curve(s).
+    ``rolling_max_drawdown`` maps each window length to its series.
+    """
+
+    drawdown: Union[pd.Series, pd.DataFrame]
+    underwater: Union[pd.Series, pd.DataFrame]
+    recovery: Union[pd.Series, pd.DataFrame]
+    scale: Optional[Union[pd.Series, pd.DataFrame]] = None
+    rolling_max_drawdown: Dict[int, Union[pd.Series, pd.DataFrame]] = field(
+        default_factory=dict
+    )
+
+
+def _rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Largest peak-to-trough loss within each trailing window.
+
+    The history is cut into blocks of ``window`` rows.  A window either
+    coincides with a block or spans the suffix of one block and the prefix
+    of the next, so its maximum drawdown combines prefix statistics of one
+    block, suffix statistics of the other and the loss from the suffix peak
+    to the prefix trough.  All statistics are cumulative maxima and minima
+    within blocks, which keeps the cost ``O(T)`` for any window length.
+    """
+    n_obs, n_cols = equity.shape
+    pad = window + (-n_obs) % window
+    padded = np.vstack([np.full((pad, n_cols), np.nan), equity])
+    blocks = padded.reshape(-1, window, n_cols)
+    backward = blocks[:, ::-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prefix_max = np.fmax.accumulate(blocks, axis=1)
+        prefix_min = np.fmin.accumulate(blocks, axis=1)
+        prefix_dd = np.fmax.accumulate(1.0 - blocks / prefix_max, axis=1)
+        suffix_max = np.fmax.accumulate(backward, axis=1)[:, ::-1]
+        suffix_min = np.fmin.accumulate(backward, axis=1)[:, ::-1]
+        suffix_dd = np.fmax.accumulate((1.0 - suffix_min / blocks)[:, ::-1], axis=1)
+        suffix_dd = suffix_dd[:, ::-1]
+
+    def flat(a: np.ndarray) -> np.ndarray:
+        return a.reshape(-1, n_cols)
+
+    prefix_min, prefix_dd = flat(prefix_min), flat(prefix_dd)
+    suffix_max, suffix_dd = flat(suffix_max), flat(suffix_dd)
+
+    end = np.arange(pad, pad + n_obs)
+    start = end - window + 1
+    worst = prefix_dd[end]
+    split = start % window != 0
+    e, s = end[split], start[split]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cross = 1.0 - prefix_min[e] / suffix_max[s]
+    worst[split] = np.fmax(np.fmax(suffix_dd[s], prefix_dd[e]), cross)
+    worst[np.isnan(equity)] = np.nan
+    return worst
+
+
+def drawdown_analytics(
+    equity_curve: Union[pd.Series, pd.DataFrame],
+    max_drawdown: Optional[float] = None,
+    windows: Sequence[int] = (63, 252),
+) -> DrawdownAnalytics:
+    """Drawdown series and governor scale for the whole history.
+
+    Computes in one vectorized pass what :func:`scale_by_drawdown` gives for
+    the last point only, for any number of equity curves.
+
+    Parameters
+    ----------
+    equity_curve : Union[pd.Series, pd.DataFrame]
+        Cumulative portfolio values, one column per curve.  Leading ``NaN``
+        values are ignored.
+    max_drawdown : float, optional
+        Drawdown at which exposure is fully reduced.  When given, the
+        governor scale ``clip(1 - drawdown / max_drawdown, 0, 1)`` is
+        returned for every date.
+    windows : Sequence[int], optional
+        Window lengths for the rolling maximum drawdown.
+
+    Returns
+    -------
+    DrawdownAnalytics
+        ``drawdown`` is the running drawdown from the prior peak,
+        ``underwater`` the number of periods since that peak and
+        ``recovery`` the number of periods until the peak is regained
+        (``NaN`` if it never is).
+    """
+    if max_drawdown is not None and max_drawdown <= 0:
+        raise ValueError("max_drawdown must be positive")
+    if any(w <= 0 for w in windows):
+        raise ValueError("windows must be positive")
+
+    if isinstance(equity_curve, pd.Series):
+        frame = equity_curve.to_frame()
+    else:
+        frame = equity_curve
+    values = frame.to_numpy(dtype=float)
+    n_obs = len(values)
+    missing = np.isnan(values)
+
+    peak = np.fmax.accumulate(values, axis=0) if n_obs else values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = (peak - values) / peak
+
+    steps = np.broadcast_to(np.arange(n_obs, dtype=float)[:, None], values.shape)
+    at_peak = (drawdown <= 0) & ~missing
+    last_peak = pd.DataFrame(np.where(at_peak, steps, np.nan)).ffill().to_numpy()
+    next_peak = pd.DataFrame(np.where(at_peak, steps, np.nan)).bfill().to_numpy()
+    underwater = steps - last_peak
+    recovery = next_peak - steps
+    underwater[missing] = np.nan
+    recovery[missing] = np.nan
+
+    def wrap(data: np.ndarray) -> Union[pd.Series, pd.DataFrame]:
+        out = pd.DataFrame(data, index=frame.index, columns=frame.columns)
+        if isinstance(equity_curve, pd.Series):
+            return out.iloc[:, 0].rename(equity_curve.name)
+        return out
+
+    scale = None
+    if max_drawdown is not None:
+        scale = wrap(np.clip(1 - drawdown / max_drawdown, 0.0, 1.0))
+
+    rolling = {int(w): wrap(_rolling_max_drawdown(values, int(w))) for w in windows}
+    return DrawdownAnalytics(
+        drawdown=wrap(drawdown),
+        underwater=wrap(underwater),
+        recovery=wrap(recovery),
+        scale=scale,
+        rolling_max_drawdown=rolling,
+    )
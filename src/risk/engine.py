@@ -0,0 +1,220 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .decomposition import _kernel_marginal_var
+from .drawdown import drawdown_analytics
+from .margin import forecast_margin
+from .var import _historical_var_es
+
+
+@dataclass
+class RiskReport:
+    """Daily risk metrics produced by :class:`RiskEngine`.
+
+    ``var`` and ``es`` follow :func:`~risk.var.calculate_var` (square-root
+    of time, positive losses) and ``var_contributions`` are the component
+    VaRs of :func:`~risk.decomposition.var_decomposition`, which add up to
+    ``var``.  ``volatility`` is annualised.  ``drawdown``
+    is the largest drawdown of the cumulative portfolio return relative to
+    its running peak.  ``herfindahl`` is the sum of squared shares of gross
+    exposure and ``effective_n`` its inverse.  ``timings`` holds the
+    seconds spent on each metric.
+    """
+
+    portfolio_returns: pd.Series
+    volatility: float
+    var: float
+    es: float
+    var_contributions: pd.Series
+    drawdown: float
+    margin: pd.Series
+    gross_leverage: float
+    net_leverage: float
+    herfindahl: float
+    effective_n: float
+    max_weight: float
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class RiskEngine:
+    """Compute all daily risk metrics from one shared return window.
+
+    The asset return panel is converted to an array once and cached
+    together with derived statistics such as per-asset volatility and the
+    covariance matrix, so the optimizer, the risk checks and execution can
+    reuse them instead of recomputing from the DataFrame.
+
+    Parameters
+    ----------
+    confidence : float, optional
+        VaR and ES confidence level.  Default is ``0.99``.
+    horizon : int, optional
+        VaR horizon in days.  Default is ``20``.
+    window : int, optional
+        Use only the trailing ``window`` observations.  Defaults to the
+        whole history.
+    """
+
+    confidence: float = 0.99
+    horizon: int = 20
+    window: Optional[int] = None
+    _cache: Dict[str, object] = field(default_factory=dict, init=False, repr=False)
+
+    def prepare(self, returns: pd.DataFrame) -> None:
+        """Cache the return window unless it holds the same data as before.
+
+        The cache is keyed on the shape, labels and a hash of the window's
+        values, so a frame that is extended or edited in place is picked up
+        while repeated calls with unchanged data reuse the cached
+        statistics.
+        """
+        window = returns if self.window is None else returns.tail(self.window)
+        values = window.to_numpy(dtype=float)
+        key = (
+            values.shape,
+            tuple(window.columns),
+            tuple(window.index[[0, -1]]) if len(window) else (),
+            hash(np.ascontiguousarray(values).tobytes()),
+        )
+        if self._cache.get("key") == key:
+            return
+        self._cache = {
+            "key": key,
+            "frame": window,
+            "values": values,
+            "complete": not np.isnan(values).any(),
+        }
+
+    def _get(self, key: str) -> object:
+        if "values" not in self._cache:
+            raise ValueError("prepare must be called first")
+        return self._cache[key]
+
+    @property
+    def asset_volatility(self) -> pd.Series:
+        """Daily standard deviation of each asset (``ddof=1``)."""
+        if "std" not in self._cache:
+            self._cache["std"] = self._get("frame").std()
+        return self._cache["std"]
+
+    @property
+    def covariance(self) -> pd.DataFrame:
+        """Sample covariance of the asset returns, as ``DataFrame.cov``."""
+        if "cov" not in self._cache:
+            frame = self._get("frame")
+            if self._get("complete") and len(frame) > 1:
+                cov = np.atleast_2d(np.cov(self._get("values"), rowvar=False))
+                result = pd.DataFrame(
+                    cov, index=frame.columns, columns=frame.columns
+                )
+            else:
+                result = frame.cov()
+            self._cache["cov"] = result
+        return self._cache["cov"]
+
+    def run(
+        self,
+        returns: pd.DataFrame,
+        weights: pd.Series,
+        capital: float,
+        margin_rates: Union[pd.Series, float],
+    ) -> RiskReport:
+        """Evaluate ``weights`` against the cached return window.
+
+        Parameters
+        ----------
+        returns : pd.DataFrame
+            Historical asset returns.
+        weights : pd.Series
+            Portfolio weights.  Assets without returns are ignored for the
+            return-based metrics.
+        capital : float
+            Portfolio capital used to convert weights to notional for margin.
+        margin_rates : Union[pd.Series, float]
+            Margin rates passed to :func:`~risk.margin.forecast_margin`.
+
+        Returns
+        -------
+        RiskReport
+            All metrics with per-metric timings.
+        """
+        timings: Dict[str, float] = {}
+        clock = time.perf_counter
+
+        start = clock()
+        self.prepare(returns)
+        frame = self._get("frame")
+        values = self._get("values")
+        w = weights.reindex(frame.columns).fillna(0.0).to_numpy(dtype=float)
+        port = values @ w
+        complete = ~np.isnan(port)
+        valid = port[complete]
+        timings["returns"] = clock() - start
+
+        start = clock()
+        volatility = np.nan
+        if len(valid) > 1:
+            volatility = float(np.std(valid, ddof=1) * np.sqrt(252))
+        timings["volatility"] = clock() - start
+
+        start = clock()
+        var = es = np.nan
+        contributions = np.full(len(w), np.nan)
+        if len(valid):
+            order = np.argsort(valid, kind="stable")
+            var, es = _historical_var_es(valid[order], self.confidence, self.horizon)
+            marginal = _kernel_marginal_var(
+                values[complete],
+                w,
+                order,
+                self.confidence,
+                var,
+                np.sqrt(self.horizon),
+            )
+            contributions = w * marginal
+        timings["var"] = clock() - start
+
+        start = clock()
+        drawdown = 0.0
+        if len(valid):
+            cumulative = pd.Series(np.cumprod(1.0 + valid))
+            drawdown = float(drawdown_analytics(cumulative, windows=()).drawdown.max())
+        timings["drawdown"] = clock() - start
+
+        start = clock()
+        margin = forecast_margin(weights * capital, margin_rates)
+        timings["margin"] = clock() - start
+
+        start = clock()
+        exposure = weights.fillna(0.0).to_numpy(dtype=float)
+        gross = float(np.abs(exposure).sum())
+        net = float(exposure.sum())
+        if gross > 0:
+            shares = np.abs(exposure) / gross
+            herfindahl = float((shares**2).sum())
+            effective_n = 1.0 / herfindahl
+            max_weight = float(shares.max())
+        else:
+            herfindahl, effective_n, max_weight = 0.0, 0.0, 0.0
+        timings["exposure"] = clock() - start
+
+        return RiskReport(
+            portfolio_returns=pd.Series(port, index=frame.index),
+            volatility=volatility,
+            var=var,
+            es=es,
+            var_contributions=pd.Series(contributions, index=frame.columns),
+            drawdown=drawdown,
+            margin=margin,
+            gross_leverage=gross,
+            net_leverage=net,
+            herfindahl=herfindahl,
+            effective_n=effective_n,
+            max_weight=max_weight,
+            timings=timings,
+        )
@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+LIQUIDITY_BUCKETS = (
+    "highly_liquid",
+    "moderately_liquid",
+    "less_liquid",
+    "illiquid",
+)
+
+
+def volume_panel(contract_data: pd.DataFrame) -> pd.DataFrame:
+    """Daily traded volume per asset summed over contracts.
+
+    Parameters
+    ----------
+    contract_data : pd.DataFrame
+        Long contract data with ``date``, ``asset`` and ``volume`` columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Volume indexed by date with one column per asset.
+    """
+    return contract_data.groupby(["date", "asset"])["volume"].sum().unstack("asset")
+
+
+def adv_panel(
+    volume: pd.DataFrame,
+    window: int = 20,
+    prices: Optional[pd.DataFrame] = None,
+    multipliers: Optional[pd.Series] = None,
+    fx_rates: Optional[pd.Series] = None,
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    """Rolling average daily volume, optionally in base-currency notional.
+
+    Parameters
+    ----------
+    volume : pd.DataFrame
+        Traded contracts per date and asset, e.g. from :func:`volume_panel`.
+    window : int, optional
+        Averaging window in days.  Default is ``20``.
+    prices : pd.DataFrame, optional
+        Prices aligned with ``volume``.  When given the ADV is converted to
+        notional with ``multipliers`` and ``fx_rates`` (both default to one).
+    min_periods : int, optional
+        Minimum observations per window.  Defaults to ``window``.
+
+    Returns
+    -------
+    pd.DataFrame
+        ADV with the shape of ``volume``, using volume up to each date.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    traded = volume.astype(float)
+    if prices is not None:
+        scale = prices.reindex(index=traded.index, columns=traded.columns)
+        if multipliers is not None:
+            scale = scale * multipliers.reindex(traded.columns)
+        if fx_rates is not None:
+            scale = scale * fx_rates.reindex(traded.columns)
+        traded = traded * scale
+    min_periods = window if min_periods is None else min_periods
+    return traded.rolling(window, min_periods=min_periods).mean()
+
+
+@dataclass
+class LiquidityReport:
+    """Output of :func:`classify_liquidity`.
+
+    ``days`` and ``bucket`` have the shape of the positions; ``bucket``
+    holds indices into :data:`LIQUIDITY_BUCKETS`, or ``-1`` for holdings
+    without ADV, whose ``days`` are ``NaN``.  ``summary`` has one row per
+    date (and portfolio) with the share of net assets in each bucket, the
+    ``unclassified`` share and the ``hlim_breach`` and ``illiquid_breach``
+    flags.
+    """
+
+    days: pd.DataFrame
+    bucket: pd.DataFrame
+    summary: pd.DataFrame
+
+
+def _per_asset(
+    value: Union[float, pd.Series], columns: pd.Index, default: float
+) -> np.ndarray:
+    if isinstance(value, pd.Series):
+        return value.reindex(columns).fillna(default).astype(float).to_numpy()
+    return np.full(len(columns), float(value))
+
+
+def classify_liquidity(
+    positions: pd.DataFrame,
+    adv: pd.DataFrame,
+    participation: Union[float, pd.Series] = 0.2,
+    haircut: Union[float, pd.Series] = 0.0,
+    trade_fraction: float = 1.0,
+    thresholds: Sequence[float] = (3, 7),
+    settlement_days: float = 1.0,
+    nav: Optional[Union[float, pd.Series]] = None,
+    hlim: float = 0.85,
+    illiquid_limit: float = 0.15,
+) -> LiquidityReport:
+    """Days-to-liquidate and Rule 22e-4 liquidity buckets for every holding.
+
+    Each position is sold at no more than ``participation`` of a stressed
+    ADV, ``adv * (1 - haircut)``, so it takes
+    ``|position| * trade_fraction / (participation * stressed_adv)`` trading
+    days, and it is converted to cash ``settlement_days`` later.  A holding
+    is highly liquid when it converts to cash within ``thresholds[0]``
+    business days, moderately liquid when it converts within
+    ``thresholds[1]`` calendar days, less liquid when it can be sold but not
+    settled within that limit and illiquid when it cannot be sold within
+    ``thresholds[1]`` calendar days.  Trading days count as ``7 / 5``
+    calendar days.  Holdings whose ADV is missing, e.g. new listings or the
+    warm-up of :func:`adv_panel`, are left unclassified rather than treated
+    as illiquid.  They count in net assets but in no bucket, and their
+    share is reported as ``unclassified`` so they can be classified by
+    hand.  A zero ADV still makes a holding illiquid.
+
+    Parameters
+    ----------
+    positions : pd.DataFrame
+        Notional per asset in base currency.  Rows are dates, or a
+        ``(date, portfolio)`` MultiIndex to classify several portfolios at
+        once.
+    adv : pd.DataFrame
+        Notional ADV indexed by date, e.g. from :func:`adv_panel`.
+    participation : Union[float, pd.Series], optional
+        Maximum share of daily volume traded per asset.  Default is ``0.2``,
+        which also applies to assets missing from a Series.
+    haircut : Union[float, pd.Series], optional
+        Stress reduction applied to ADV per asset.  Default is ``0``, also
+        for assets missing from a Series.
+    trade_fraction : float, optional
+        Share of each position sold, i.e. the reasonably anticipated trade
+        size.  Default is ``1``.
+    thresholds : Sequence[float], optional
+        Highly liquid limit in business days and the sale limit in calendar
+        days.  Default is ``(3, 7)`` as in Rule 22e-4.
+    settlement_days : float, optional
+        Business days between sale and cash.  Default is ``1`` for futures.
+    nav : Union[float, pd.Series], optional
+        Net assets per row for the bucket shares.  Defaults to gross
+        exposure.
+    hlim : float, optional
+        Highly liquid investment minimum.  Default is ``0.85``.
+    illiquid_limit : float, optional
+        Maximum share of illiquid investments.  Default is ``0.15``.
+
+    Returns
+    -------
+    LiquidityReport
+        Days, buckets and per-row summary.  Rows with no net assets are
+        never flagged as breaches.
+    """
+    if len(thresholds) != 2 or min(thresholds) <= 0:
+        raise ValueError("thresholds must be two positive day limits")
+    if settlement_days < 0:
+        raise ValueError("settlement_days must be non-negative")
+
+    assets = positions.columns
+    if isinstance(positions.index, pd.MultiIndex):
+        dates = positions.index.get_level_values(0)
+    else:
+        dates = positions.index
+    capacity = adv.reindex(columns=assets).reindex(dates).to_numpy(dtype=float)
+    capacity = capacity * _per_asset(participation, assets, 0.2)
+    capacity = capacity * (1.0 - _per_asset(haircut, assets, 0.0))
+
+    size = np.abs(positions.to_numpy(dtype=float)) * trade_fraction
+    size = np.nan_to_num(size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(size > 0, size / capacity, 0.0)
+    days = np.where(days < 0, np.inf, days)
+    unknown = np.isnan(days)
+
+    business, calendar = float(thresholds[0]), float(thresholds[1])
+    converted = days + settlement_days
+    bucket = np.full(days.shape, 3)
+    bucket[days * 7.0 / 5.0 <= calendar] = 2
+    bucket[converted * 7.0 / 5.0 <= calendar] = 1
+    bucket[converted <= business] = 0
+    bucket[unknown] = -1
+
+    exposure = np.abs(np.nan_to_num(positions.to_numpy(dtype=float)))
+    if nav is None:
+        denominator = exposure.sum(axis=1)
+    elif isinstance(nav, pd.Series):
+        denominator = nav.reindex(positions.index).to_numpy(dtype=float)
+    else:
+        denominator = np.full(len(positions), float(nav))
+
+    shares = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        codes = list(enumerate(LIQUIDITY_BUCKETS)) + [(-1, "unclassified")]
+        for code, name in codes:
+            held = (exposure * (bucket == code)).sum(axis=1)
+            shares[name] = np.where(denominator > 0, held / denominator, 0.0)
+    summary = pd.DataFrame(shares, index=positions.index)
+    funded = denominator > 0
+    summary["hlim_breach"] = funded & (summary["highly_liquid"] < hlim)
+    summary["illiquid_breach"] = funded & (summary["illiquid"] > illiquid_limit)
+
+    return LiquidityReport(
+        days=pd.DataFrame(days, index=positions.index, columns=assets),
+        bucket=pd.DataFrame(bucket, index=positions.index, columns=assets),
+        summary=summary,
+    )
@@ -1,3 +1,7 @@
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
 import pandas as pd
 
 
@@ -18,3 +22,160 @@ def shock_pnl(positions: pd.Series, shocks: pd.Series) -> float:
     """
     aligned = positions.reindex(shocks.index).fillna(0.0)
     return float((aligned * shocks).sum())
+
+
+HISTORICAL_EPISODES: Dict[str, Tuple[str, str]] = {
+    "2008_lehman": ("2008-09-12", "2008-11-20"),
+    "2020_covid": ("2020-02-19", "2020-03-23"),
+    "2022_rates": ("2022-01-03", "2022-10-12"),
+}
+
+
+def historical_shocks(
+    prices: pd.DataFrame,
+    episodes: Optional[Mapping[str, Tuple[str, str]]] = None,
+) -> pd.DataFrame:
+    """Turn historical episodes into price shocks.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Price panel indexed by date with one column per asset.  For futures
+        use ratio-adjusted prices so that roll gaps are not counted as
+        returns.
+    episodes : Mapping, optional
+        Mapping ``name -> (start, end)``.  Defaults to
+        :data:`HISTORICAL_EPISODES`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Scenarios x assets matrix of returns from the first to the last
+        available price inside each window.  Assets without two prices in a
+        window get ``NaN``; episodes outside the panel are dropped.
+    """
+    episodes = HISTORICAL_EPISODES if episodes is None else episodes
+    panel = prices.sort_index()
+    rows = {}
+    for name, (start, end) in episodes.items():
+        window = panel.loc[pd.Timestamp(start) : pd.Timestamp(end)]
+        if len(window) < 2:
+            continue
+        shock = window.ffill().iloc[-1] / window.bfill().iloc[0] - 1.0
+        shock[window.count() < 2] = np.nan
+        rows[name] = shock
+    return pd.DataFrame.from_dict(rows, orient="index", columns=prices.columns)
+
+
+@dataclass
+class ScenarioLibrary:
+    """Library of stress scenarios stored as a scenarios x assets matrix.
+
+    Shocks are simple price returns.  Assets missing from a scenario are
+    treated as unchanged.  Portfolios are valued against every scenario with
+    a single matrix multiply.
+
+    Parameters
+    ----------
+    shocks : pd.DataFrame, optional
+        Initial scenarios x assets shock matrix.
+    """
+
+    shocks: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    def add(self, name: str, shocks: Union[pd.Series, Mapping]) -> None:
+        """Add or replace one hand-written scenario."""
+        row = pd.DataFrame([pd.Series(shocks, dtype=float)], index=[name])
+        self.extend(row)
+
+    def extend(self, shocks: pd.DataFrame) -> None:
+        """Add or replace several scenarios given as a scenarios x assets frame."""
+        kept = self.shocks.drop(index=shocks.index, errors="ignore")
+        self.shocks = pd.concat([kept, shocks.astype(float)])
+
+    def add_historical(
+        self,
+        prices: pd.DataFrame,
+        episodes: Optional[Mapping[str, Tuple[str, str]]] = None,
+    ) -> None:
+        """Add episodes from a price panel, see :func:`historical_shocks`."""
+        self.extend(historical_shocks(prices, episodes))
+
+    def evaluate(
+        self,
+        positions: Union[pd.Series, pd.DataFrame],
+        severity: float = 1.0,
+        nonlinear: bool = False,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """P&L of one or many portfolios under every scenario.
+
+        Parameters
+        ----------
+        positions : Union[pd.Series, pd.DataFrame]
+            Position sizes in base currency per asset, or a portfolios x
+            assets frame.
+        severity : float, optional
+            Multiplier applied to every shock.  Default is ``1.0``.
+        nonlinear : bool, optional
+            Apply ``severity`` to log price relatives, ``(1 + r) ** severity
+            - 1``, instead of to the returns themselves.  This is the correct
+            scaling for ratio-adjusted futures, whose shocks compound: a
+            stressed crash approaches but never exceeds a total loss.
+
+        Returns
+        -------
+        Union[pd.Series, pd.DataFrame]
+            P&L per scenario, with one column per portfolio for frame input.
+        """
+        if isinstance(positions, pd.Series):
+            frame = positions.to_frame().T
+        else:
+            frame = positions
+        assets = self.shocks.columns.union(frame.columns, sort=False)
+        shocks = self.shocks.reindex(columns=assets).to_numpy(dtype=float)
+        shocks = np.nan_to_num(shocks)
+        if nonlinear:
+            shocks = np.expm1(severity * np.log1p(np.maximum(shocks, -1.0)))
+        elif severity != 1.0:
+            shocks = severity * shocks
+        weights = frame.reindex(columns=assets).fillna(0.0).to_numpy(dtype=float)
+        pnl = shocks @ weights.T
+        if isinstance(positions, pd.Series):
+            return pd.Series(pnl[:, 0], index=self.shocks.index, name=positions.name)
+        return pd.DataFrame(pnl, index=self.shocks.index, columns=frame.index)
+
+    def worst(
+        self,
+        positions: Union[pd.Series, pd.DataFrame],
+        n: int = 5,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Rank the ``n`` worst scenarios for each portfolio.
+
+        Returns
+        -------
+        pd.DataFrame
+            Long table with columns ``portfolio``, ``rank``, ``scenario`` and
+            ``pnl``, ordered by portfolio and rank (``1`` is the worst).
+        """
+        pnl = self.evaluate(positions, **kwargs)
+        if isinstance(pnl, pd.Series):
+            pnl = pnl.to_frame()
+        values = pnl.to_numpy()
+        n = min(n, len(values))
+        if n == 0:
+            return pd.DataFrame(columns=["portfolio", "rank", "scenario", "pnl"])
+        idx = np.argpartition(values, n - 1, axis=0)[:n]
+        candidates = np.take_along_axis(values, idx, axis=0)
+        order = np.argsort(candidates, axis=0, kind="stable")
+        idx = np.take_along_axis(idx, order, axis=0)
+        losses = np.take_along_axis(values, idx, axis=0)
+        n_ports = values.shape[1]
+        return pd.DataFrame(
+            {
+                "portfolio": np.repeat(pnl.columns.to_numpy(), n),
+                "rank": np.tile(np.arange(1, n + 1), n_ports),
+                "scenario": pnl.index.to_numpy()[idx.T.ravel()],
+                "pnl": losses.T.ravel(),
+            }
+        )
@@ -1,6 +1,9 @@
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Dict, Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
-from typing import Union
 
 
 def calculate_var(
@@ -27,9 +30,13 @@ def calculate_var(
     """
 
     if isinstance(returns, pd.DataFrame):
-        return returns.apply(
-            lambda x: calculate_var(x, confidence=confidence, horizon=horizon)
-        )
+        values = returns.to_numpy(dtype=float)
+        var = np.full(values.shape[1], np.nan)
+        has_data = ~np.isnan(values).all(axis=0)
+        if values.shape[0] and has_data.any():
+            quantile = np.nanquantile(values[:, has_data], 1 - confidence, axis=0)
+            var[has_data] = -quantile * np.sqrt(horizon)
+        return pd.Series(var, index=returns.columns)
 
     if returns.empty:
         return float("nan")
@@ -41,3 +48,326 @@ def calculate_var(
     quantile = np.nanquantile(series, 1 - confidence)
     var = -quantile * np.sqrt(horizon)
     return float(var)
+
+
+def _quantile_position(n, confidence: float):
+    """Rank of the VaR quantile among ``n`` ascending observations.
+
+    Returns ``(lo, hi, frac)`` such that the quantile is
+    ``ordered[lo] + frac * (ordered[hi] - ordered[lo])``, the linear
+    interpolation used by ``np.quantile``.  ``n`` may be an array.
+    """
+    position = (np.asarray(n) - 1) * (1.0 - confidence)
+    lo = np.floor(position).astype(np.int64)
+    return lo, np.minimum(lo + 1, np.asarray(n) - 1), position - lo
+
+
+def _historical_var_es(
+    ordered: np.ndarray, confidence: float, horizon: int = 1
+) -> Tuple[float, float]:
+    """VaR and ES as positive losses from ascending returns or P&L.
+
+    ES is the mean over the observations at or below the VaR quantile.
+    Both are scaled by ``sqrt(horizon)``.
+    """
+    lo, hi, frac = _quantile_position(len(ordered), confidence)
+    quantile = ordered[lo] + frac * (ordered[hi] - ordered[lo])
+    scale = np.sqrt(horizon)
+    return -float(quantile) * scale, -float(ordered[: lo + 1].mean()) * scale
+
+
+class _RankTree:
+    """Fenwick trees over value ranks, one per column, updated in lockstep.
+
+    Every observation of a column gets a fixed rank among all of that
+    column's observations.  Counts and sums are stored by rank, so adding or
+    removing an observation and finding the ``k``-th smallest value in the
+    current window are ``O(log n)`` operations, vectorized across columns.
+    Trees are padded to a power of two so every operation runs a fixed
+    number of steps on flat indices.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        n_obs, n_cols = values.shape
+        order = np.argsort(values, axis=0, kind="stable")
+        cols = np.arange(n_cols)
+        rank = np.empty((n_obs, n_cols), dtype=np.int64)
+        rank[order, cols] = np.arange(1, n_obs + 1)[:, None]
+        self.top = 1 << int(np.floor(np.log2(max(n_obs, 1))))
+        self.width = 2 * self.top + 1
+        self.base = cols * self.width
+        self.rank = rank + self.base
+        self.sorted = np.take_along_axis(values, order, axis=0).T.ravel()
+        self.sorted_base = cols * n_obs
+        self.size = n_obs
+        # padding beyond ``n_obs`` holds a count no query can ever exceed
+        count = np.zeros((n_cols, self.width), dtype=np.int32)
+        count[:, n_obs + 1 :] = np.iinfo(np.int32).max // 4
+        self.count = count.ravel()
+        self.total = np.zeros(n_cols * self.width)
+        self.steps = int(np.log2(self.top)) + 2
+
+    def update(self, row: int, values: np.ndarray, sign: int) -> None:
+        idx = self.rank[row]
+        base = self.base
+        missing = np.isnan(values)
+        if missing.any():
+            idx, base, values = idx[~missing], base[~missing], values[~missing]
+        pos = idx - base
+        vals = sign * values
+        last = 2 * self.top
+        for _ in range(self.steps):
+            flat = base + pos
+            self.count[flat] += sign
+            self.total[flat] += vals
+            pos = np.minimum(pos + (pos & -pos), last)
+
+    def select(self, k: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``k``-th smallest value (1-based) and the sum up to it.
+
+        ``k`` may hold several queries per column stacked as ``(m, n_cols)``.
+        """
+        base = np.broadcast_to(self.base, k.shape)
+        pos = np.zeros_like(k)
+        remaining = k.copy()
+        below = np.zeros(k.shape)
+        step = self.top
+        while step:
+            flat = base + pos + step
+            cnt = self.count[flat]
+            ok = cnt < remaining
+            pos += step * ok
+            remaining -= cnt * ok
+            below += np.where(ok, self.total[flat], 0.0)
+            step >>= 1
+        idx = np.minimum(pos, self.size - 1) + self.sorted_base
+        value = self.sorted[idx]
+        return value, below + value
+
+
+def rolling_var(
+    returns: Union[pd.Series, pd.DataFrame],
+    window: int = 250,
+    confidence: float = 0.99,
+    horizon: int = 20,
+    min_periods: Optional[int] = None,
+) -> Tuple[Union[pd.Series, pd.DataFrame], Union[pd.Series, pd.DataFrame]]:
+    """Rolling historical VaR and expected shortfall.
+
+    For each date the VaR equals :func:`calculate_var` applied to the
+    trailing ``window`` observations.  Instead of sorting every window, a
+    rank-indexed Fenwick tree per column is updated as observations enter
+    and leave the window, so each day costs ``O(log n)`` per column and all
+    columns are processed together.
+
+    Parameters
+    ----------
+    returns : Union[pd.Series, pd.DataFrame]
+        Daily return series, one column per portfolio.  ``NaN`` values are
+        ignored.
+    window : int, optional
+        Number of observations in each window.  Default is ``250``.
+    confidence : float, optional
+        Confidence level.  Default is ``0.99``.
+    horizon : int, optional
+        Horizon in days for square-root-of-time scaling.  Default is ``20``.
+    min_periods : int, optional
+        Minimum number of non-missing observations required.  Defaults to
+        ``window``.
+
+    Returns
+    -------
+    tuple
+        ``(var, es)`` with the same shape as ``returns``.  Expected shortfall
+        is the average loss over the observations at or below the VaR
+        quantile, scaled like the VaR.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    min_periods = window if min_periods is None else int(min_periods)
+
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+    values = frame.to_numpy(dtype=float)
+    n_obs, n_cols = values.shape
+    var = np.full((n_obs, n_cols), np.nan)
+    es = np.full((n_obs, n_cols), np.nan)
+
+    if n_obs:
+        tree = _RankTree(values)
+        count = np.zeros(n_cols, dtype=np.int64)
+        scale = np.sqrt(horizon)
+        for t in range(n_obs):
+            tree.update(t, values[t], 1)
+            count += ~np.isnan(values[t])
+            if t >= window:
+                tree.update(t - window, values[t - window], -1)
+                count -= ~np.isnan(values[t - window])
+
+            ready = count >= max(min_periods, 1)
+            if not ready.any():
+                continue
+            lo, hi, frac = _quantile_position(np.maximum(count, 1), confidence)
+            k = np.stack([lo + 1, hi + 1])
+            found, cumulative = tree.select(k)
+            low, high = found
+            quantile = low + frac * (high - low)
+            var[t, ready] = -quantile[ready] * scale
+            es[t, ready] = -(cumulative[0] / (lo + 1))[ready] * scale
+
+    var_df = pd.DataFrame(var, index=frame.index, columns=frame.columns)
+    es_df = pd.DataFrame(es, index=frame.index, columns=frame.columns)
+    if isinstance(returns, pd.Series):
+        name = returns.name
+        return var_df.iloc[:, 0].rename(name), es_df.iloc[:, 0].rename(name)
+    return var_df, es_df
+
+
+def _aligned_pair(fund: pd.Series, reference: pd.Series) -> pd.DataFrame:
+    pair = pd.concat([fund, reference], axis=1, keys=["fund", "reference"])
+    pair[pair.isna().any(axis=1)] = np.nan
+    return pair
+
+
+def relative_var(
+    fund_returns: pd.Series,
+    reference_returns: pd.Series,
+    window: int = 756,
+    confidence: float = 0.99,
+    horizon: int = 20,
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    """Fund VaR relative to a designated reference portfolio.
+
+    Both VaRs use :func:`rolling_var` on exactly the same observations: a
+    date missing from either series is dropped from both and carries the
+    previous figures.
+
+    Parameters
+    ----------
+    fund_returns : pd.Series
+        Daily fund returns.
+    reference_returns : pd.Series
+        Daily returns of the designated reference portfolio.
+    window : int, optional
+        Number of observations per window.  Default is ``756`` (three
+        years).
+    confidence : float, optional
+        Confidence level.  Default is ``0.99``.
+    horizon : int, optional
+        Horizon in days.  Default is ``20``.
+    min_periods : int, optional
+        Minimum number of observations.  Defaults to ``window``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``fund_var``, ``reference_var`` and ``ratio`` indexed by
+        date.
+    """
+    pair = _aligned_pair(fund_returns, reference_returns)
+    var, _ = rolling_var(pair.dropna(), window, confidence, horizon, min_periods)
+    var = var.reindex(pair.index).ffill()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = var["fund"] / var["reference"]
+    return pd.DataFrame(
+        {
+            "fund_var": var["fund"],
+            "reference_var": var["reference"],
+            "ratio": ratio,
+        }
+    )
+
+
+class RelativeVaR:
+    """Incremental relative VaR for daily production use.
+
+    Keeps the current window of fund and reference returns in sorted
+    order.  Each :meth:`update` inserts one observation and drops the
+    oldest one by binary search, and the VaR then reads fixed positions of
+    the sorted windows, so the cost per day does not depend on the length
+    of the history.  The list shift is ``O(window)`` but a single memory
+    move, which for windows of a few thousand days costs less than the
+    Python overhead of a tree walk.  :class:`_RankTree` is not used here
+    because it ranks every observation up front, which needs the whole
+    history in advance.  Results equal :func:`relative_var` over the same
+    data.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of observations per window.  Default is ``756``.
+    confidence : float, optional
+        Confidence level.  Default is ``0.99``.
+    horizon : int, optional
+        Horizon in days.  Default is ``20``.
+    min_periods : int, optional
+        Minimum number of observations.  Defaults to ``window``.
+    """
+
+    def __init__(
+        self,
+        window: int = 756,
+        confidence: float = 0.99,
+        horizon: int = 20,
+        min_periods: Optional[int] = None,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.confidence = confidence
+        self.horizon = horizon
+        self.min_periods = window if min_periods is None else int(min_periods)
+        self._recent: deque = deque()
+        self._sorted: Tuple[list, list] = ([], [])
+
+    def fit(
+        self, fund_returns: pd.Series, reference_returns: pd.Series
+    ) -> pd.DataFrame:
+        """Compute the full history and keep the last window for updates."""
+        pair = _aligned_pair(fund_returns, reference_returns).dropna()
+        tail = pair.tail(self.window).to_numpy()
+        self._recent = deque(map(tuple, tail))
+        self._sorted = (sorted(tail[:, 0]), sorted(tail[:, 1]))
+        return relative_var(
+            fund_returns,
+            reference_returns,
+            self.window,
+            self.confidence,
+            self.horizon,
+            self.min_periods,
+        )
+
+    def _var(self, values: list) -> float:
+        lo, hi, frac = _quantile_position(len(values), self.confidence)
+        quantile = values[lo] + frac * (values[hi] - values[lo])
+        return -quantile * np.sqrt(self.horizon)
+
+    def update(
+        self, fund_return: float, reference_return: float
+    ) -> Dict[str, float]:
+        """Add one day of returns and return the current figures.
+
+        Days where either return is missing leave the window unchanged.
+        """
+        fund_sorted, ref_sorted = self._sorted
+        if not (np.isnan(fund_return) or np.isnan(reference_return)):
+            self._recent.append((fund_return, reference_return))
+            insort(fund_sorted, fund_return)
+            insort(ref_sorted, reference_return)
+            if len(self._recent) > self.window:
+                old_fund, old_ref = self._recent.popleft()
+                del fund_sorted[bisect_left(fund_sorted, old_fund)]
+                del ref_sorted[bisect_left(ref_sorted, old_ref)]
+
+        if len(self._recent) < max(self.min_periods, 1):
+            fund_var = reference_var = float("nan")
+        else:
+            fund_var = self._var(fund_sorted)
+            reference_var = self._var(ref_sorted)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.float64(fund_var) / reference_var
+        return {
+            "fund_var": float(fund_var),
+            "reference_var": float(reference_var),
+            "ratio": float(ratio),
+        }
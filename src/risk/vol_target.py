@@ -1,6 +1,11 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
 
+from .volatility import ewma_variance, fit_garch, garch_variance
+
 
 def scale_to_target_vol(
     returns: pd.Series, target_vol: float, window: int = 252
@@ -34,3 +39,247 @@ def scale_to_target_vol(
         return 0.0
 
     return float(target_vol / realized)
+
+
+@dataclass
+class VolTargeter:
+    """Leverage series that targets a constant portfolio volatility.
+
+    :meth:`fit` computes the leverage for every date of a return history,
+    one column per portfolio, and keeps the state of the volatility
+    forecast.  :meth:`update` then advances every portfolio by one day in
+    ``O(1)``, so a live process gives the same numbers as a backtest over
+    the same history.
+
+    The leverage on a date uses returns up to and including that date, is
+    ``target_vol / forecast`` with the forecast annualised by ``sqrt(252)``,
+    and is ``0`` when the forecast is zero.  Missing returns are skipped:
+    the leverage is carried forward and the forecast is not updated.
+
+    Parameters
+    ----------
+    target_vol : float
+        Desired annualized volatility (e.g., ``0.1`` for 10%).
+    method : str, optional
+        ``"rolling"`` uses ``std(ddof=0)`` of the last ``window``
+        observations as :func:`scale_to_target_vol` does, ``"ewma"`` an
+        exponentially weighted mean of squared returns with decay ``lam``
+        and ``"garch"`` a GARCH(1,1) forecast.  Default is ``"ewma"``.
+    window : int, optional
+        Lookback for the rolling method.  Default is ``252``.
+    lam : float, optional
+        EWMA decay factor.  Default is ``0.94``.
+    min_periods : int, optional
+        Observations required before a leverage is produced.  Default is
+        ``20``.
+    max_leverage : float, optional
+        Cap applied to the raw leverage.
+    smoothing : float, optional
+        Half-life in days of exponential smoothing applied to the capped
+        leverage.
+    garch_params : tuple, optional
+        ``(omega, alpha, beta)`` per portfolio.  When omitted they are
+        fitted by :func:`~risk.volatility.fit_garch` on the history passed
+        to :meth:`fit`, which looks ahead within that history.
+    """
+
+    target_vol: float
+    method: str = "ewma"
+    window: int = 252
+    lam: float = 0.94
+    min_periods: int = 20
+    max_leverage: Optional[float] = None
+    smoothing: Optional[float] = None
+    garch_params: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    _state: Optional[dict] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.method not in {"rolling", "ewma", "garch"}:
+            raise ValueError("method must be 'rolling', 'ewma' or 'garch'")
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+        if self.min_periods <= 0:
+            raise ValueError("min_periods must be positive")
+
+    def _leverage(self, variance: np.ndarray) -> np.ndarray:
+        vol = np.sqrt(np.clip(variance, 0.0, None) * 252)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lev = np.where(vol > 0, self.target_vol / vol, 0.0)
+        lev = np.where(np.isnan(variance), np.nan, lev)
+        if self.max_leverage is not None:
+            lev = np.minimum(lev, self.max_leverage)
+        return lev
+
+    def _alpha(self) -> Optional[float]:
+        if self.smoothing is None:
+            return None
+        return 1.0 - 0.5 ** (1.0 / self.smoothing)
+
+    def fit(
+        self, returns: Union[pd.Series, pd.DataFrame]
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """Leverage for every date of ``returns`` and reset the streaming state.
+
+        Parameters
+        ----------
+        returns : Union[pd.Series, pd.DataFrame]
+            Daily returns, one column per portfolio.
+
+        Returns
+        -------
+        Union[pd.Series, pd.DataFrame]
+            Leverage with the shape of ``returns``; ``NaN`` until
+            ``min_periods`` observations are available.
+        """
+        frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+        n_cols = frame.shape[1]
+        values = frame.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        # Move each column's observations to the top so that row ``i`` holds
+        # its ``i + 1``-th return and all portfolios are processed at once.
+        order = np.argsort(~valid, axis=0, kind="stable")
+        packed = np.take_along_axis(values, order, axis=0)
+        count = valid.sum(axis=0)
+        rows = np.arange(1, len(frame) + 1)[:, None]
+        cols = np.arange(n_cols)
+
+        def last(a: np.ndarray, fill: float) -> np.ndarray:
+            if len(a) == 0:
+                return np.full(n_cols, fill)
+            return np.where(count > 0, a[np.maximum(count - 1, 0), cols], fill)
+
+        if self.method == "garch" and self.garch_params is not None:
+            params = [
+                np.broadcast_to(np.asarray(p, dtype=float), (n_cols,)).copy()
+                for p in self.garch_params
+            ]
+        else:
+            params = [np.zeros(n_cols) for _ in range(3)]
+
+        state = {
+            "columns": frame.columns,
+            "count": count.astype(np.int64),
+            "buffer": np.zeros((self.window, n_cols)),
+            "mean": np.zeros(n_cols),
+            "m2": np.zeros(n_cols),
+            "ewm": np.zeros(n_cols),
+            "weight": np.zeros(n_cols),
+        }
+
+        if self.method == "rolling":
+            rolling = pd.DataFrame(packed).rolling(self.window, min_periods=1)
+            variance = rolling.std(ddof=0).to_numpy() ** 2
+            k = np.minimum(count, self.window)
+            i, j = np.nonzero(np.arange(self.window)[:, None] < k)
+            pos = (count - k)[j] + i
+            state["buffer"][pos % self.window, j] = packed[pos, j]
+            tail = np.zeros((self.window, n_cols))
+            tail[i, j] = packed[pos, j]
+            mean = tail.sum(axis=0) / np.maximum(k, 1)
+            deviation = np.zeros((self.window, n_cols))
+            deviation[i, j] = tail[i, j] - mean[j]
+            state["mean"] = mean
+            state["m2"] = (deviation**2).sum(axis=0)
+        elif self.method == "ewma":
+            smoothed = ewma_variance(packed, self.lam, v0=0.0)[1:]
+            weight = 1.0 - self.lam**rows
+            variance = smoothed / weight
+            state["ewm"] = last(smoothed, 0.0)
+            state["weight"] = last(np.broadcast_to(weight, packed.shape), 0.0)
+        else:
+            if self.garch_params is None:
+                for j in np.flatnonzero(count):
+                    omega, a, b = fit_garch(packed[: count[j], j])
+                    params[0][j], params[1][j], params[2][j] = omega[0], a[0], b[0]
+            variance = garch_variance(packed, *params)[1:]
+        state["variance"] = last(variance, np.nan)
+
+        in_sample = (rows <= count) & (rows >= self.min_periods)
+        lev = self._leverage(np.where(in_sample, variance, np.nan))
+        alpha = self._alpha()
+        if alpha is not None:
+            lev = pd.DataFrame(lev).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        lev = np.where(rows <= count, lev, np.nan)
+        state["leverage"] = last(lev, np.nan)
+        out = np.full(frame.shape, np.nan)
+        np.put_along_axis(out, order, lev, axis=0)
+
+        state["garch"] = params
+        self._state = state
+        result = pd.DataFrame(out, index=frame.index, columns=frame.columns).ffill()
+        if isinstance(returns, pd.Series):
+            return result.iloc[:, 0].rename(returns.name)
+        return result
+
+    def update(
+        self, returns: Union[float, pd.Series, np.ndarray]
+    ) -> Union[float, pd.Series]:
+        """Advance every portfolio by one day of returns.
+
+        Parameters
+        ----------
+        returns : Union[float, pd.Series, np.ndarray]
+            The latest return per portfolio.  ``NaN`` leaves a portfolio
+            unchanged.
+
+        Returns
+        -------
+        Union[float, pd.Series]
+            Current leverage per portfolio.
+        """
+        if self._state is None:
+            raise ValueError("fit must be called before update")
+        state = self._state
+        columns = state["columns"]
+        if isinstance(returns, pd.Series):
+            r = returns.reindex(columns).to_numpy(dtype=float)
+        else:
+            r = np.broadcast_to(np.asarray(returns, dtype=float), (len(columns),))
+        valid = ~np.isnan(r)
+        x = r[valid]
+        count = state["count"]
+        count[valid] += 1
+        n = count[valid]
+
+        if self.method == "rolling":
+            slot = (n - 1) % self.window
+            cols = np.flatnonzero(valid)
+            full = n > self.window
+            old = state["buffer"][slot, cols]
+            state["buffer"][slot, cols] = x
+            k = np.minimum(n, self.window)
+            # Welford update of the window mean and sum of squared deviations,
+            # replacing the oldest return once the window is full.
+            mean = state["mean"][valid]
+            change = np.where(full, x - old, x - mean)
+            new_mean = mean + change / k
+            spread = np.where(full, x - new_mean + old - mean, x - new_mean)
+            m2 = np.maximum(state["m2"][valid] + change * spread, 0.0)
+            state["mean"][valid] = new_mean
+            state["m2"][valid] = m2
+            variance = m2 / k
+        elif self.method == "ewma":
+            lam = self.lam
+            state["ewm"][valid] = lam * state["ewm"][valid] + (1 - lam) * x**2
+            state["weight"][valid] = lam * state["weight"][valid] + (1 - lam)
+            variance = state["ewm"][valid] / state["weight"][valid]
+        else:
+            omega, a, b = (p[valid] for p in state["garch"])
+            prev = state["variance"][valid]
+            unconditional = omega / np.maximum(1 - a - b, 1e-12)
+            prev = np.where(np.isnan(prev), unconditional, prev)
+            variance = omega + a * x**2 + b * prev
+        state["variance"][valid] = variance
+
+        variance = np.where(n >= self.min_periods, variance, np.nan)
+        lev = self._leverage(variance)
+        alpha = self._alpha()
+        prev_lev = state["leverage"][valid]
+        if alpha is not None:
+            blended = prev_lev + alpha * (lev - prev_lev)
+            lev = np.where(np.isnan(prev_lev), lev, blended)
+        state["leverage"][valid] = np.where(np.isnan(lev), prev_lev, lev)
+
+        if np.ndim(returns) == 0:
+            return float(state["leverage"][0])
+        return pd.Series(state["leverage"].copy(), index=columns)
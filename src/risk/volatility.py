@@ -0,0 +1,164 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import minimize
+    from scipy.signal import lfilter
+except Exception:  # pragma: no cover - optional dependency
+    minimize = None
+    lfilter = None
+
+
+def _as_2d(returns: np.ndarray) -> np.ndarray:
+    values = np.asarray(returns, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _recursion(
+    squared: np.ndarray,
+    decay: np.ndarray,
+    gain: np.ndarray,
+    const: np.ndarray,
+    v0: np.ndarray,
+) -> np.ndarray:
+    """Evaluate ``v_{t+1} = const + gain * x_t + decay * v_t`` for every column.
+
+    Returns ``T + 1`` rows: ``v_0`` followed by the one-step forecasts.
+    """
+    n_obs, n_cols = squared.shape
+    out = np.empty((n_obs + 1, n_cols))
+    out[0] = v0
+    if n_obs == 0:
+        return out
+    if lfilter is not None and np.all(decay == decay[0]) and np.all(gain == gain[0]):
+        zi = (decay[0] * v0)[None, :]
+        x = gain[0] * squared + const
+        out[1:] = lfilter([1.0], [1.0, -decay[0]], x, axis=0, zi=zi)[0]
+        return out
+    v = v0.copy()
+    for t in range(n_obs):
+        v = const + gain * squared[t] + decay * v
+        out[t + 1] = v
+    return out
+
+
+def ewma_variance(
+    returns: np.ndarray, lam: float = 0.94, v0: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """RiskMetrics EWMA conditional variance.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        Return history of shape ``(T,)`` or ``(T, n)``.  ``NaN`` is treated
+        as a zero return.
+    lam : float, optional
+        Decay factor.  Default is ``0.94``.
+    v0 : np.ndarray, optional
+        Initial variance per column.  Defaults to the sample variance.
+
+    Returns
+    -------
+    np.ndarray
+        Array with ``T + 1`` rows.  Row ``t`` is the variance forecast for
+        day ``t`` made with returns up to ``t - 1``; the last row is the
+        forecast for the day after the sample.
+    """
+    r = np.nan_to_num(_as_2d(returns))
+    n_cols = r.shape[1]
+    if v0 is None:
+        v0 = r.var(axis=0) if len(r) else np.zeros(n_cols)
+    v0 = np.broadcast_to(np.asarray(v0, dtype=float), (n_cols,))
+    return _recursion(
+        r**2,
+        np.full(n_cols, lam),
+        np.full(n_cols, 1.0 - lam),
+        np.zeros(n_cols),
+        v0,
+    )
+
+
+def garch_variance(
+    returns: np.ndarray,
+    omega: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    v0: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """GARCH(1,1) conditional variance for given parameters.
+
+    Uses ``v_{t+1} = omega + alpha * r_t ** 2 + beta * v_t`` seeded with
+    ``v0``, by default the unconditional variance; output rows are aligned
+    as in :func:`ewma_variance`.
+    """
+    r = np.nan_to_num(_as_2d(returns))
+    n_cols = r.shape[1]
+    omega = np.broadcast_to(np.asarray(omega, dtype=float), (n_cols,))
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_cols,))
+    beta = np.broadcast_to(np.asarray(beta, dtype=float), (n_cols,))
+    persistence = alpha + beta
+    if v0 is None:
+        unconditional = omega / np.maximum(1 - persistence, 1e-12)
+        v0 = np.where(persistence < 1, unconditional, r.var(axis=0))
+    v0 = np.broadcast_to(np.asarray(v0, dtype=float), (n_cols,))
+    return _recursion(r**2, beta, alpha, omega, v0)
+
+
+def fit_garch(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fit GARCH(1,1) parameters per column by Gaussian quasi-maximum likelihood.
+
+    ``omega`` is set by variance targeting so that the unconditional
+    variance equals the sample variance; only ``alpha`` and ``beta`` are
+    optimised.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        Return history of shape ``(T,)`` or ``(T, n)``.
+
+    Returns
+    -------
+    tuple
+        ``(omega, alpha, beta)`` arrays with one entry per column.
+    """
+    if minimize is None:
+        raise ImportError("scipy is required to fit GARCH models")
+
+    r = np.nan_to_num(_as_2d(returns))
+    n_cols = r.shape[1]
+    omega = np.empty(n_cols)
+    alpha = np.empty(n_cols)
+    beta = np.empty(n_cols)
+    for j in range(n_cols):
+        x = r[:, j]
+        sample = float(x.var())
+        if sample <= 0 or len(x) < 3:
+            omega[j], alpha[j], beta[j] = sample, 0.0, 0.0
+            continue
+        squared = (x**2)[:, None]
+
+        def nll(params: np.ndarray) -> float:
+            a, b = params
+            if a < 0 or b < 0 or a + b >= 0.9999:
+                return 1e10
+            v = _recursion(
+                squared,
+                np.array([b]),
+                np.array([a]),
+                np.array([sample * (1 - a - b)]),
+                np.array([sample]),
+            )[:-1, 0]
+            v = np.maximum(v, 1e-300)
+            return float(0.5 * np.sum(np.log(v) + squared[:, 0] / v))
+
+        res = minimize(
+            nll,
+            x0=[0.05, 0.9],
+            method="Nelder-Mead",
+            options={"xatol": 1e-6, "fatol": 1e-8},
+        )
+        a, b = res.x if res.fun < 1e10 else (0.0, 0.0)
+        alpha[j], beta[j] = a, b
+        omega[j] = sample * (1 - a - b)
+    return omega, alpha, beta
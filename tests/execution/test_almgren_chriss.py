@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from execution import AlmgrenChriss
+
+
+def test_zero_risk_aversion_is_twap():
+    model = AlmgrenChriss(volatility=0.5, temporary_impact=0.1, slices=4)
+    plan = model.plan(pd.Series({"ES": 100.0, "CL": -20.0}))
+    assert np.allclose(plan.trades.loc["ES"], 25.0)
+    assert np.allclose(plan.trades.loc["CL"], -5.0)
+    assert plan.expected_cost["ES"] == pytest.approx(0.1 / 0.25 * 4 * 25.0**2)
+    holdings = np.array([75.0, 50.0, 25.0, 0.0])
+    assert plan.variance["ES"] == pytest.approx(0.25 * 0.25 * (holdings**2).sum())
+
+
+def test_risk_aversion_front_loads_and_trades_off_cost():
+    quantities = pd.Series({"a": 1000.0, "b": 1000.0})
+    model = AlmgrenChriss(
+        volatility=0.3,
+        temporary_impact=0.05,
+        permanent_impact=0.01,
+        risk_aversion=pd.Series({"a": 0.0, "b": 1e-2}),
+        spread=0.02,
+        slices=10,
+    )
+    plan = model.plan(quantities)
+    assert np.allclose(plan.trades.sum(axis=1), quantities)
+    assert (np.diff(plan.trades.loc["b"]) < 0).all()
+    assert plan.expected_cost["b"] > plan.expected_cost["a"]
+    assert plan.variance["b"] < plan.variance["a"]
+    assert len(plan.schedule) == 20
+
+    extreme = AlmgrenChriss(0.3, 0.05, risk_aversion=1e9, slices=10)
+    fast = extreme.plan(quantities)
+    assert np.isfinite(fast.trades.to_numpy()).all()
+    assert fast.trades.iloc[0, 0] == pytest.approx(1000.0)
+
+
+def test_replan_after_fills():
+    model = AlmgrenChriss(0.3, 0.05, risk_aversion=1e-3, slices=8)
+    plan = model.plan(pd.Series({"a": 500.0}))
+    done = plan.trades.iloc[:, :3].sum(axis=1)
+    tail = model.replan(plan, done, step=3)
+    assert np.allclose(tail.trades, plan.trades.iloc[:, 3:])
+    assert list(tail.trades.columns) == [3, 4, 5, 6, 7]
+
+    partial = model.replan(plan, done * 0.5, step=3)
+    assert partial.trades.sum(axis=1)["a"] == pytest.approx(500.0 - done["a"] * 0.5)
+    with pytest.raises(ValueError):
+        model.replan(plan, done, step=8)
@@ -1,9 +1,12 @@
 import os
 import sys
+
+import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from execution import process_ap_flows
+from execution import IntradayAPBook, process_ap_flows, process_ap_orders
 
 
 def test_process_ap_flows():
@@ -11,3 +14,84 @@ def test_process_ap_flows():
     flows = process_ap_flows(3, 1, basket)
     expected = basket * 2
     pd.testing.assert_series_equal(flows, expected)
+
+
+def test_process_ap_orders_matches_single_day():
+    dates = pd.date_range("2024-03-27", periods=3)
+    creations = pd.DataFrame({"ap1": [3, 0, 10], "ap2": [0, 2, 5]}, index=dates)
+    redemptions = pd.DataFrame({"ap1": [1, 0, 0], "ap2": [0, 4, 0]}, index=dates)
+    basket = pd.Series({"ES": 1.5, "TBILL": 2.25})
+    values = pd.Series({"ES": 100.0, "TBILL": 10.0})
+    result = process_ap_orders(
+        creations,
+        basket,
+        values,
+        redemptions=redemptions,
+        cash_assets=["ES"],
+        creation_fee=500.0,
+        redemption_fee=700.0,
+        variable_fee=0.001,
+    )
+    for date in dates:
+        expected = process_ap_flows(
+            creations.loc[date].sum(), redemptions.loc[date].sum(), basket
+        )
+        assert np.allclose(result.flows.loc[date], expected)
+    # ap1 creates 2 units net on day one: 3 ES in cash, 4.5 TBILL of which 0.5 cash
+    assert result.in_kind.loc[dates[0], "TBILL"] == 4.0
+    assert result.trades.loc[dates[0]].tolist() == [3.0, 0.5]
+    assert result.cash_in_lieu.loc[dates[0], "ap1"] == pytest.approx(305.0)
+    assert result.fees.loc[dates[0], "ap1"] == pytest.approx(1200.0 + 0.305)
+    assert result.fees.loc[dates[0], "ap2"] == 0.0
+    assert result.cash_in_lieu.loc[dates[1], "ap2"] < 0
+
+
+def test_intraday_book_matches_batch():
+    basket = pd.Series({"ES": 1.5, "TBILL": 2.25})
+    values = pd.Series({"ES": 100.0, "TBILL": 10.0})
+    book = IntradayAPBook(basket, values, cash_assets=["ES"], creation_fee=500.0)
+    orders = pd.DataFrame(
+        {
+            "ap": ["ap1", "ap2", "ap1", "ap3"],
+            "creations": [1, 2, 2, 0],
+            "redemptions": [0, 0, 1, 3],
+        }
+    )
+    book.add_many(orders.iloc[:2])
+    assert book.flows.tolist() == [4.5, 6.75]
+    book.add_many(orders.iloc[2:])
+
+    totals = orders.groupby("ap").sum()
+    batch = process_ap_orders(
+        totals[["creations"]].T.reset_index(drop=True),
+        basket,
+        values,
+        redemptions=totals[["redemptions"]].T.reset_index(drop=True),
+        cash_assets=["ES"],
+        creation_fee=500.0,
+    )
+    assert np.allclose(book.flows, batch.flows.iloc[0])
+    assert np.allclose(book.in_kind, batch.in_kind.iloc[0])
+    assert np.allclose(book.trades, batch.trades.iloc[0])
+    assert np.allclose(book.cash_in_lieu[totals.index], batch.cash_in_lieu.iloc[0])
+    assert np.allclose(book.fees[totals.index], batch.fees.iloc[0])
+
+
+def test_redemption_fees_charge_absolute_cash():
+    basket = pd.Series({"ES": 1.5})
+    values = pd.Series({"ES": 100.0})
+    redemptions = pd.DataFrame({"ap1": [10]})
+    result = process_ap_orders(
+        pd.DataFrame({"ap1": [0]}),
+        basket,
+        values,
+        redemptions=redemptions,
+        redemption_fee=700.0,
+        variable_fee=0.01,
+    )
+    assert result.cash_in_lieu.iloc[0, 0] == pytest.approx(-1500.0)
+    assert result.fees.iloc[0, 0] == pytest.approx(715.0)
+
+    book = IntradayAPBook(basket, values, redemption_fee=700.0, variable_fee=0.01)
+    book.add("ap1", redemptions=10)
+    assert book.fees["ap1"] == pytest.approx(715.0)
@@ -0,0 +1,106 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from backtest.event_driven import EventDrivenBacktester
+from execution import (
+    SlippageParams,
+    calibrate_slippage,
+    estimate_slippage,
+    implementation_shortfall,
+    load_fills,
+    slippage_function,
+)
+
+
+def _fills(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    asset_class = np.where(rng.random(n) < 0.5, "equity", "rates")
+    alpha = np.where(asset_class == "equity", 0.3, 0.8)
+    exponent = np.where(asset_class == "equity", 0.5, 0.75)
+    volume = rng.uniform(1_000, 10_000, n)
+    quantity = rng.uniform(10, 2_000, n) * rng.choice([-1, 1], n)
+    spread = rng.uniform(1, 5, n)
+    vol = rng.uniform(50, 200, n)
+    cost = spread / 2 + alpha * vol * (np.abs(quantity) / volume) ** exponent
+    cost = cost + rng.normal(0, 1, n)
+    cost[:40] += 500.0  # bad prints
+    arrival = rng.uniform(50, 150, n)
+    price = arrival * (1 + np.sign(quantity) * cost / 10_000)
+    return pd.DataFrame(
+        {
+            "asset": np.where(asset_class == "equity", "ES", "ZN"),
+            "asset_class": asset_class,
+            "quantity": quantity,
+            "price": price,
+            "arrival_price": arrival,
+            "spread": spread,
+            "volatility": vol,
+            "volume": volume,
+        }
+    )
+
+
+def test_implementation_shortfall_combines_order_fills():
+    fills = pd.DataFrame(
+        {
+            "order_id": [1, 1, 2],
+            "asset": ["ES", "ES", "ZN"],
+            "asset_class": ["equity", "equity", "rates"],
+            "quantity": [10.0, 30.0, -5.0],
+            "price": [100.1, 100.2, 99.0],
+            "arrival_price": [100.0, 100.0, 100.0],
+            "spread": [1.0, 1.0, 2.0],
+            "volatility": [100.0, 100.0, 50.0],
+            "volume": [400.0, 400.0, 100.0],
+        }
+    )
+    orders = implementation_shortfall(fills)
+    assert orders.loc[1, "quantity"] == 40.0
+    assert orders.loc[1, "shortfall"] == pytest.approx(17.5)
+    assert orders.loc[1, "participation"] == pytest.approx(0.1)
+    assert orders.loc[2, "shortfall"] == pytest.approx(100.0)
+
+
+def test_calibrate_slippage_recovers_parameters(tmp_path, monkeypatch):
+    fills = _fills()
+    path = tmp_path / "fills.csv"
+    fills.to_csv(path, index=False)
+    loaded = load_fills(path, columns=fills.columns)
+    params = calibrate_slippage(loaded, save=True, path=tmp_path / "params.json")
+    assert params.exponent["equity"] == pytest.approx(0.5, abs=0.03)
+    assert params.exponent["rates"] == pytest.approx(0.75, abs=0.03)
+    assert params.alpha["equity"] == pytest.approx(0.3, rel=0.1)
+    assert params.alpha["rates"] == pytest.approx(0.8, rel=0.1)
+
+    monkeypatch.setenv("ETF_SLIPPAGE_PARAMS", str(tmp_path / "params.json"))
+    index = pd.Index(["ES", "ZN", "CL"])
+    classes = pd.Series({"ES": "equity", "ZN": "rates"})
+    vol = pd.Series(100.0, index=index)
+    part = pd.Series(0.04, index=index)
+    spread = pd.Series(0.0, index=index)
+    cost = estimate_slippage(spread, vol, part, asset_class=classes)
+    assert cost["ES"] == pytest.approx(params.alpha["equity"] * 100 * 0.04 ** 0.5)
+    assert cost["CL"] == pytest.approx(0.1 * 100 * 0.2)
+    assert estimate_slippage(vol * 0, vol, part, alpha=0.1)["ZN"] == pytest.approx(2.0)
+
+
+def test_backtester_uses_slippage_function():
+    dates = pd.date_range("2024-01-01", periods=2)
+    prices = pd.DataFrame({"ES": [100.0, 100.0]}, index=dates)
+    params = SlippageParams(alpha={"equity": 0.5}, exponent={"equity": 1.0})
+    cost = slippage_function(
+        pd.Series({"ES": 2.0}),
+        pd.Series({"ES": 100.0}),
+        pd.Series({"ES": 1000.0}),
+        asset_class=pd.Series({"ES": "equity"}),
+        params=params,
+    )
+    assert cost("ES", -100) == pytest.approx(1.0 + 0.5 * 100 * 0.1)
+    bt = EventDrivenBacktester(prices, pd.Series({"ES": 1.0}), cost_model=cost)
+    bt.run({dates[0]: [("ES", 100.0)]})
+    assert bt.trades[0]["price"] == pytest.approx(100.0 * (1 + 6.0 / 10_000))
@@ -1,9 +1,10 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from execution import generate_cost_aware_schedule
+from execution import batch_cost_aware_schedule, generate_cost_aware_schedule
 
 
 def test_generate_cost_aware_schedule_bias_to_low_cost():
@@ -13,3 +14,30 @@ def test_generate_cost_aware_schedule_bias_to_low_cost():
     assert sched["quantity"].sum() == 100
     # middle slice has lowest cost, should receive the largest allocation
     assert sched.loc[sched["quantity"].idxmax(), "time"] == times[1]
+
+
+def test_batch_schedule_matches_per_asset_schedules():
+    times = pd.date_range("2021-01-01 09:30", periods=4, freq="H")
+    costs = pd.Series([5.0, 1.0, 0.0, 2.0], index=times)
+    quantities = pd.Series({"ES": 10.0, "NQ": 0.0, "CL": -4.0})
+    sched = batch_cost_aware_schedule(quantities, costs)
+    assert sched["asset"].tolist() == ["ES"] * 4 + ["CL"] * 4
+    for asset in ["ES", "CL"]:
+        single = generate_cost_aware_schedule(quantities[asset], costs)
+        rows = sched[sched["asset"] == asset]
+        assert rows["time"].tolist() == single["time"].tolist()
+        assert np.allclose(rows["quantity"], single["quantity"])
+
+
+def test_batch_schedule_per_asset_curves_matrix():
+    curves = pd.DataFrame(
+        [[1.0, 1.0], [1.0, 3.0], [0.0, 0.0]], index=["a", "b", "c"], columns=[0, 1]
+    )
+    quantities = pd.Series({"b": 8.0, "a": 2.0, "c": 6.0})
+    matrix = batch_cost_aware_schedule(quantities, curves, output="matrix")
+    assert matrix.index.tolist() == ["b", "a", "c"]
+    assert np.allclose(matrix.to_numpy(), [[6.0, 2.0], [1.0, 1.0], [3.0, 3.0]])
+    array = batch_cost_aware_schedule(
+        quantities, curves.loc[quantities.index].to_numpy(), output="matrix"
+    )
+    assert np.allclose(array.to_numpy(), matrix.to_numpy())
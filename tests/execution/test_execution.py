@@ -1,6 +1,8 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 from execution import weights_to_contracts, generate_twap_schedule
@@ -29,3 +31,41 @@ def test_generate_twap_schedule():
     diff = sched["time"].diff().dropna()
     expected = (end - start) / (len(sched) - 1)
     assert all(diff == expected)
+
+
+def test_weights_to_contracts_tracking_error_mode():
+    rng = np.random.default_rng(1)
+    assets = [f"a{i}" for i in range(8)]
+    dates = pd.date_range("2020-01-01", periods=5)
+    loadings = rng.normal(size=(8, 2))
+    cov = pd.DataFrame(
+        (loadings @ loadings.T + np.eye(8)) * 1e-4, index=assets, columns=assets
+    )
+    weights = pd.DataFrame(rng.normal(0, 0.2, (5, 8)), index=dates, columns=assets)
+    prices = pd.DataFrame(rng.uniform(50, 150, (5, 8)), index=dates, columns=assets)
+    multipliers = pd.Series(1000.0, index=assets)
+    fx = pd.Series(1.0, index=assets)
+    capital = 1_000_000
+    naive = weights_to_contracts(weights, prices, multipliers, fx, capital)
+    optimal = weights_to_contracts(
+        weights, prices, multipliers, fx, capital, covariance=cov
+    )
+    assert optimal.dtypes.eq(int).all()
+
+    def tracking_error(contracts):
+        held = contracts * prices * multipliers / capital
+        diff = (held - weights).to_numpy()
+        return np.einsum("ti,ij,tj->t", diff, cov.to_numpy(), diff)
+
+    assert (tracking_error(optimal) <= tracking_error(naive) + 1e-15).all()
+    assert tracking_error(optimal).sum() < tracking_error(naive).sum()
+
+    capped = weights_to_contracts(
+        weights, prices, multipliers, fx, capital, covariance=cov, max_iter=1
+    )
+    assert ((capped - naive).abs().sum(axis=1) <= 1).all()
+    with pytest.warns(RuntimeWarning):
+        timed_out = weights_to_contracts(
+            weights, prices, multipliers, fx, capital, covariance=cov, time_budget=0
+        )
+    pd.testing.assert_frame_equal(timed_out, naive)
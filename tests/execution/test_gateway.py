@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import execution.gateway as gateway_module
+from execution import LocalExchange, Order, OrderGateway, Transport
+
+
+def test_local_exchange_walks_book_and_partially_fills():
+    exchange = LocalExchange(mid={"ES": 100.0}, tick=0.5, levels=3, depth=10)
+    gateway = OrderGateway(exchange)
+    report = asyncio.run(gateway.submit(Order("ES", 25.0)))
+    assert report.status == "filled"
+    assert [f.price for f in report.fills] == [100.5, 101.0, 101.5]
+    assert report.avg_price == pytest.approx((10 * 100.5 + 10 * 101.0 + 5 * 101.5) / 25)
+
+    partial = asyncio.run(gateway.submit(Order("ES", -25.0, limit=99.0)))
+    assert partial.status == "partial"
+    assert partial.filled == pytest.approx(-20.0)
+    missed = asyncio.run(gateway.submit(Order("ES", 5.0, limit=100.0)))
+    assert missed.status == "cancelled"
+
+    depleting = LocalExchange(levels=1, depth=10, resilience=0.0)
+    gateway = OrderGateway(depleting)
+    first, second = asyncio.run(
+        gateway.submit_schedule(pd.DataFrame({"asset": ["A", "A"], "quantity": [6, 6]}))
+    )
+    assert first.filled + second.filled == pytest.approx(10.0)
+
+
+def test_local_exchange_depth_recovers_over_time():
+    now = [0.0]
+    exchange = LocalExchange(levels=1, depth=10, resilience=0.5, clock=lambda: now[0])
+    assert sum(f.quantity for f in exchange.match(Order("A", 10.0))) == 10.0
+    assert exchange.match(Order("A", 10.0)) == []
+    now[0] = 1.0
+    assert exchange.match(Order("A", 10.0))[0].quantity == pytest.approx(5.0)
+    now[0] = 3.0
+    assert exchange.match(Order("A", 10.0))[0].quantity == pytest.approx(7.5)
+    now[0] = 100.0
+    assert exchange.match(Order("A", 10.0))[0].quantity == pytest.approx(10.0)
+    with pytest.raises(ValueError):
+        LocalExchange(resilience=-1.0)
+
+
+def test_gateway_schedule_statistics_and_throttle():
+    schedule = pd.DataFrame(
+        {"asset": np.tile(["ES", "NQ"], 1000), "quantity": np.tile([5.0, -5.0], 1000)}
+    )
+    gateway = OrderGateway()
+    reports = gateway.execute(schedule)
+    assert len(reports) == 2000
+    stats = gateway.statistics()
+    assert stats["orders"] == 2000
+    assert stats["fill_rate"] == pytest.approx(1.0)
+    assert stats["throughput"] > 0
+    assert len(gateway.fills()) == 2000
+
+
+def test_gateway_throttle_spaces_orders(monkeypatch):
+    # Virtual clock: sleeping moves time forward instead of waiting.
+    now = [0.0]
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        target = now[0] + delay
+        await real_sleep(0)
+        now[0] = max(now[0], target)
+
+    clock = SimpleNamespace(perf_counter=lambda: now[0])
+    monkeypatch.setattr(gateway_module, "time", clock)
+    monkeypatch.setattr(gateway_module.asyncio, "sleep", sleep)
+    schedule = pd.DataFrame({"asset": ["ES"] * 20, "quantity": [1.0] * 20})
+    throttled = OrderGateway(max_rate=200.0)
+    reports = throttled.execute(schedule)
+    sent = np.sort([r.sent for r in reports])
+    np.testing.assert_allclose(np.diff(sent), 1 / 200)
+    assert throttled.statistics()["throughput"] == pytest.approx(20 / (19 / 200))
+
+
+def test_gateway_custom_transport():
+    class Rejecting(Transport):
+        async def send(self, order):
+            return []
+
+    gateway = OrderGateway(Rejecting())
+    report = asyncio.run(gateway.submit(Order("ES", 1.0)))
+    assert report.status == "cancelled"
+    assert gateway.statistics()["cancelled"] == 1
+    with pytest.raises(TypeError):
+        Transport()
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from execution import net_orders, process_ap_flows, roll_weights
+
+
+def test_net_orders_attribution_and_rounding():
+    rebalance = pd.Series({"ESH4": 10.4, "NQH4": -3.0})
+    roll = pd.Series({"ESH4": -6.0, "ESM4": 6.0})
+    baskets = pd.DataFrame(
+        [[0.3, 0.5, 0.0], [0.3, 0.5, 0.0]], columns=["ESH4", "NQH4", "CLJ4"]
+    )
+    result = net_orders({"rebalance": rebalance, "roll": roll, "ap": baskets})
+
+    assert result.orders.to_dict() == {
+        "ESH4": 5,
+        "NQH4": -2,
+        "ESM4": 6,
+        "CLJ4": 0,
+    }
+    assert np.allclose(result.attribution.sum(axis=1), result.orders)
+    es = result.attribution.loc["ESH4"]
+    assert es["roll"] == 0.0
+    assert es["rebalance"] == pytest.approx(5 * 10.4 / 11.0)
+    assert result.crossed.loc["ESH4", "roll"] == pytest.approx(-6.0)
+    assert result.crossed.loc["NQH4", "ap"] == pytest.approx(1.0)
+    assert result.summary.loc["ESH4", "gross"] == pytest.approx(17.0)
+    assert result.summary.loc["ESH4", "rounding"] == pytest.approx(0.0)
+    assert result.summary.loc["NQH4", "crossed"] == pytest.approx(2.0)
+
+
+def test_net_orders_with_existing_sources():
+    positions = pd.Series({"ES": 10.0, "NQ": -4.0})
+    roll = positions * roll_weights(pd.Series({"ES": 2, "NQ": 20}), window=4)
+    ap = process_ap_flows(1, 3, pd.Series({"ES": 2.5, "NQ": -1.0}))
+    result = net_orders({"roll": -roll, "ap": ap}, round_lots=False)
+    assert np.allclose(result.orders, [-10.0, 2.0])
+    assert result.orders.dtype == float
@@ -0,0 +1,112 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from execution import ProfileCache, intraday_profile, plan_orders, vwap_schedule
+
+
+def _bars(sessions, volumes, spreads=(1.0, 2.0, 1.0)):
+    rows = []
+    for session, volume in zip(sessions, volumes):
+        for minute, (v, s) in enumerate(zip(volume, spreads)):
+            stamp = pd.Timestamp(session) + pd.Timedelta(hours=9, minutes=30 + minute)
+            rows.append({"timestamp": stamp, "asset": "ES", "volume": v, "spread": s})
+    return pd.DataFrame(rows)
+
+
+def test_intraday_profile_robust_to_outlier_day():
+    sessions = pd.bdate_range("2024-01-01", periods=5)
+    volumes = [[50, 20, 30]] * 4 + [[0, 1000, 0]]
+    profile = intraday_profile(_bars(sessions, volumes), days=5)
+    assert np.allclose(profile.volume.loc["ES"], [0.5, 0.2, 0.3])
+    assert profile.daily_volume["ES"] == pytest.approx(100.0)
+    assert profile.spread.loc["ES"].tolist() == [1.0, 2.0, 1.0]
+    assert profile.volume.columns[0] == pd.Timedelta(hours=9, minutes=30)
+
+    trimmed = intraday_profile(
+        _bars(sessions, volumes), days=5, statistic="trimmed", trim=0.2
+    )
+    assert np.allclose(trimmed.volume.loc["ES"], [0.5, 0.2, 0.3])
+    recent = intraday_profile(_bars(sessions, volumes), days=1)
+    assert np.allclose(recent.volume.loc["ES"], [0.0, 1.0, 0.0])
+
+
+def test_profile_cache_by_weekday():
+    sessions = pd.bdate_range("2024-01-01", periods=10)
+    volumes = [[10, 0, 0] if s.weekday() == 0 else [0, 0, 10] for s in sessions]
+    bars = _bars(sessions, volumes)
+    cache = ProfileCache(days=5)
+    monday = cache.get(bars, "2024-01-15")
+    assert np.allclose(monday.volume.loc["ES"], [1.0, 0.0, 0.0])
+    assert np.allclose(cache.get(bars, "2024-01-16").volume.loc["ES"], [0, 0, 1])
+    cache.get(bars, "2024-01-15")
+    assert cache.hits == 1
+
+    rolling = ProfileCache(days=5, roll_dates=["2024-01-08", "2024-01-15"])
+    assert np.allclose(rolling.get(bars, "2024-01-15").volume.loc["ES"], [1, 0, 0])
+
+
+def test_vwap_and_pov_schedules():
+    sessions = pd.bdate_range("2024-01-01", periods=3)
+    profile = intraday_profile(_bars(sessions, [[50, 20, 30]] * 3))
+    quantities = pd.Series({"ES": -40.0, "NQ": 9.0})
+    schedule, unfilled = vwap_schedule(quantities, profile, date="2024-01-04")
+    es = schedule[schedule["asset"] == "ES"]
+    assert np.allclose(es["quantity"], [-20.0, -8.0, -12.0])
+    assert es["time"].iloc[0] == pd.Timestamp("2024-01-04 09:30")
+    assert np.allclose(schedule[schedule["asset"] == "NQ"]["quantity"], 3.0)
+    assert np.allclose(unfilled, 0.0)
+
+    capped, unfilled = vwap_schedule(
+        quantities, profile, max_participation=0.2, output="matrix"
+    )
+    assert np.allclose(capped.loc["ES"], [-10.0, -4.0, -6.0])
+    assert unfilled["ES"] == pytest.approx(-20.0)
+    pov, unfilled = vwap_schedule(
+        pd.Series({"ES": 14.0}), profile, 0.2, method="pov", output="matrix"
+    )
+    assert np.allclose(pov.loc["ES"], [10.0, 4.0, 0.0])
+    assert unfilled["ES"] == 0.0
+
+
+def test_plan_orders_accepts_profile():
+    sessions = pd.bdate_range("2024-01-01", periods=3)
+    profile = intraday_profile(_bars(sessions, [[50, 20, 30]] * 3))
+    market_data = {
+        "prices": pd.Series({"ES": 100.0}),
+        "multipliers": pd.Series({"ES": 10.0}),
+        "fx_rates": pd.Series({"ES": 1.0}),
+        "capital": 100_000.0,
+        "spread": pd.Series({"ES": 1.0}),
+        "volatility": pd.Series({"ES": 0.02}),
+        "volume": pd.Series({"ES": 1000}),
+        "costs": profile,
+        "days_to_expiry": pd.Series({"ES": 10}),
+    }
+    schedule, _ = plan_orders(pd.Series({"ES": 0.1}), pd.Series({"ES": 0}), market_data)
+    weights = np.array([0.5, 0.1, 0.3]) / 0.9
+    assert np.allclose(schedule["quantity"], 10 * weights)
+
+
+def test_profile_without_spreads_follows_volume():
+    sessions = pd.bdate_range("2024-01-01", periods=3)
+    bars = _bars(sessions, [[80, 10, 10]] * 3).drop(columns="spread")
+    profile = intraday_profile(bars)
+    assert np.allclose(profile.cost_curves().loc["ES"], [1.25, 10.0, 10.0])
+    market_data = {
+        "prices": pd.Series({"ES": 100.0}),
+        "multipliers": pd.Series({"ES": 10.0}),
+        "fx_rates": pd.Series({"ES": 1.0}),
+        "capital": 100_000.0,
+        "spread": pd.Series({"ES": 1.0}),
+        "volatility": pd.Series({"ES": 0.02}),
+        "volume": pd.Series({"ES": 1000}),
+        "costs": profile,
+        "days_to_expiry": pd.Series({"ES": 10}),
+    }
+    schedule, _ = plan_orders(pd.Series({"ES": 0.1}), pd.Series({"ES": 0}), market_data)
+    assert np.allclose(schedule["quantity"], [8.0, 1.0, 1.0])
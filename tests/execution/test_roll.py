@@ -1,11 +1,12 @@
 import os
 import sys
 
+import numpy as np
 import pandas as pd
 import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from execution import roll_weights
+from execution import plan_rolls, roll_weights
 
 
 def test_roll_weights():
@@ -14,3 +15,47 @@ def test_roll_weights():
     assert frac["A"] == pytest.approx(0.0)
     assert frac["B"] == pytest.approx(0.5)
     assert frac["C"] == pytest.approx(1.0)
+
+
+def test_plan_rolls_follows_roll_weights():
+    positions = pd.Series({"A": 10.0, "B": -6.0, "C": 5.0})
+    dte = pd.Series({"A": 4, "B": 2, "C": 30})
+    plan = plan_rolls(positions, dte, window=5, start="2024-01-01")
+    assert len(plan.spreads.columns) == 5
+    assert plan.spreads.columns[0] == pd.Timestamp("2024-01-01")
+    assert np.allclose(plan.spreads.loc["A"], [2.0, 2.0, 2.0, 2.0, 2.0])
+    assert np.allclose(plan.spreads.loc["B"], [-2.0, -2.0, -2.0, 0.0, 0.0])
+    assert np.allclose(plan.spreads.loc["C"], 0.0)
+    assert np.allclose(plan.unrolled, 0.0)
+
+
+def test_plan_rolls_nets_rebalance_and_caps_liquidity():
+    positions = pd.Series({"A": 10.0, "B": 10.0})
+    dte = pd.Series({"A": 3, "B": 3})
+    rebalance = pd.Series({"A": -4.0, "B": 3.0})
+    plan = plan_rolls(
+        positions,
+        dte,
+        window=4,
+        rebalance=rebalance,
+        spread_volume=pd.Series({"A": 100.0, "B": 20.0}),
+        max_participation=0.1,
+        spread_cost=pd.Series(0.5, index=["A", "B"]),
+        outright_cost=pd.Series(1.0, index=["A", "B"]),
+        outright_volume=pd.Series(1000.0, index=["A", "B"]),
+    )
+    assert plan.front.tolist() == [-4.0, 0.0]
+    assert plan.back.tolist() == [0.0, 3.0]
+    assert plan.spreads.loc["A"].sum() == pytest.approx(6.0)
+    assert np.allclose(plan.spreads.loc["B"], 2.0)
+    assert plan.unrolled["B"] == pytest.approx(2.0)
+    assert (plan.costs["spread"] < plan.costs["legging"]).all()
+
+
+def test_plan_rolls_without_window_rolls_only_expired():
+    positions = pd.Series({"A": 10.0, "B": -6.0, "C": 5.0})
+    dte = pd.Series({"A": 0, "B": 5, "C": np.nan})
+    plan = plan_rolls(positions, dte, window=0)
+    assert plan.spreads.loc["A"].sum() == pytest.approx(10.0)
+    assert np.allclose(plan.spreads.loc[["B", "C"]], 0.0)
+    assert np.allclose(plan.front, 0.0)
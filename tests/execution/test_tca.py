@@ -0,0 +1,104 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from execution import TCA, plan_orders, tca_orders
+
+
+def _day(date, es_price=100.2):
+    times = pd.date_range(f"{date} 09:30", periods=2, freq="60min")
+    schedule = pd.DataFrame(
+        {
+            "asset": ["ES", "ES", "NQ", "NQ"],
+            "time": times.append(times),
+            "quantity": [5, 5, -2, -2],
+        }
+    )
+    fills = pd.DataFrame(
+        {
+            "asset": ["ES", "ES", "NQ"],
+            "time": [times[0], times[1], times[0]],
+            "quantity": [5.0, 5.0, -3.0],
+            "price": [100.0, es_price, 49.9],
+        }
+    )
+    benchmarks = pd.DataFrame(
+        {
+            "arrival": [100.0, 50.0],
+            "vwap": [100.05, 50.0],
+            "close": [100.5, 49.0],
+            "volume": [1000.0, 300.0],
+        },
+        index=["ES", "NQ"],
+    )
+    return schedule, fills, benchmarks
+
+
+def test_tca_orders_benchmarks_and_forecast():
+    schedule, fills, benchmarks = _day("2024-01-02")
+    forecast = pd.Series({"ES": 50.0, "NQ": 8.0})
+    orders = tca_orders(schedule, fills, benchmarks, forecast).set_index("asset")
+    es, nq = orders.loc["ES"], orders.loc["NQ"]
+    assert es["date"] == pd.Timestamp("2024-01-02")
+    assert es["filled"] == 10.0 and es["fill_rate"] == 1.0
+    assert es["avg_price"] == pytest.approx(100.1)
+    assert es["arrival_bps"] == pytest.approx(10.0)
+    assert es["vwap_bps"] == pytest.approx((100.1 / 100.05 - 1) * 1e4)
+    assert es["close_bps"] < 0
+    assert es["participation"] == pytest.approx(0.01)
+    assert es["forecast_bps"] == pytest.approx(5.0)
+    assert es["forecast_error"] == pytest.approx(5.0)
+    assert nq["fill_rate"] == pytest.approx(0.75)
+    assert nq["arrival_bps"] == pytest.approx(20.0)
+
+
+def test_tca_daily_appends_and_summary(tmp_path):
+    path = tmp_path / "tca.csv"
+    history = TCA(path)
+    history.append(*_day("2024-01-02"))
+    history.append(*_day("2024-01-03", es_price=100.0))
+    history.append(*_day("2024-01-03", es_price=100.4))
+    assert len(history.orders) == 4
+
+    reloaded = TCA(path)
+    assert len(reloaded.orders) == 4
+    summary = reloaded.summary("asset")
+    assert summary.loc["ES", "orders"] == 2
+    assert summary.loc["ES", "arrival_bps"] == pytest.approx(15.0, rel=1e-3)
+    by_day = reloaded.summary(["date", "asset"])
+    assert len(by_day) == 4
+    assert np.isnan(summary.loc["NQ", "forecast_bps"])
+
+
+def test_tca_orders_with_plan_orders_schedule():
+    market_data = {
+        "prices": pd.Series({"ES": 100.0}),
+        "multipliers": pd.Series({"ES": 10.0}),
+        "fx_rates": pd.Series({"ES": 1.0}),
+        "capital": 100_000.0,
+        "spread": pd.Series({"ES": 1.0}),
+        "volatility": pd.Series({"ES": 0.02}),
+        "volume": pd.Series({"ES": 1000}),
+        "costs": pd.Series([1.0, 1.0]),
+        "days_to_expiry": pd.Series({"ES": 10}),
+    }
+    _, fills, benchmarks = _day("2024-01-02")
+    fills = fills[fills["asset"] == "ES"]
+    for bins in (pd.RangeIndex(2), pd.to_timedelta(["9h30min", "10h30min"])):
+        market_data["costs"].index = bins
+        schedule, _ = plan_orders(
+            pd.Series({"ES": 0.1}), pd.Series({"ES": 0}), market_data
+        )
+        for date in (pd.Timestamp("2024-01-02"), None):
+            orders = tca_orders(schedule, fills, benchmarks, date=date)
+            assert orders["date"].tolist() == [pd.Timestamp("2024-01-02")]
+            assert orders["fill_rate"].tolist() == [1.0]
+
+    later = fills.assign(time=fills["time"] + pd.Timedelta(days=1))
+    two_days = pd.concat([fills, later])
+    with pytest.raises(ValueError):
+        tca_orders(schedule, two_days, benchmarks)
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from optimizer import CostAwareRebalancer
+
+
+def _inputs(n=4, seed=0):
+    rng = np.random.default_rng(seed)
+    assets = [f"A{i}" for i in range(n)]
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(250, n)), columns=assets)
+    cov = returns.cov()
+    target = pd.Series(rng.normal(0, 0.2, n), index=assets)
+    current = pd.Series(rng.normal(0, 0.2, n), index=assets)
+    spread = pd.Series(2e-4, index=assets)
+    vol = returns.std()
+    volume = pd.Series(1e8, index=assets)
+    return target, current, cov, spread, vol, volume
+
+
+def test_rebalancer_without_costs_reaches_target():
+    target, current, cov, _, vol, volume = _inputs()
+    spread = pd.Series(0.0, index=target.index)
+    rebalancer = CostAwareRebalancer(alpha=0.0)
+    trades, costs = rebalancer.rebalance(target, current, cov, spread, vol, volume, 1e6)
+    np.testing.assert_allclose(current + trades, target, atol=1e-6)
+    assert costs.sum() == pytest.approx(0.0)
+
+
+def test_rebalancer_trades_less_when_costs_are_high():
+    target, current, cov, spread, vol, volume = _inputs()
+    cheap, _ = CostAwareRebalancer().rebalance(
+        target, current, cov, spread, vol, volume, 1e6
+    )
+    dear, costs = CostAwareRebalancer().rebalance(
+        target, current, cov, spread * 50, vol, volume / 1e4, 1e6
+    )
+    assert dear.abs().sum() < cheap.abs().sum()
+    assert (costs >= 0).all()
+
+
+def test_rebalancer_respects_gross_and_bounds():
+    target, current, cov, spread, vol, volume = _inputs(n=6)
+    rebalancer = CostAwareRebalancer(max_gross=0.5, bounds=(-0.15, 0.15))
+    trades, _ = rebalancer.rebalance(target, current, cov, spread, vol, volume, 1e6)
+    weights = current + trades
+    assert weights.abs().sum() <= 0.5 + 1e-6
+    assert weights.between(-0.15 - 1e-9, 0.15 + 1e-9).all()
+
+
+def test_rebalancer_warm_start_converges_faster():
+    target, current, cov, spread, vol, volume = _inputs(n=20)
+    rebalancer = CostAwareRebalancer()
+    trades, _ = rebalancer.rebalance(target, current, cov, spread, vol, volume, 1e6)
+    cold = rebalancer.iterations
+    rebalancer.rebalance(target + 1e-4, current + trades, cov, spread, vol, volume, 1e6)
+    assert rebalancer.iterations <= cold
+
+
+def test_rebalancer_reports_convergence():
+    target, current, cov, spread, vol, volume = _inputs(n=20)
+    rebalancer = CostAwareRebalancer(max_gross=0.5, max_iter=2)
+    with pytest.warns(RuntimeWarning):
+        rebalancer.rebalance(target, current, cov, spread, vol, volume, 1e6)
+    assert not rebalancer.converged
+
+    # Already inside the no-trade region: the cold start is optimal at once.
+    rebalancer = CostAwareRebalancer()
+    near = current + 1e-6
+    trades, _ = rebalancer.rebalance(near, current, cov, spread, vol, volume, 1e6)
+    assert rebalancer.converged and rebalancer.iterations == 1
+    np.testing.assert_allclose(trades, 0.0, atol=1e-12)
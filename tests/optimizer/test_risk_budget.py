@@ -0,0 +1,114 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from optimizer import erc, risk_budget, risk_budget_path
+
+
+def _cov():
+    return pd.DataFrame(
+        [[0.1, 0.02, 0.03, 0.0], [0.02, 0.2, 0.04, 0.01],
+         [0.03, 0.04, 0.15, 0.02], [0.0, 0.01, 0.02, 0.05]],
+        columns=list("ABCD"),
+        index=list("ABCD"),
+    )
+
+
+def _shares(cov, weights):
+    rc = weights * (cov @ weights)
+    return rc / rc.sum()
+
+
+def test_risk_budget_equal_budgets_is_long_only_erc():
+    cov = _cov()
+    weights = risk_budget(cov)
+    assert list(weights.index) == list("ABCD")
+    assert (weights > 0).all()
+    assert weights.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(_shares(cov, weights).values, 0.25, atol=1e-8)
+    # at least as close to equal contributions as the SciPy optimizer
+    erc_spread = np.ptp(_shares(cov, erc(cov)).values)
+    assert np.ptp(_shares(cov, weights).values) <= erc_spread
+
+
+def test_risk_budget_signed_directions_and_budgets():
+    cov = _cov()
+    direction = pd.Series({"A": 1.3, "B": -0.2, "C": -4.0, "D": 0.5})
+    budgets = pd.Series({"A": 0.4, "B": 0.3, "C": 0.2, "D": 0.1})
+    weights = risk_budget(cov, budgets=budgets, direction=direction)
+    assert (np.sign(weights) == np.sign(direction)).all()
+    assert weights.abs().sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(_shares(cov, weights).values, budgets.values, atol=1e-8)
+
+
+def test_risk_budget_group_budgets_and_limits():
+    cov = _cov()
+    groups = pd.Series({"A": "trend", "B": "trend", "C": "carry", "D": "carry"})
+    weights = risk_budget(cov, groups=groups, group_budgets={"trend": 0.5, "carry": 0.5})
+    assert _shares(cov, weights).groupby(groups).sum()["trend"] == pytest.approx(0.5)
+
+    limited = risk_budget(
+        cov, groups=groups, group_limits={"carry": 0.3}, max_leverage=1.0
+    )
+    assert limited.abs().groupby(groups).sum()["carry"] <= 0.3 + 1e-8
+
+
+def _hedged_cov():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.01, (500, 6))
+    returns[:, 1] = returns[:, 0] + 0.05 * returns[:, 1]
+    returns[:, 3] += 0.5 * returns[:, 2]
+    assets = list("abcdef")
+    return pd.DataFrame(np.cov(returns.T) * 252, index=assets, columns=assets)
+
+
+def test_risk_budget_group_limit_keeps_target_vol():
+    cov = _hedged_cov()
+    direction = pd.Series([1, -1, 1, -1, 1, 1], index=cov.index)
+    groups = pd.Series(list("xxyyzz"), index=cov.index)
+    args = dict(
+        direction=direction,
+        groups=groups,
+        group_budgets={"x": 0.5, "y": 0.3, "z": 0.2},
+        target_vol=0.1,
+    )
+    weights = risk_budget(cov, group_limits={"x": 1.0}, **args)
+    assert weights.abs().groupby(groups).sum()["x"] == pytest.approx(1.0)
+    assert np.sqrt(weights @ cov @ weights) == pytest.approx(0.1)
+
+    # the hedged pair keeps ~0.62 gross however small its budget, so the limit
+    # is infeasible: x is cut to its limit and the other groups keep the vol
+    with pytest.warns(RuntimeWarning):
+        weights = risk_budget(cov, group_limits={"x": 0.5}, **args)
+    assert weights.abs().groupby(groups).sum()["x"] == pytest.approx(0.5)
+    assert np.sqrt(weights @ cov @ weights) == pytest.approx(0.1)
+    assert (np.sign(weights) == direction).all()
+
+
+def test_risk_budget_target_vol_and_leverage_cap():
+    cov = _cov()
+    weights = risk_budget(cov, target_vol=0.5)
+    assert np.sqrt(weights @ cov @ weights) == pytest.approx(0.5)
+    capped = risk_budget(cov, target_vol=0.5, max_leverage=1.2)
+    assert capped.abs().sum() == pytest.approx(1.2)
+
+
+def test_risk_budget_path_warm_starts_each_date():
+    cov = _cov()
+    dates = pd.date_range("2021-01-01", periods=3)
+    covariances = {d: cov * (1 + 0.1 * i) for i, d in enumerate(dates)}
+    direction = pd.DataFrame(
+        [[1, 1, -1, 1], [1, -1, -1, 1], [-1, -1, -1, 1]],
+        index=dates,
+        columns=list("ABCD"),
+    )
+    path = risk_budget_path(covariances, direction=direction)
+    assert list(path.index) == list(dates)
+    assert (np.sign(path) == direction).all().all()
+    for date in dates:
+        expected = risk_budget(covariances[date], direction=direction.loc[date])
+        np.testing.assert_allclose(path.loc[date].values, expected.values, atol=1e-8)
@@ -3,9 +3,11 @@ import sys
 
 import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from optimizer import combine_sleeves, erc
+from optimizer import combine_sleeve_history, combine_sleeves, erc
+from optimizer.sleeves import rolling_sleeve_covariance
 
 
 def test_combine_sleeves_equal():
@@ -28,3 +30,72 @@ def test_combine_sleeves_risk_parity_uses_erc():
     mix = erc(returns[["trend", "carry"]].cov())
     expected = mix["trend"] * trend + mix["carry"] * carry
     pd.testing.assert_series_equal(combined, expected)
+
+
+def _sleeve_returns(n=120):
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2021-01-01", periods=n)
+    data = rng.normal(0, [0.02, 0.01, 0.005], size=(n, 3))
+    return pd.DataFrame(data, index=dates, columns=["trend", "carry", "value"])
+
+
+def test_rolling_sleeve_covariance_matches_pandas():
+    returns = _sleeve_returns()
+    cov = rolling_sleeve_covariance(returns, window=20)
+    expected = returns.rolling(20).cov().to_numpy().reshape(len(returns), 3, 3)
+    np.testing.assert_allclose(cov[19:], expected[19:], atol=1e-15)
+    assert np.isnan(cov[18]).all()
+
+    ewm = rolling_sleeve_covariance(returns, halflife=10)
+    expected = returns.ewm(halflife=10).cov(bias=True).to_numpy()
+    np.testing.assert_allclose(ewm[10:], expected.reshape(-1, 3, 3)[10:], atol=1e-15)
+
+
+def test_combine_sleeve_history_risk_parity():
+    returns = _sleeve_returns()
+    sleeves = {
+        name: pd.DataFrame(
+            {"A": float(i + 1), "B": -float(i)}, index=returns.index
+        )
+        for i, name in enumerate(returns.columns)
+    }
+    combined, mix = combine_sleeve_history(sleeves, returns, window=60)
+    assert combined.shape == (len(returns), 2)
+    np.testing.assert_allclose(mix.sum(axis=1), 1.0)
+    np.testing.assert_allclose(mix.iloc[0], 1.0 / 3)
+
+    date = returns.index[-1]
+    cov = returns.iloc[-60:].cov().to_numpy()
+    w = mix.loc[date].to_numpy()
+    rc = w * (cov @ w)
+    np.testing.assert_allclose(rc / rc.sum(), 1.0 / 3, atol=1e-8)
+    expected_a = sum(mix.loc[date, n] * sleeves[n].loc[date, "A"] for n in sleeves)
+    assert combined.loc[date, "A"] == pytest.approx(expected_a)
+
+
+def test_combine_sleeve_history_budgets():
+    returns = _sleeve_returns()
+    sleeves = {name: pd.DataFrame({"A": [1.0]}) for name in returns.columns}
+    budgets = {"trend": 0.5, "carry": 0.3, "value": 0.2}
+    _, mix = combine_sleeve_history(
+        sleeves, returns, method="budget", budgets=budgets, window=None, halflife=20
+    )
+    cov = rolling_sleeve_covariance(returns, halflife=20)[-1]
+    w = mix.iloc[-1].to_numpy()
+    rc = w * (cov @ w)
+    np.testing.assert_allclose(rc / rc.sum(), [0.5, 0.3, 0.2], atol=1e-8)
+
+
+def test_combine_sleeve_history_zero_budget():
+    returns = _sleeve_returns()
+    sleeves = {name: pd.DataFrame({"A": [1.0]}) for name in returns.columns}
+    budgets = {"trend": 0.5, "carry": 0.5, "value": 0.0}
+    _, mix = combine_sleeve_history(
+        sleeves, returns, method="budget", budgets=budgets, window=60
+    )
+    assert np.isfinite(mix.to_numpy()).all()
+    assert (mix["value"].iloc[60:] == 0.0).all()
+    cov = returns[["trend", "carry"]].iloc[-60:].cov().to_numpy()
+    w = mix[["trend", "carry"]].iloc[-1].to_numpy()
+    rc = w * (cov @ w)
+    np.testing.assert_allclose(rc / rc.sum(), [0.5, 0.5], atol=1e-8)
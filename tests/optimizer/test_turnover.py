@@ -5,7 +5,7 @@ import pandas as pd
 import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from optimizer import penalized_band_weights
+from optimizer import band_weight_history, penalized_band_weights
 
 
 def test_penalized_band_weights():
@@ -19,3 +19,23 @@ def test_penalized_band_weights():
     adjusted2 = penalized_band_weights(target2, current, band=0.1, penalty=0.5)
     # difference for A =0.55-0.0=0.55->adjust ->0.275 but B diff= -0.05 within band -> stays 0.5
     assert adjusted2["B"] == pytest.approx(0.5)
+
+
+def test_band_weight_history_matches_daily_banding():
+    dates = pd.date_range("2021-01-01", periods=4)
+    targets = pd.DataFrame(
+        {"A": [0.5, 0.52, 0.3, 0.3], "B": [0.0, 0.2, 0.21, None]}, index=dates
+    )
+    initial = pd.Series({"A": 0.0, "B": 0.5})
+    weights, turnover = band_weight_history(targets, initial, band=0.1, penalty=0.5)
+
+    current = initial
+    for date in dates:
+        expected = penalized_band_weights(
+            targets.loc[date].fillna(0.0), current, band=0.1, penalty=0.5
+        )
+        pd.testing.assert_series_equal(
+            weights.loc[date], expected, check_names=False
+        )
+        assert turnover[date] == pytest.approx((expected - current).abs().sum())
+        current = expected
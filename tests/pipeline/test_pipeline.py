@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from src.pipeline import run_daily_cycle
 
@@ -52,3 +53,92 @@ def test_run_daily_cycle_smoke() -> None:
     assert "schedule" in result
     assert "slippage_costs" in result
     assert "report" in result and not result["report"].empty
+    contributions = result["risk"]["var_contributions"]
+    assert contributions.sum() == pytest.approx(result["risk"]["var"])
+
+
+def test_run_daily_cycle_with_cost_aware_rebalancer() -> None:
+    from src.optimizer.rebalance import CostAwareRebalancer
+
+    dates = pd.date_range("2021-01-01", periods=5)
+    contract_data = pd.DataFrame(
+        {
+            "asset": ["A"] * 5 + ["B"] * 5,
+            "date": list(dates) * 2,
+            "contract": ["A1"] * 5 + ["B1"] * 5,
+            "price": [100, 101, 102, 103, 104] + [50, 51, 52, 53, 54],
+            "volume": [1000] * 10,
+            "open_interest": [1000] * 10,
+            "expiry": [dates[-1] + pd.Timedelta(days=30)] * 10,
+        }
+    )
+    returns = pd.DataFrame(
+        {
+            "A": [0.0, 0.01, -0.02, 0.015, 0.0],
+            "B": [0.0, -0.005, 0.01, -0.01, 0.005],
+        },
+        index=dates,
+    )
+    result = run_daily_cycle(
+        contract_data=contract_data,
+        dividend_yield=pd.DataFrame(0.02, index=dates, columns=["A", "B"]),
+        financing_rate=0.01,
+        features=returns.copy(),
+        regime_labels=pd.Series([0, 1, 0, 1, 0], index=dates),
+        current_weights=pd.Series({"A": 0.0, "B": 0.0}),
+        multipliers=pd.Series({"A": 1.0, "B": 1.0}),
+        fx_rates=pd.Series({"A": 1.0, "B": 1.0}),
+        capital=1_000_000.0,
+        margin_rates=pd.Series({"A": 0.1, "B": 0.1}),
+        returns=returns,
+        cost_estimates=pd.Series(
+            [1.0, 2.0, 3.0], index=pd.date_range("2021-01-06", periods=3, freq="H")
+        ),
+        var_limit=0.2,
+        rebalancer=CostAwareRebalancer(max_gross=2.0),
+    )
+    assert list(result["weights"].index) == ["A", "B"]
+
+
+def test_run_daily_cycle_relative_var_report() -> None:
+    dates = pd.date_range("2021-01-01", periods=5)
+    contract_data = pd.DataFrame(
+        {
+            "asset": ["A"] * 5 + ["B"] * 5,
+            "date": list(dates) * 2,
+            "contract": ["A1"] * 5 + ["B1"] * 5,
+            "price": [100, 101, 102, 103, 104] + [50, 51, 52, 53, 54],
+            "volume": [1000] * 10,
+            "open_interest": [1000] * 10,
+            "expiry": [dates[-1] + pd.Timedelta(days=30)] * 10,
+        }
+    )
+    returns = pd.DataFrame(
+        {
+            "A": [0.0, 0.01, -0.02, 0.015, 0.0],
+            "B": [0.0, -0.005, 0.01, -0.01, 0.005],
+        },
+        index=dates,
+    )
+    result = run_daily_cycle(
+        contract_data=contract_data,
+        dividend_yield=pd.DataFrame(0.02, index=dates, columns=["A", "B"]),
+        financing_rate=0.01,
+        features=returns.copy(),
+        regime_labels=pd.Series([0, 1, 0, 1, 0], index=dates),
+        current_weights=pd.Series({"A": 0.0, "B": 0.0}),
+        multipliers=pd.Series({"A": 1.0, "B": 1.0}),
+        fx_rates=pd.Series({"A": 1.0, "B": 1.0}),
+        capital=1_000_000.0,
+        margin_rates=pd.Series({"A": 0.1, "B": 0.1}),
+        returns=returns,
+        cost_estimates=pd.Series(
+            [1.0, 2.0, 3.0], index=pd.date_range("2021-01-06", periods=3, freq="H")
+        ),
+        var_limit=0.2,
+        reference_returns=returns.mean(axis=1),
+    )
+    report = result["report"]
+    assert {"reference_VaR", "ratio"} <= set(report.columns)
+    assert report["limit"].iloc[0] == 2.0
+    assert report["VaR"].iloc[0] == pytest.approx(result["risk"]["var"])
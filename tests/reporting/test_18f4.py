@@ -13,3 +13,20 @@ def test_generate_18f4_report():
     report = generate_18f4_report(var, exposure, limit=0.1)
     assert report.loc[0, "breach"] is False
     assert report.loc[1, "breach"] is True
+
+
+def test_generate_18f4_report_relative_test():
+    idx = pd.RangeIndex(3)
+    relative = pd.DataFrame(
+        {
+            "fund_var": [0.10, 0.25, 0.12],
+            "reference_var": [0.10, 0.10, 0.10],
+            "ratio": [1.0, 2.5, 1.2],
+        },
+        index=idx,
+    )
+    exposure = pd.Series([0.5, 0.5, 1.2], index=idx)
+    report = generate_18f4_report(relative, exposure)
+    assert list(report["breach"]) == [False, True, True]
+    assert (report["limit"] == 2.0).all()
+    assert report.loc[1, "reference_VaR"] == 0.10
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from risk import ledoit_wolf, hrp_weights
+from risk import LinkageCache, ledoit_wolf, hrp_weights
 
 
 def _sample_returns():
@@ -26,3 +26,42 @@ def test_hrp_weights_sum_to_one_and_non_negative():
     weights = hrp_weights(returns)
     assert np.isclose(weights.sum(), 1.0)
     assert (weights >= 0).all()
+
+
+def test_hrp_weights_keep_every_asset():
+    rng = np.random.default_rng(1)
+    returns = pd.DataFrame(rng.normal(size=(100, 5)), columns=list("ABCDE"))
+    weights = hrp_weights(returns)
+    assert list(weights.index) == list("ABCDE")
+    assert (weights > 0).all()
+
+
+def test_hrp_weights_two_assets_inverse_variance():
+    rng = np.random.default_rng(2)
+    returns = pd.DataFrame(
+        {"A": rng.normal(0, 0.01, 250), "B": rng.normal(0, 0.02, 250)}
+    )
+    var = returns.var()
+    expected = (1 / var) / (1 / var).sum()
+    weights = hrp_weights(returns)
+    np.testing.assert_allclose(weights.values, expected.values)
+
+
+def test_hrp_weights_other_linkage_methods():
+    returns = _sample_returns()
+    for method in ("complete", "average", "ward"):
+        weights = hrp_weights(returns, method=method)
+        assert np.isclose(weights.sum(), 1.0)
+
+
+def test_hrp_linkage_cache_reused_for_small_changes():
+    returns = _sample_returns()
+    cache = LinkageCache(tolerance=0.1)
+    first = hrp_weights(returns, cache=cache)
+    second = hrp_weights(returns.iloc[1:], cache=cache)
+    assert cache.hits == 1
+    assert np.isclose(second.sum(), 1.0)
+    assert not first.equals(second)
+
+    hrp_weights(returns, method="average", cache=cache)
+    assert cache.hits == 1
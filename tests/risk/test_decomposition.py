@@ -0,0 +1,54 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk.decomposition import var_decomposition
+from risk.var import calculate_var
+
+
+def _data(seed=0):
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame(
+        rng.standard_t(5, size=(750, 6)) * 0.01, columns=list("ABCDEF")
+    )
+    positions = pd.Series(rng.normal(size=6), index=returns.columns)
+    groups = pd.Series(["x", "x", "y", "y", "z", "z"], index=returns.columns)
+    return returns, positions, groups
+
+
+def test_historical_decomposition_matches_var():
+    returns, positions, groups = _data()
+    result = var_decomposition(returns, positions, groups=groups)
+    assert result.var == pytest.approx(calculate_var(returns @ positions))
+    assert result.assets["component_var"].sum() == pytest.approx(result.var)
+    assert result.assets["component_es"].sum() == pytest.approx(result.es)
+    assert result.groups["component_var"].sum() == pytest.approx(result.var)
+    assert list(result.groups.index) == ["x", "y", "z"]
+
+
+def test_historical_incremental_var_removes_position():
+    returns, positions, groups = _data(1)
+    result = var_decomposition(returns, positions, groups=groups)
+    without = positions.drop("C")
+    expected = result.var - calculate_var(returns[without.index] @ without)
+    assert result.assets.loc["C", "incremental_var"] == pytest.approx(expected)
+    kept = positions[groups != "y"]
+    expected = result.var - calculate_var(returns[kept.index] @ kept)
+    assert result.groups.loc["y", "incremental_var"] == pytest.approx(expected)
+
+
+def test_parametric_decomposition_closed_form():
+    returns, positions, _ = _data(2)
+    result = var_decomposition(returns, positions, method="parametric", horizon=1)
+    cov = returns.cov().to_numpy()
+    w = positions.to_numpy()
+    vol = np.sqrt(w @ cov @ w)
+    assert result.var == pytest.approx(2.326348 * vol, rel=1e-6)
+    assert result.assets["component_var"].sum() == pytest.approx(result.var)
+    w_without = w.copy()
+    w_without[0] = 0.0
+    expected = result.var - 2.326348 * np.sqrt(w_without @ cov @ w_without)
+    assert result.assets["incremental_var"].iloc[0] == pytest.approx(expected, rel=1e-5)
@@ -5,7 +5,7 @@ import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from risk import scale_by_drawdown
+from risk import drawdown_analytics, scale_by_drawdown
 
 
 def test_scale_by_drawdown_partial():
@@ -18,3 +18,32 @@ def test_scale_by_drawdown_full_reduction():
     equity = pd.Series([100, 100, 70])
     scale = scale_by_drawdown(equity, max_drawdown=0.2)
     assert scale == 0.0
+
+
+def test_drawdown_analytics_matches_scalar_governor():
+    equity = pd.Series([100, 110, 99, 105, 112, 100, 90, 95], dtype=float)
+    result = drawdown_analytics(equity, max_drawdown=0.2, windows=(3,))
+    expected = [scale_by_drawdown(equity.iloc[: i + 1], 0.2) for i in range(8)]
+    assert np.allclose(result.scale, expected)
+    assert list(result.underwater) == [0, 0, 1, 2, 0, 1, 2, 3]
+    assert list(result.recovery.iloc[:5]) == [0, 0, 2, 1, 0]
+    assert result.recovery.iloc[5:].isna().all()
+    assert np.allclose(
+        result.rolling_max_drawdown[3],
+        [0, 0, 0.1, 0.1, 0, 12 / 112, 22 / 112, 10 / 100],
+    )
+
+
+def test_drawdown_analytics_rolling_matches_windows():
+    rng = np.random.default_rng(0)
+    curves = pd.DataFrame(
+        np.exp(np.cumsum(rng.normal(0, 0.01, size=(300, 3)), axis=0)),
+        columns=list("abc"),
+    )
+    result = drawdown_analytics(curves, windows=(20, 64))
+    for window, rolling in result.rolling_max_drawdown.items():
+        for t in (5, 19, 20, 63, 64, 200, 299):
+            chunk = curves.iloc[max(0, t - window + 1) : t + 1]
+            peak = chunk.cummax()
+            expected = ((peak - chunk) / peak).max()
+            assert np.allclose(rolling.iloc[t], expected)
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk import (
+    RiskEngine,
+    calculate_var,
+    forecast_margin,
+    rolling_var,
+    var_decomposition,
+)
+
+
+def _returns():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(0, 0.01, size=(300, 4)), columns=list("ABCD"))
+
+
+def test_risk_engine_matches_individual_metrics():
+    returns = _returns()
+    weights = pd.Series({"A": 0.4, "B": -0.2, "C": 0.3, "D": 0.1})
+    engine = RiskEngine()
+    report = engine.run(returns, weights, 1e6, 0.1)
+
+    portfolio = returns @ weights
+    assert report.var == pytest.approx(calculate_var(portfolio))
+    _, es = rolling_var(portfolio, window=len(portfolio))
+    assert report.es == pytest.approx(es.iloc[-1])
+    component = var_decomposition(returns, weights).assets["component_var"]
+    assert np.allclose(report.var_contributions, component)
+    assert report.volatility == pytest.approx(portfolio.std() * np.sqrt(252))
+    cumulative = (1 + portfolio).cumprod()
+    peak = cumulative.cummax()
+    assert report.drawdown == pytest.approx(((peak - cumulative) / peak).max())
+    assert report.margin.equals(forecast_margin(weights * 1e6, 0.1))
+    assert report.gross_leverage == pytest.approx(1.0)
+    assert report.net_leverage == pytest.approx(0.6)
+    assert report.effective_n == pytest.approx(1 / (0.16 + 0.04 + 0.09 + 0.01))
+    assert set(report.timings) >= {"var", "drawdown", "margin"}
+
+
+def test_risk_engine_caches_statistics():
+    returns = _returns()
+    returns.iloc[:10, 2] = np.nan
+    engine = RiskEngine()
+    engine.prepare(returns)
+    pd.testing.assert_frame_equal(engine.covariance, returns.cov())
+    pd.testing.assert_series_equal(engine.asset_volatility, returns.std())
+    assert engine.covariance is engine.covariance
+    weights = pd.Series(0.25, index=returns.columns)
+    report = engine.run(returns, weights, 1.0, 0.1)
+    assert report.var == pytest.approx(calculate_var(returns @ weights))
+
+
+def test_risk_engine_refreshes_cache_when_frame_changes():
+    returns = _returns()
+    engine = RiskEngine()
+    engine.prepare(returns)
+    cached = engine.covariance
+    engine.prepare(returns.copy())
+    assert engine.covariance is cached
+
+    returns.iloc[5] = 0.05
+    engine.prepare(returns)
+    pd.testing.assert_frame_equal(engine.covariance, returns.cov())
+    returns.loc[len(returns)] = -0.03
+    weights = pd.Series(0.25, index=returns.columns)
+    report = engine.run(returns, weights, 1.0, 0.1)
+    pd.testing.assert_series_equal(engine.asset_volatility, returns.std())
+    assert len(report.portfolio_returns) == len(returns)
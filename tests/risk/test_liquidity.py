@@ -0,0 +1,85 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk import adv_panel, classify_liquidity, volume_panel
+
+
+def test_adv_panel_from_contract_volume():
+    dates = pd.date_range("2024-01-01", periods=3)
+    data = pd.DataFrame(
+        {
+            "date": np.repeat(dates, 2),
+            "asset": ["ES", "ES", "CL", "ES", "ES", "CL"],
+            "volume": [10, 30, 5, 20, 20, 7],
+        }
+    )
+    volume = volume_panel(data)
+    assert volume.loc[dates[0], "ES"] == 40
+    prices = pd.DataFrame({"ES": 2.0, "CL": 1.0}, index=dates)
+    adv = adv_panel(volume, window=2, prices=prices, multipliers=pd.Series({"ES": 10}))
+    assert np.isnan(adv.iloc[0]).all()
+    assert adv.loc[dates[1], "ES"] == pytest.approx(600.0)
+    assert np.isnan(adv.loc[dates[1], "CL"])
+
+
+def test_classify_liquidity_buckets_and_hlim():
+    dates = pd.date_range("2024-01-01", periods=2)
+    adv = pd.DataFrame({"a": 100.0, "b": 100.0, "c": 0.0}, index=dates)
+    positions = pd.DataFrame(
+        {"a": [50.0, -50.0], "b": [100.0, 400.0], "c": [0.0, 10.0]}, index=dates
+    )
+    report = classify_liquidity(
+        positions, adv, participation=0.5, haircut=pd.Series({"b": 0.5})
+    )
+    assert np.allclose(report.days.iloc[0], [1.0, 4.0, 0.0])
+    assert report.days.iloc[1, 2] == np.inf
+    assert report.bucket.iloc[0].tolist() == [0, 1, 0]
+    assert report.bucket.iloc[1].tolist() == [0, 3, 3]
+    assert report.summary.loc[dates[0], "highly_liquid"] == pytest.approx(1 / 3)
+    assert report.summary.loc[dates[1], "illiquid"] == pytest.approx(410 / 460)
+    assert report.summary["hlim_breach"].all()
+    assert report.summary["illiquid_breach"].tolist() == [False, True]
+
+
+def test_classify_liquidity_multiple_portfolios():
+    dates = pd.date_range("2024-01-01", periods=2)
+    adv = pd.DataFrame({"a": [100.0, 200.0]}, index=dates)
+    index = pd.MultiIndex.from_product([dates, ["p1", "p2"]])
+    positions = pd.DataFrame({"a": [10.0, 100.0, 10.0, 100.0]}, index=index)
+    report = classify_liquidity(positions, adv, nav=1000.0)
+    assert np.allclose(report.days["a"], [0.5, 5.0, 0.25, 2.5])
+    assert np.allclose(report.summary["highly_liquid"], [0.01, 0.0, 0.01, 0.0])
+    assert np.allclose(report.summary["moderately_liquid"], [0.0, 0.0, 0.0, 0.1])
+    with pytest.raises(ValueError):
+        classify_liquidity(positions, adv, thresholds=(3, 0))
+
+
+def test_classify_liquidity_calendar_cut_off_and_empty_rows():
+    dates = pd.date_range("2024-01-01", periods=2)
+    adv = pd.DataFrame({"a": 100.0, "b": 100.0, "c": 100.0}, index=dates)
+    # 4 and 5 trading days sell within 7 calendar days but only the first
+    # settles inside the limit; 5.5 trading days cannot be sold in time.
+    positions = pd.DataFrame(
+        {"a": [80.0, 0.0], "b": [100.0, 0.0], "c": [110.0, 0.0]}, index=dates
+    )
+    report = classify_liquidity(positions, adv)
+    assert report.bucket.iloc[0].tolist() == [1, 2, 3]
+    assert report.summary["hlim_breach"].tolist() == [True, False]
+    assert report.summary["illiquid_breach"].tolist() == [True, False]
+
+
+def test_classify_liquidity_leaves_missing_adv_unclassified():
+    dates = pd.date_range("2024-01-01", periods=2)
+    adv = pd.DataFrame({"a": [100.0, 100.0], "new": [np.nan, 100.0]}, index=dates)
+    positions = pd.DataFrame({"a": [10.0, 10.0], "new": [30.0, 30.0]}, index=dates)
+    report = classify_liquidity(positions, adv)
+    assert np.isnan(report.days.iloc[0, 1])
+    assert report.bucket.iloc[0].tolist() == [0, -1]
+    assert report.summary["unclassified"].tolist() == [0.75, 0.0]
+    assert report.summary["illiquid"].tolist() == [0.0, 0.0]
+    assert not report.summary["illiquid_breach"].any()
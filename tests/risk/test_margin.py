@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk import forecast_margin, span_margin
+
+
+def _book():
+    notional = pd.Series({"ESH": 1e6, "ESM": -8e5, "NQ": -5e5, "ZN": 2e6})
+    groups = pd.Series({"ESH": "ES", "ESM": "ES", "NQ": "NQ", "ZN": "ZN"})
+    ranges = pd.Series({"ESH": 0.06, "ESM": 0.06, "NQ": 0.08, "ZN": 0.02})
+    return notional, groups, ranges
+
+
+def test_span_margin_outright_matches_flat_rate():
+    notional = pd.Series({"A": 1e6, "B": -5e5})
+    groups = pd.Series({"A": "a", "B": "b"})
+    rates = pd.Series({"A": 0.1, "B": 0.2})
+    result = span_margin(notional, rates, groups)
+    flat = forecast_margin(notional, rates)
+    assert result.loc["a", "margin"] == pytest.approx(flat["A"])
+    assert result.loc["b", "margin"] == pytest.approx(flat["B"])
+
+
+def test_span_margin_spread_offsets():
+    notional, groups, ranges = _book()
+    credits = pd.DataFrame({"group_a": ["ES"], "group_b": ["NQ"], "credit": [0.7]})
+    result = span_margin(
+        notional, ranges, groups, intra_rates={"ES": 0.005}, inter_credits=credits
+    )
+    # calendar spread nets within ES, basis risk is charged back
+    assert result.loc["ES", "scan_risk"] == pytest.approx(2e5 * 0.06)
+    assert result.loc["ES", "intra_spread"] == pytest.approx(8e5 * 0.005)
+    # long ES against short NQ: the net ES delta is fully matched
+    assert result.loc["ES", "inter_credit"] == pytest.approx(0.7 * 12000)
+    assert result.loc["NQ", "inter_credit"] == pytest.approx(0.7 * 0.4 * 40000)
+    assert result["margin"].sum() < forecast_margin(notional, ranges).sum()
+
+
+def test_span_margin_history_matches_single_dates():
+    notional, groups, ranges = _book()
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame(
+        rng.normal(size=(20, 4)) * 1e6, columns=notional.index
+    )
+    credits = pd.DataFrame({"group_a": ["ES"], "group_b": ["NQ"], "credit": [0.5]})
+    kwargs = dict(intra_rates={"ES": 0.01}, inter_credits=credits)
+    projected = span_margin(history, ranges, groups, **kwargs)
+    for t in (0, 7, 19):
+        single = span_margin(history.iloc[t], ranges, groups, **kwargs)
+        assert np.allclose(projected.iloc[t], single["margin"])
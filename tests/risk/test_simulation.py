@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk.simulation import simulate_var
+from risk.volatility import ewma_variance, fit_garch
+
+
+def _returns(n_obs=500, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        rng.normal(0, 0.01, size=(n_obs, n_assets)), columns=list("ABCD")[:n_assets]
+    )
+
+
+def test_ewma_variance_recursion():
+    r = np.array([0.01, -0.02, 0.005])
+    v = ewma_variance(r, lam=0.9)[:, 0]
+    expected = [r.var()]
+    for x in r:
+        expected.append(0.9 * expected[-1] + 0.1 * x**2)
+    assert np.allclose(v, expected)
+
+
+def test_fit_garch_is_stationary():
+    omega, alpha, beta = fit_garch(_returns().to_numpy())
+    assert np.all(alpha >= 0) and np.all(beta >= 0)
+    assert np.all(alpha + beta < 1)
+    assert np.all(omega > 0)
+
+
+@pytest.mark.parametrize("method", ["fhs", "monte_carlo"])
+@pytest.mark.parametrize("volatility", ["ewma", "garch"])
+def test_simulate_var_components_add_up(method, volatility):
+    returns = _returns()
+    positions = pd.Series([1.0, -0.5, 2.0, 0.0], index=returns.columns)
+    result = simulate_var(
+        returns,
+        positions,
+        method=method,
+        volatility=volatility,
+        n_scenarios=5000,
+        chunk_size=1000,
+        seed=3,
+    )
+    assert result.var > 0
+    assert result.es >= result.var
+    assert result.component_var.sum() == pytest.approx(result.var)
+    assert result.component_es.sum() == pytest.approx(result.es)
+    assert result.component_es["D"] == 0.0
+
+
+def test_simulate_var_one_day_monte_carlo_matches_normal():
+    returns = _returns(n_obs=1000, n_assets=1)
+    result = simulate_var(
+        returns,
+        pd.Series({"A": 1.0}),
+        method="monte_carlo",
+        horizon=1,
+        n_scenarios=100_000,
+        seed=0,
+    )
+    sigma = np.sqrt(ewma_variance(returns.to_numpy())[-1, 0])
+    assert result.var == pytest.approx(2.326348 * sigma, rel=0.03)
+
+
+def test_simulate_var_independent_of_workers():
+    returns = _returns()
+    positions = pd.Series(1.0, index=returns.columns)
+    kwargs = dict(n_scenarios=4000, chunk_size=1000, seed=7, horizon=5)
+    serial = simulate_var(returns, positions, **kwargs)
+    parallel = simulate_var(returns, positions, n_jobs=2, **kwargs)
+    assert parallel.var == serial.var
+    assert parallel.es == serial.es
+
+
+def test_simulate_var_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        simulate_var(_returns(), pd.Series(1.0, index=list("ABCD")), method="delta")
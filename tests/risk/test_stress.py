@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from risk.stress import ScenarioLibrary, historical_shocks, shock_pnl
+
+
+def _prices():
+    dates = pd.bdate_range("2020-02-03", "2020-04-30")
+    prices = pd.DataFrame(
+        {"A": np.linspace(100, 80, len(dates)), "B": np.linspace(50, 60, len(dates))},
+        index=dates,
+    )
+    prices.loc[:"2020-03-01", "B"] = np.nan
+    return prices
+
+
+def test_historical_shocks_use_window_endpoints():
+    prices = _prices()
+    shocks = historical_shocks(prices)
+    assert list(shocks.index) == ["2020_covid"]
+    window = prices.loc["2020-02-19":"2020-03-23"]
+    assert shocks.loc["2020_covid", "A"] == pytest.approx(
+        window["A"].iloc[-1] / window["A"].iloc[0] - 1
+    )
+    first_b = window["B"].dropna().iloc[0]
+    assert shocks.loc["2020_covid", "B"] == pytest.approx(
+        window["B"].iloc[-1] / first_b - 1
+    )
+
+
+def test_library_matches_shock_pnl_for_each_portfolio():
+    library = ScenarioLibrary()
+    library.add("equity_crash", {"A": -0.2, "B": 0.05})
+    library.add("rates_up", {"B": -0.1, "C": 0.02})
+    library.add_historical(_prices())
+    portfolios = pd.DataFrame(
+        {"A": [1e6, -5e5], "B": [2e6, 0.0], "C": [0.0, 1e6]}, index=["p1", "p2"]
+    )
+    pnl = library.evaluate(portfolios)
+    assert pnl.shape == (3, 2)
+    for name, shocks in library.shocks.iterrows():
+        for port in portfolios.index:
+            expected = shock_pnl(portfolios.loc[port], shocks.fillna(0.0))
+            assert pnl.loc[name, port] == pytest.approx(expected)
+
+
+def test_nonlinear_severity_compounds_shocks():
+    library = ScenarioLibrary()
+    library.add("crash", {"A": -0.6})
+    linear = library.evaluate(pd.Series({"A": 1.0}), severity=2.0)
+    nonlinear = library.evaluate(pd.Series({"A": 1.0}), severity=2.0, nonlinear=True)
+    assert linear["crash"] == pytest.approx(-1.2)
+    assert nonlinear["crash"] == pytest.approx(0.4**2 - 1)
+
+
+def test_worst_ranks_scenarios_per_portfolio():
+    rng = np.random.default_rng(0)
+    library = ScenarioLibrary(
+        pd.DataFrame(rng.normal(0, 0.05, size=(200, 4)), columns=list("ABCD"))
+    )
+    portfolios = pd.DataFrame(rng.normal(size=(3, 4)), columns=list("ABCD"))
+    table = library.worst(portfolios, n=3)
+    pnl = library.evaluate(portfolios)
+    assert len(table) == 9
+    for port, group in table.groupby("portfolio"):
+        expected = pnl[port].nsmallest(3)
+        assert list(group["scenario"]) == list(expected.index)
+        assert list(group["rank"]) == [1, 2, 3]
@@ -5,7 +5,7 @@ import pandas as pd
 import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from risk.var import calculate_var
+from risk.var import RelativeVaR, calculate_var, relative_var, rolling_var
 
 
 def test_calculate_var():
@@ -13,3 +13,58 @@ def test_calculate_var():
     expected = -np.quantile(returns, 0.01) * np.sqrt(20)
     var = calculate_var(returns)
     assert var == pytest.approx(expected)
+
+
+def test_calculate_var_dataframe_matches_columns():
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(300, 3)), columns=list("ABC"))
+    returns.iloc[:50, 1] = np.nan
+    returns["D"] = np.nan
+    result = calculate_var(returns)
+    for col in "ABC":
+        assert result[col] == pytest.approx(calculate_var(returns[col]))
+    assert np.isnan(result["D"])
+
+
+def test_rolling_var_matches_window_var_and_es():
+    rng = np.random.default_rng(1)
+    returns = pd.DataFrame(rng.standard_t(4, size=(200, 2)) * 0.01, columns=["A", "B"])
+    returns.iloc[10:20, 1] = np.nan
+    var, es = rolling_var(returns, window=50, min_periods=40)
+    assert var.iloc[:39].isna().all().all()
+    for t in (49, 120, 199):
+        window = returns.iloc[max(0, t - 49) : t + 1]
+        expected = calculate_var(window)
+        np.testing.assert_allclose(var.iloc[t], expected)
+        for col in window:
+            losses = np.sort(window[col].dropna().values)
+            k = int(np.floor((len(losses) - 1) * 0.01)) + 1
+            assert es.iloc[t][col] == pytest.approx(-losses[:k].mean() * np.sqrt(20))
+    assert (es.dropna() >= var.dropna() - 1e-12).all().all()
+
+
+def test_rolling_var_series():
+    returns = pd.Series(np.linspace(-0.05, 0.05, 100), name="fund")
+    var, es = rolling_var(returns, window=100)
+    assert var.name == "fund"
+    assert var.iloc[-1] == pytest.approx(calculate_var(returns))
+
+
+def test_relative_var_batch_and_incremental_agree():
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2020-01-01", periods=400)
+    fund = pd.Series(rng.normal(0, 0.012, 400), index=dates)
+    reference = pd.Series(rng.normal(0, 0.01, 400), index=dates)
+    fund.iloc[::37] = np.nan
+
+    history = relative_var(fund, reference, window=100)
+    pair = pd.concat([fund, reference], axis=1).dropna()
+    last = pair.iloc[-100:]
+    assert history["fund_var"].iloc[-1] == pytest.approx(calculate_var(last[0]))
+    assert history["reference_var"].iloc[-1] == pytest.approx(calculate_var(last[1]))
+
+    monitor = RelativeVaR(window=100)
+    monitor.fit(fund.iloc[:150], reference.iloc[:150])
+    for t in range(150, 400):
+        current = monitor.update(fund.iloc[t], reference.iloc[t])
+        assert current["ratio"] == pytest.approx(history["ratio"].iloc[t])
@@ -3,9 +3,10 @@ import sys
 
 import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from risk import scale_to_target_vol
+from risk import VolTargeter, scale_to_target_vol
 
 
 def test_scale_to_target_vol_returns_expected_factor():
@@ -20,3 +21,47 @@ def test_scale_to_target_vol_zero_volatility():
     returns = pd.Series([0.0] * 252)
     factor = scale_to_target_vol(returns, 0.2)
     assert factor == 0.0
+
+
+@pytest.mark.parametrize("method", ["rolling", "ewma", "garch"])
+def test_vol_targeter_streaming_matches_batch(method):
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(400, 3)), columns=list("abc"))
+    returns.iloc[::17, 1] = np.nan
+    kwargs = dict(
+        method=method,
+        window=60,
+        max_leverage=1.5,
+        smoothing=5.0,
+        garch_params=(1e-6, 0.05, 0.9),
+    )
+    batch = VolTargeter(0.1, **kwargs).fit(returns)
+    live = VolTargeter(0.1, **kwargs)
+    live.fit(returns.iloc[:250])
+    for date, row in returns.iloc[250:].iterrows():
+        current = live.update(row)
+        assert np.allclose(current, batch.loc[date])
+    assert (batch.dropna() <= 1.5).all().all()
+
+
+def test_vol_targeter_rolling_matches_scalar():
+    rng = np.random.default_rng(1)
+    returns = pd.Series(rng.normal(0, 0.01, 300))
+    leverage = VolTargeter(0.1, method="rolling", window=100).fit(returns)
+    assert leverage.iloc[:19].isna().all()
+    for t in (50, 150, 299):
+        expected = scale_to_target_vol(returns.iloc[: t + 1], 0.1, window=100)
+        assert leverage.iloc[t] == pytest.approx(expected)
+
+
+def test_vol_targeter_rolling_stream_stays_accurate():
+    # A large mean against a tiny spread makes sum-of-squares updates cancel.
+    rng = np.random.default_rng(2)
+    returns = pd.Series(0.5 + rng.normal(0, 1e-6, 5000))
+    live = VolTargeter(1e-4, method="rolling", window=50)
+    live.fit(returns.iloc[:50])
+    for value in returns.iloc[50:]:
+        current = live.update(value)
+        assert live._state["variance"][0] >= 0
+    expected = scale_to_target_vol(returns, 1e-4, window=50)
+    assert current == pytest.approx(expected, rel=1e-6)